@@ -0,0 +1,304 @@
+"""
+Benchmarks for the 2D and 3D chip pipelines.
+
+Run from the project root::
+
+    python benchmarks/bench_chip.py -o bench.json
+    python benchmarks/bench_chip.py -o new.json --baseline bench.json
+
+Each benchmark is timed several times (fast ones in an inner loop so one
+sample lasts at least ``MIN_SAMPLE`` seconds) and reported as seconds per
+call.  Results are written as JSON together with machine metadata.  With
+``--baseline`` every benchmark present in both files is compared on its
+best time; anything slower than ``1 + threshold`` times the baseline is
+reported and the exit code is 1.
+
+Benchmarks
+----------
+lattice_init[n]     SquareLattice construction, n × n
+lattice_place[n]    SquareLattice.place on a fresh Agg figure
+draw_chip[n]        draw_chip(show=False), pyplot figure closed afterwards
+meander[t]          Resonator._build_meander_path with t U-turns
+fluxonium3d         Fluxonium3D.place into a fresh Scene
+coupler3d           Coupler3D.place (both mirror variants)
+chip_build[n]       ChipBuilder.build, instanced
+render[n]           BlenderRenderer.render; uses the recording stand-in
+                    (``visualization_3d.fake_bpy``) when ``bpy`` is not
+                    importable, i.e. times the Python-side cost only
+bloch_ensemble[n]   BlochSphere.set_ensemble with n arrows (stand-in as above)
+dephasing[n]        dephasing.simulate, OU noise, n trajectories × 1000 steps
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import statistics
+import sys
+import time
+
+_PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if _PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, _PROJECT_ROOT)
+
+import matplotlib
+matplotlib.use("Agg")
+import matplotlib.pyplot as plt
+from matplotlib.figure import Figure
+
+from visualization.instrument import machine_info
+from visualization.styles import LatticeConfig, ResonatorDims
+from visualization.lattice import SquareLattice
+from visualization.primitives import Resonator
+from visualization.draw import draw_chip
+from visualization_3d.scene import Scene
+from visualization_3d.components import Fluxonium3D, Coupler3D
+from visualization_3d.chip import ChipBuilder
+
+
+DEFAULT_SIZES = (3, 10, 25, 50)
+MIN_SAMPLE = 0.01       # seconds; fast benchmarks loop until one sample is this long
+DEFAULT_REPEAT = 5
+DEFAULT_BUDGET = 10.0   # seconds per benchmark; at least one sample is always taken
+
+
+# ── registry ────────────────────────────────────────────────────────────────
+# name → (factory, uses_sizes); factory(param) returns the callable to time
+
+BENCHMARKS = {}
+
+
+def benchmark(name, sized=True):
+    def register(factory):
+        BENCHMARKS[name] = (factory, sized)
+        return factory
+    return register
+
+
+def _lattice(n):
+    return SquareLattice(LatticeConfig(rows=n, cols=n))
+
+
+@benchmark("lattice_init")
+def _bench_lattice_init(n):
+    return lambda: _lattice(n)
+
+
+@benchmark("lattice_place")
+def _bench_lattice_place(n):
+    lattice = _lattice(n)
+
+    def run():
+        ax = Figure().add_subplot()
+        lattice.place(ax, labels=True)
+    return run
+
+
+@benchmark("draw_chip")
+def _bench_draw_chip(n):
+    def run():
+        ax = draw_chip(rows=n, cols=n, show=False)
+        plt.close(ax.figure)
+    return run
+
+
+@benchmark("meander", sized=False)
+def _bench_meander(turns):
+    res = Resonator(ResonatorDims(num_turns=turns))
+    return res._build_meander_path
+
+
+@benchmark("fluxonium3d", sized=False)
+def _bench_fluxonium3d(_):
+    comp = Fluxonium3D()
+    return lambda: comp.place((0, 0, 0), 0, scene=Scene())
+
+
+@benchmark("coupler3d", sized=False)
+def _bench_coupler3d(_):
+    comp = Coupler3D()
+
+    def run():
+        scene = Scene()
+        comp.place((0, 0, 0), 0, mirror=False, scene=scene)
+        comp.place((0, 0, 0), 0, mirror=True, scene=scene)
+    return run
+
+
+@benchmark("chip_build")
+def _bench_chip_build(n):
+    builder = ChipBuilder(_lattice(n))
+    return builder.build
+
+
+@benchmark("render")
+def _bench_render(n):
+    from visualization_3d.renderer import BlenderRenderer
+    renderer = BlenderRenderer(_lattice(n))
+
+    def run():
+        with contextlib.redirect_stdout(io.StringIO()):
+            renderer.render()
+    return run
+
+
+@benchmark("bloch_ensemble", sized=False)
+def _bench_bloch_ensemble(n):
+    import numpy as np
+    from visualization_3d.bloch import BlochSphere
+    from visualization_3d.ensemble import directions_from_angles
+    bloch = BlochSphere().build()
+    phi = np.random.default_rng(0).normal(0.0, 0.3, n)
+    directions = directions_from_angles(np.pi / 2, phi)
+    return lambda: bloch.set_ensemble(directions, velocities=phi)
+
+
+@benchmark("dephasing", sized=False)
+def _bench_dephasing(n):
+    from visualization_3d.dephasing import OrnsteinUhlenbeck, simulate
+    model = OrnsteinUhlenbeck(sigma=1.0, tau=2.0)
+    return lambda: simulate(model, n, 1000, 0.005, keep=1000, stride=10, seed=0)
+
+
+# Parameters of the unsized benchmarks
+_PARAMS = {"meander": (5, 50, 500), "fluxonium3d": (None,), "coupler3d": (None,),
+           "bloch_ensemble": (1000, 10000), "dephasing": (10000, 100000)}
+
+# Benchmarks that need ``bpy`` (or the stand-in)
+_NEEDS_BPY = ("render", "bloch_ensemble")
+
+
+def _ensure_bpy():
+    """Import ``bpy``, installing the recording stand-in if needed.
+
+    Returns ``"blender"`` or ``"stand-in"``.
+    """
+    from visualization_3d import fake_bpy
+    try:
+        import bpy
+    except ImportError:
+        bpy = fake_bpy.install()
+    return "stand-in" if bpy is fake_bpy.bpy else "blender"
+
+
+# ── timing ──────────────────────────────────────────────────────────────────
+
+def time_callable(fn, repeat=DEFAULT_REPEAT, budget=DEFAULT_BUDGET):
+    """Return per-call timings of *fn* (seconds) and the inner loop count.
+
+    The first call is a warm-up (imports, caches) and is never a sample.
+    """
+    t0 = time.perf_counter()
+    fn()
+    first = time.perf_counter() - t0
+
+    number = max(1, int(MIN_SAMPLE / first)) if first > 0 else 1000
+    samples = []
+    spent = first
+    while not samples or (len(samples) < repeat and spent < budget):
+        t0 = time.perf_counter()
+        for _ in range(number):
+            fn()
+        dt = time.perf_counter() - t0
+        spent += dt
+        samples.append(dt / number)
+    return samples, number
+
+
+def run_benchmarks(sizes=DEFAULT_SIZES, select=None, repeat=DEFAULT_REPEAT,
+                   budget=DEFAULT_BUDGET, log=print):
+    """Run every (selected) benchmark and return the result document."""
+    results = {}
+    bpy_kind = None
+    for name, (factory, sized) in BENCHMARKS.items():
+        if select and not any(s in name for s in select):
+            continue
+        if name in _NEEDS_BPY:
+            bpy_kind = _ensure_bpy()
+        for param in (sizes if sized else _PARAMS[name]):
+            key = name if param is None else f"{name}[{param}]"
+            samples, number = time_callable(factory(param), repeat, budget)
+            results[key] = {
+                "min": min(samples),
+                "median": statistics.median(samples),
+                "mean": statistics.fmean(samples),
+                "samples": len(samples),
+                "number": number,
+            }
+            log(f"  {key:<22} {_fmt(min(samples)):>10}  "
+                f"(median {_fmt(statistics.median(samples))}, "
+                f"{len(samples)}×{number})")
+    machine = machine_info()
+    if bpy_kind is not None:
+        machine["bpy"] = bpy_kind
+    return {
+        "machine": machine,
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "results": results,
+    }
+
+
+def compare(current, baseline, threshold=0.2):
+    """Compare best times; return ``[(name, old, new, ratio)]`` regressions."""
+    regressions = []
+    for name, new in current["results"].items():
+        old = baseline["results"].get(name)
+        if old is None:
+            continue
+        ratio = new["min"] / old["min"] if old["min"] > 0 else float("inf")
+        if ratio > 1 + threshold:
+            regressions.append((name, old["min"], new["min"], ratio))
+    return regressions
+
+
+def _fmt(seconds):
+    if seconds < 1e-3:
+        return f"{seconds * 1e6:.1f} µs"
+    if seconds < 1:
+        return f"{seconds * 1e3:.2f} ms"
+    return f"{seconds:.2f} s"
+
+
+# ── CLI ─────────────────────────────────────────────────────────────────────
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Time the 2D and 3D chip pipelines.")
+    parser.add_argument("-o", "--out", default=None,
+                        help="write results JSON here")
+    parser.add_argument("--baseline", default=None,
+                        help="results JSON to compare against")
+    parser.add_argument("--threshold", type=float, default=0.2,
+                        help="allowed slowdown vs baseline (default: 0.2 = 20%%)")
+    parser.add_argument("--sizes", default=",".join(map(str, DEFAULT_SIZES)),
+                        help="comma-separated lattice sizes (default: %(default)s)")
+    parser.add_argument("-k", "--select", action="append", default=None,
+                        help="only run benchmarks whose name contains this "
+                             "(repeatable)")
+    parser.add_argument("--repeat", type=int, default=DEFAULT_REPEAT,
+                        help="samples per benchmark (default: %(default)s)")
+    parser.add_argument("--budget", type=float, default=DEFAULT_BUDGET,
+                        help="max seconds per benchmark (default: %(default)s)")
+    args = parser.parse_args(argv)
+
+    sizes = tuple(int(s) for s in args.sizes.split(","))
+    current = run_benchmarks(sizes, args.select, args.repeat, args.budget)
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump(current, f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        regressions = compare(current, baseline, args.threshold)
+        for name, old, new, ratio in regressions:
+            print(f"SLOWER  {name:<22} {_fmt(old)} → {_fmt(new)} (×{ratio:.2f})")
+        if regressions:
+            return 1
+        print(f"No regressions beyond {args.threshold:.0%}.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
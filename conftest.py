@@ -0,0 +1,2 @@
+# test_jj_chain_3d.py is a Blender script (``blender --python``), not a pytest module
+collect_ignore = ["test_jj_chain_3d.py"]
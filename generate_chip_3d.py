@@ -7,12 +7,15 @@ if project_root not in sys.path:
 
 # Force-reload so edits are picked up without restarting Blender
 import importlib
-import visualization_3d.primitives as _p
+import visualization_3d.geometry as _g
+import visualization_3d.scene as _s
 import visualization_3d.components as _c
+import visualization_3d.chip as _ch
+import visualization_3d.primitives as _p
+import visualization_3d.bpy_backend as _b
 import visualization_3d.renderer as _r
-importlib.reload(_p)
-importlib.reload(_c)
-importlib.reload(_r)
+for _m in (_g, _s, _c, _ch, _p, _b, _r):
+    importlib.reload(_m)
 
 from visualization.styles import LatticeConfig
 from visualization.lattice import SquareLattice
@@ -21,6 +24,7 @@ from visualization_3d.renderer import BlenderRenderer
 # Create a 6×6 lattice (pitch=0 → auto-compute)
 lattice = SquareLattice(config=LatticeConfig(rows=6, cols=6, pitch=0))
 
-# Render the full chip in Blender
+# Render the full chip in Blender.  incremental=True keeps the existing
+# chip and rebuilds only components whose dims or placement changed.
 renderer = BlenderRenderer(lattice)
-renderer.render()
+renderer.render(incremental=True)
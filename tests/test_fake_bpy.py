@@ -0,0 +1,58 @@
+"""Headless renders of a small chip through the recording ``bpy`` stand-in."""
+
+import pytest
+
+from visualization.lattice import SquareLattice
+from visualization.styles import LatticeConfig
+from visualization_3d import fake_bpy
+
+
+@pytest.fixture
+def bpy():
+    yield fake_bpy.install()
+    fake_bpy.uninstall()
+
+
+def _renderer(rows, cols):
+    from visualization_3d.renderer import BlenderRenderer
+    return BlenderRenderer(SquareLattice(LatticeConfig(rows=rows, cols=cols)))
+
+
+def _counts():
+    s = fake_bpy.stats()
+    return {k: s[k] for k in ("objects", "meshes", "collections", "vertices")}
+
+
+def test_render_budget(bpy):
+    stats = _renderer(3, 3).render()
+    assert stats == {"created": 22, "updated": 0, "deleted": 0, "kept": 0}
+
+    s = fake_bpy.stats()
+    assert s["objects"] == 515
+    assert s["meshes"] == 7          # one mesh per prototype, shared by instances
+    assert s["vertices"] == 1892
+    assert s["materials"] == 4
+    assert s["operator_calls"] == 2  # scene clear only; geometry is bulk-written
+
+
+def test_incremental_unchanged(bpy):
+    _renderer(3, 3).render()
+    before = _counts()
+    stats = _renderer(3, 3).render(incremental=True)
+    assert stats == {"created": 0, "updated": 0, "deleted": 0, "kept": 22}
+    assert _counts() == before
+
+
+@pytest.mark.parametrize("size, expected", [
+    ((3, 4), {"created": 13, "updated": 10, "deleted": 5, "kept": 7}),
+    ((2, 2), {"created": 3, "updated": 2, "deleted": 16, "kept": 4}),
+])
+def test_incremental_resize(bpy, size, expected):
+    _renderer(*size).render()
+    fresh = _counts()
+
+    _renderer(3, 3).render()
+    assert _renderer(*size).render(incremental=True) == expected
+    counts = _counts()
+    assert counts["objects"] == fresh["objects"]
+    assert counts["collections"] == fresh["collections"]
@@ -6,17 +6,71 @@ Modules
 primitives : Low-level geometric building blocks (Xmon cross, JJ chain, etc.)
 qubits     : Composite qubit drawings (FluxoniumQubit, TunableTransmonCoupler)
 lattice    : Square-lattice layout engine placing qubits and couplers
+layers     : Per-layer artist collections for recolouring / hiding chip layers
+labels     : Batched label artist with zoom, viewport and overlap culling
+boolean    : Exact polygon union, difference and offset (Manhattan fast path + general clipping)
+geometry   : Merged per-component metal polygons of a placed lattice
+ground     : Ground plane with CPW gap cut-outs around all metal (tiled)
+holes      : Flux-trapping hole arrays kept clear of circuit metal
+density    : Windowed metal density maps, fill-limit flags and heatmap overlay
+raster     : Scanline rasterization of polygons (even-odd / nonzero)
+svg        : Direct SVG export of polygons and pattern-filled arrays
+gds        : Minimal GDSII writer (keyholed boundaries, AREF arrays)
 styles     : Color palettes, default dimensions, and theming
-draw       : Top-level convenience functions for rendering full chips
+draw       : Top-level convenience functions for drawing and rendering full chips
+instrument : Opt-in stage timing and artist/object counters for 2D and 3D builds
+cache      : Content-keyed on-disk cache for rendered chip images
+viewer     : Interactive pan/zoom viewer with viewport culling and tile caching
+sweep      : Parallel parameter-sweep renders with contact sheet and index CSV
+
+The geometry modules (``primitives``, ``qubits``, ``lattice``, ``styles``,
+``layers``, ``boolean``, ``geometry``, ``ground``, ``holes``, ``density``
+and the exporters) import matplotlib only when something is drawn onto
+an Axes: placing a lattice into a ``LayerSink``, ``ChipGeometry`` and the
+ground, hole, density, SVG and GDSII outputs run without it.  ``draw`` and
+``viewer`` names are loaded on first attribute access, so
+``import visualization`` plus lattice construction never loads matplotlib.
 """
+
+import importlib
+
 from .primitives import Xmon, JJChain, JosephsonJunction, Resonator, DCSqUID, FluxLine
 from .qubits import FluxoniumQubit, TunableTransmonCoupler
 from .lattice import SquareLattice
-from .draw import draw_chip
+from .layers import ChipLayers, LAYERS, chip_layers
+from .boolean import Polygon, union
+from .geometry import ChipGeometry
+from .ground import GroundPlane
+from .holes import HoleArray
+from .density import DensityMap, chip_density, density_map
+
+# matplotlib-bound names → defining submodule
+_LAZY = {
+    "draw_chip": "draw",
+    "render_chip": "draw",
+    "ChipViewer": "viewer",
+    "view_chip": "viewer",
+    "LabelCollection": "labels",
+    "LabelStyle": "labels",
+}
+
+
+def __getattr__(name):
+    module = _LAZY.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{module}", __name__), name)
+    globals()[name] = value
+    return value
 
 __all__ = [
     "Xmon", "JJChain", "JosephsonJunction", "Resonator", "DCSqUID", "FluxLine",
     "FluxoniumQubit", "TunableTransmonCoupler",
     "SquareLattice",
-    "draw_chip",
+    "ChipLayers", "LAYERS", "chip_layers",
+    "Polygon", "union", "ChipGeometry", "GroundPlane", "HoleArray",
+    "DensityMap", "chip_density", "density_map",
+    "draw_chip", "render_chip",
+    "ChipViewer", "view_chip",
+    "LabelCollection", "LabelStyle",
 ]
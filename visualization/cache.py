@@ -0,0 +1,176 @@
+"""
+Content-keyed on-disk cache for rendered chip images.
+
+A render is identified by a hash of everything that affects its pixels:
+lattice config, dimension dataclasses, palette, figure size, dpi, labels,
+title, cell pattern, output format and the active matplotlib rcParams
+(:func:`rc_params_key`), salted with the source of the drawing modules
+and the matplotlib version, so editing the drawing code or switching
+styles invalidates old entries.  Entries are plain files named by that hash::
+
+    from visualization.draw import render_chip
+    from visualization.cache import RenderCache
+
+    cache = RenderCache("~/.cache/chip_renders", max_bytes=512 << 20)
+    png = render_chip(rows=10, cols=10, cache=cache)    # miss: draws
+    png = render_chip(rows=10, cols=10, cache=cache)    # hit: reads the file
+
+Writes go to a temporary file in the cache directory and are moved into
+place with ``os.replace``, so concurrent readers never see a partial
+file.  Reading an entry bumps its modification time; when the directory
+grows past *max_bytes*, least recently used entries are deleted.
+"""
+
+from __future__ import annotations
+
+import functools
+import glob
+import hashlib
+import os
+import tempfile
+from typing import Optional
+
+from . import instrument
+
+
+# Bump when the key layout changes
+CACHE_VERSION = 1
+
+DEFAULT_CACHE_DIR = os.environ.get(
+    "CHIP_RENDER_CACHE",
+    os.path.join(os.path.expanduser("~"), ".cache", "chip_renders"),
+)
+
+_SUFFIX = ".bin"
+
+
+@functools.lru_cache(maxsize=1)
+def code_salt() -> str:
+    """Hash of the drawing modules' source and the matplotlib version."""
+    import matplotlib
+    h = hashlib.sha256(f"{CACHE_VERSION}:{matplotlib.__version__}".encode())
+    here = os.path.dirname(os.path.abspath(__file__))
+    for path in sorted(glob.glob(os.path.join(here, "*.py"))):
+        with open(path, "rb") as f:
+            h.update(os.path.basename(path).encode())
+            h.update(f.read())
+    return h.hexdigest()
+
+
+# rcParams that cannot change a saved image (GUI, key bindings, paths)
+_RC_IGNORED = ("backend", "interactive", "keymap.", "toolbar", "webagg.", "tk.",
+               "macosx.", "figure.raise_window", "savefig.directory", "timezone")
+
+
+def rc_params_key() -> str:
+    """``repr`` of the matplotlib rcParams that can affect a saved image
+    (style, fonts, ``savefig.*``, …)."""
+    import matplotlib
+    return repr(sorted((k, v) for k, v in matplotlib.rcParams.items()
+                       if not k.startswith(_RC_IGNORED)))
+
+
+def render_key(**inputs) -> str:
+    """Stable hash of the keyword *inputs* (dataclasses, numbers, strings, tuples).
+
+    Dataclass ``repr`` lists every field, so two configs hash equal
+    exactly when all their fields are equal.
+    """
+    text = repr(sorted(inputs.items()))
+    return hashlib.sha256(f"{code_salt()}\n{text}".encode("utf-8")).hexdigest()
+
+
+class RenderCache:
+    """
+    Size-bounded LRU directory of rendered images.
+
+    Parameters
+    ----------
+    directory : str or None
+        Cache directory (created on demand); default ``$CHIP_RENDER_CACHE``
+        or ``~/.cache/chip_renders``.
+    max_bytes : int
+        Total size above which least recently used entries are evicted.
+    """
+
+    def __init__(self, directory: Optional[str] = None, max_bytes: int = 256 << 20):
+        self.directory = os.path.expanduser(directory or DEFAULT_CACHE_DIR)
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+
+    def path(self, key: str) -> str:
+        return os.path.join(self.directory, key + _SUFFIX)
+
+    def get(self, key: str) -> Optional[bytes]:
+        """Cached bytes for *key*, or None; a hit marks the entry as recently used."""
+        path = self.path(key)
+        try:
+            with open(path, "rb") as f:
+                data = f.read()
+        except FileNotFoundError:
+            self.misses += 1
+            instrument.count("render_cache.misses")
+            return None
+        try:
+            os.utime(path)
+        except OSError:
+            pass        # evicted meanwhile; the data is still good
+        self.hits += 1
+        instrument.count("render_cache.hits")
+        return data
+
+    def put(self, key: str, data: bytes):
+        """Store *data* under *key* atomically, then evict down to *max_bytes*."""
+        os.makedirs(self.directory, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=self.directory, prefix=".tmp-")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp, self.path(key))
+        except BaseException:
+            if os.path.exists(tmp):
+                os.remove(tmp)
+            raise
+        self.evict()
+
+    def entries(self):
+        """``[(mtime, size, path)]`` of the cached files, oldest first."""
+        out = []
+        try:
+            it = os.scandir(self.directory)
+        except FileNotFoundError:
+            return out
+        with it:
+            for e in it:
+                if e.name.endswith(_SUFFIX):
+                    try:
+                        st = e.stat()
+                    except FileNotFoundError:
+                        continue
+                    out.append((st.st_mtime, st.st_size, e.path))
+        out.sort()
+        return out
+
+    def size(self) -> int:
+        return sum(size for _, size, _ in self.entries())
+
+    def evict(self, max_bytes: Optional[int] = None) -> int:
+        """Delete least recently used entries until the total fits; return count."""
+        limit = self.max_bytes if max_bytes is None else max_bytes
+        entries = self.entries()
+        total = sum(size for _, size, _ in entries)
+        removed = 0
+        for _, size, path in entries:
+            if total <= limit:
+                break
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            total -= size
+            removed += 1
+        return removed
+
+    def clear(self):
+        self.evict(max_bytes=0)
@@ -0,0 +1,211 @@
+"""
+Windowed metal density maps and fill-limit checks.
+
+The chip is rasterized at *pixel* size, tile by tile, and each tile is
+reduced at once to metal-pixel counts per *step* cell, so only the
+small cell grid outlives the tile.  The density of every *window*
+(stepped by *step*) then comes from a summed-area table of that grid::
+
+    from visualization.density import chip_density
+
+    maps = chip_density(geom, ground=ground, pixel=1.0, window=100.0, step=50.0)
+    dm = maps["total"]                 # also "metal", "ground", per layer
+    dm.density                         # (ny, nx) metal fraction per window
+    dm.violations(low=0.2, high=0.8)   # [DensityWindow, ...]
+    dm.draw(ax, low=0.2, high=0.8)     # heatmap overlay, flagged windows outlined
+
+Windows overhanging the chip edge are normalised by their area inside
+the chip.  Wafer-scale layouts are handled by the same tiling; memory is
+one tile plus the cell grid.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from . import instrument
+from .geometry import METAL_LAYERS, ChipGeometry
+from .raster import polygon_edges, rasterize
+from .styles import DEFAULT_PALETTE
+
+if TYPE_CHECKING:
+    from matplotlib.axes import Axes
+    from .ground import GroundPlane
+
+# Pixels per side of a rasterized tile (before rounding to whole cells)
+_TILE_PIXELS = 2048
+
+
+def _multiple(value: float, unit: float, what: str) -> int:
+    n = int(round(value / unit))
+    if n < 1 or abs(n * unit - value) > 1e-9 * max(value, 1.0):
+        raise ValueError(f"{what} {value} is not a whole multiple of {unit}")
+    return n
+
+
+def _sat_windows(cells: np.ndarray, k: int) -> np.ndarray:
+    """Sums of every ``k × k`` block of *cells*, via a summed-area table."""
+    sat = np.zeros((cells.shape[0] + 1, cells.shape[1] + 1))
+    np.cumsum(np.cumsum(cells, axis=0), axis=1, out=sat[1:, 1:])
+    return sat[k:, k:] - sat[:-k, k:] - sat[k:, :-k] + sat[:-k, :-k]
+
+
+@dataclass
+class DensityWindow:
+    """A window outside the density limits."""
+    bounds: Tuple[float, float, float, float]
+    density: float
+
+
+@dataclass
+class DensityMap:
+    """
+    Metal fraction of square windows on a regular grid.
+
+    Window ``(j, i)`` spans ``origin + (i, j)·step`` to that plus
+    *window* in x and y.
+    """
+    layer: str
+    origin: Tuple[float, float]
+    step: float
+    window: float
+    density: np.ndarray
+
+    @property
+    def extent(self) -> Tuple[float, float, float, float]:
+        """``imshow`` *extent*: each window drawn as the step cell around its centre."""
+        ny, nx = self.density.shape
+        x0 = self.origin[0] + (self.window - self.step) / 2
+        y0 = self.origin[1] + (self.window - self.step) / 2
+        return x0, x0 + nx * self.step, y0, y0 + ny * self.step
+
+    def window_bounds(self, i: int, j: int) -> Tuple[float, float, float, float]:
+        x0 = self.origin[0] + i * self.step
+        y0 = self.origin[1] + j * self.step
+        return x0, y0, x0 + self.window, y0 + self.window
+
+    def outside(self, low: Optional[float] = None,
+                high: Optional[float] = None) -> np.ndarray:
+        """``(ny, nx)`` bool: windows below *low* or above *high*."""
+        d = self.density
+        bad = np.zeros(d.shape, dtype=bool)
+        if low is not None:
+            bad |= d < low
+        if high is not None:
+            bad |= d > high
+        return bad
+
+    def violations(self, low: Optional[float] = None,
+                   high: Optional[float] = None) -> List[DensityWindow]:
+        """Windows outside ``[low, high]``, row by row from the bottom."""
+        j, i = np.nonzero(self.outside(low, high))
+        return [DensityWindow(self.window_bounds(a, b), float(self.density[b, a]))
+                for a, b in zip(i.tolist(), j.tolist())]
+
+    def stats(self) -> Dict[str, float]:
+        """``{"min", "mean", "max"}`` window density."""
+        d = self.density
+        if d.size == 0:
+            return {"min": 0.0, "mean": 0.0, "max": 0.0}
+        return {"min": float(d.min()), "mean": float(d.mean()), "max": float(d.max())}
+
+    def draw(self, ax: Axes, low: Optional[float] = None, high: Optional[float] = None,
+             cmap: str = "viridis", alpha: float = 0.6, flag_color: Optional[str] = None,
+             zorder: float = 20):
+        """Overlay the map on *ax* as a heatmap and outline the windows'
+        centre cells outside ``[low, high]``; returns ``(image, outline)``."""
+        from matplotlib.collections import PolyCollection
+
+        image = ax.imshow(self.density, origin="lower", extent=self.extent, cmap=cmap,
+                          vmin=0.0, vmax=1.0, alpha=alpha, interpolation="nearest",
+                          zorder=zorder)
+        image.set_label(f"density:{self.layer}")
+        j, i = np.nonzero(self.outside(low, high))
+        x0, _, y0, _ = self.extent
+        s = self.step
+        unit = np.array([[0, 0], [s, 0], [s, s], [0, s]], dtype=float)
+        corners = np.column_stack([x0 + i * s, y0 + j * s])
+        outline = PolyCollection(corners[:, None, :] + unit, facecolors="none",
+                                 edgecolors=flag_color or DEFAULT_PALETTE.junction,
+                                 linewidths=0.8, zorder=zorder + 0.1)
+        outline.set_label(f"density_flags:{self.layer}")
+        ax.add_collection(outline)
+        return image, outline
+
+
+def density_map(polygons: Iterable, bounds, pixel: float = 1.0, window: float = 100.0,
+                step: Optional[float] = None, layer: str = "metal",
+                tile: int = _TILE_PIXELS) -> DensityMap:
+    """
+    Windowed density of *polygons* over *bounds*.
+
+    Parameters
+    ----------
+    polygons : iterable of Polygon or vertex arrays
+        Filled with the nonzero rule, so overlaps count once.
+    bounds : (xmin, ymin, xmax, ymax)
+        Analysed area (the chip outline).
+    pixel : float
+        Raster pixel size; *step* must be a whole number of pixels.
+    window : float
+        Window edge length; a whole number of steps.
+    step : float or None
+        Window spacing; defaults to half the window.
+    tile : int
+        Pixels per side of each rasterized tile (rounded down to whole
+        cells, at least one).
+    """
+    step = window / 2 if step is None else float(step)
+    s = _multiple(step, pixel, "step")
+    k = _multiple(window, step, "window")
+    x0, y0, x1, y1 = (float(v) for v in bounds)
+    ncx = max(int(np.ceil((x1 - x0) / step - 1e-9)), k)
+    ncy = max(int(np.ceil((y1 - y0) / step - 1e-9)), k)
+    edges = polygon_edges(polygons)
+    metal = np.zeros((ncy, ncx))
+    n = max(1, tile // s)
+    with instrument.stage("density_raster"):
+        for cy in range(0, ncy, n):
+            for cx in range(0, ncx, n):
+                my, mx = min(n, ncy - cy), min(n, ncx - cx)
+                tx, ty = x0 + cx * step, y0 + cy * step
+                mask = rasterize((), (tx, ty, tx + mx * step, ty + my * step), pixel,
+                                 edges=edges, rule="nonzero")[:my * s, :mx * s]
+                metal[cy:cy + my, cx:cx + mx] = mask.reshape(my, s, mx, s).sum(axis=(1, 3))
+                instrument.count("density_tiles")
+
+    # Pixel centres of each cell that lie inside the chip
+    def inside(lo, hi, ncell):
+        centres = lo + (np.arange(ncell * s) + 0.5) * pixel
+        return (centres < hi).reshape(ncell, s).sum(axis=1)
+
+    area = np.outer(inside(y0, y1, ncy), inside(x0, x1, ncx)).astype(float)
+    with instrument.stage("density_windows"):
+        covered = _sat_windows(area, k)
+        density = _sat_windows(metal, k) / np.maximum(covered, 1.0)
+    return DensityMap(layer, (x0, y0), step, float(window), density)
+
+
+def chip_density(geometry: ChipGeometry, ground: Optional[GroundPlane] = None,
+                 layers: Optional[Iterable[str]] = None, **kwargs) -> Dict[str, DensityMap]:
+    """
+    Density maps of a chip: each drawn metal layer of *layers* (default
+    all), ``"metal"`` (their union) and, with a *ground* plane,
+    ``"ground"`` and ``"total"`` (ground plus metal).
+
+    Keyword arguments are those of :func:`density_map`.
+    """
+    names = [n for n in (layers or METAL_LAYERS) if geometry.sink.polygons(n)]
+    bounds = geometry.bounds
+    out: Dict[str, DensityMap] = {}
+    for name in names:
+        out[name] = density_map(geometry.layer(name), bounds, layer=name, **kwargs)
+    out["metal"] = density_map(geometry.metal(names), bounds, layer="metal", **kwargs)
+    if ground is not None:
+        out["ground"] = density_map(ground.polygons(), bounds, layer="ground", **kwargs)
+        out["total"] = density_map([*ground.polygons(), *geometry.metal(names)], bounds,
+                                   layer="total", **kwargs)
+    return out
@@ -4,13 +4,22 @@ Top-level convenience functions for rendering full chip layouts.
 
 from __future__ import annotations
 
+import io
 import matplotlib.pyplot as plt
 from matplotlib.axes import Axes
-from typing import Optional, Tuple
+from typing import Optional, Tuple, Union
 
 from .styles import LatticeConfig, FluxoniumDims, TunableTransmonDims, DEFAULT_PALETTE
 from .lattice import SquareLattice
 from .qubits import FluxoniumQubit, TunableTransmonCoupler
+from . import instrument
+from . import layers as _layers
+from .cache import RenderCache, rc_params_key, render_key
+from .ground import GroundPlane
+
+
+def _auto_figsize(rows: int, cols: int) -> Tuple[float, float]:
+    return (4 + cols * 3.5, 4 + rows * 3.5)
 
 
 def draw_chip(
@@ -24,6 +33,9 @@ def draw_chip(
     title: str | None = None,
     ax: Axes | None = None,
     show: bool = True,
+    cell_pattern: str | None = "checkerboard",
+    lattice: SquareLattice | None = None,
+    ground_gap: float | None = None,
 ) -> Axes:
     """
     Draw a complete chip with fluxonium data qubits on a square lattice
@@ -47,39 +59,153 @@ def draw_chip(
         If provided, draw on this Axes instead of creating a new figure.
     show : bool
         Call ``plt.show()`` at the end (ignored when *ax* is provided).
+    cell_pattern : str or None
+        Coupler orientation pattern, see :meth:`SquareLattice.place`.
+    lattice : SquareLattice or None
+        Pre-built lattice to draw; replaces *rows*, *cols*, *pitch* and
+        the dims, so repeated draws reuse its component geometry.
+    ground_gap : float or None
+        Also draw the ground plane, cut back this far from all metal
+        (see :class:`visualization.ground.GroundPlane`), as layer
+        ``"ground"``.
 
     Returns
     -------
     ax : matplotlib.axes.Axes
+        Its per-layer artist groups are available as
+        :func:`visualization.layers.chip_layers` ``(ax)``.
     """
-    config = LatticeConfig(rows=rows, cols=cols, pitch=pitch)
-    lattice = SquareLattice(config, fluxonium_dims=fluxonium_dims,
-                            coupler_dims=coupler_dims)
-
-    # Auto figure size
-    if ax is None:
-        if figsize is None:
-            figsize = (4 + cols * 3.5, 4 + rows * 3.5)
-        fig, ax = plt.subplots(figsize=figsize)
-    ax.set_aspect("equal")
-    ax.set_facecolor(DEFAULT_PALETTE.background)
-    ax.axis("off")
+    with instrument.stage("draw_chip"):
+        if lattice is None:
+            with instrument.stage("lattice"):
+                config = LatticeConfig(rows=rows, cols=cols, pitch=pitch)
+                lattice = SquareLattice(config, fluxonium_dims=fluxonium_dims,
+                                        coupler_dims=coupler_dims)
+        rows, cols = lattice.cfg.rows, lattice.cfg.cols
+
+        # Auto figure size
+        with instrument.stage("setup_axes"):
+            if ax is None:
+                if figsize is None:
+                    figsize = _auto_figsize(rows, cols)
+                fig, ax = plt.subplots(figsize=figsize)
+            ax.set_aspect("equal")
+            ax.set_facecolor(DEFAULT_PALETTE.background)
+            ax.axis("off")
+
+        with instrument.stage("place"):
+            chip = lattice.place(ax, labels=labels, cell_pattern=cell_pattern)
+        if chip is not None:
+            _layers.register(ax, chip)
+        if ground_gap is not None:
+            with instrument.stage("ground_plane"):
+                ground = GroundPlane.from_lattice(lattice, gap=ground_gap,
+                                                  cell_pattern=cell_pattern)
+                coll = ground.draw(ax)
+            if chip is not None:
+                chip.add("ground", coll)
+
+        # Auto limits
+        (xmin, xmax), (ymin, ymax) = lattice.auto_lims()
+        ax.set_xlim(xmin, xmax)
+        ax.set_ylim(ymin, ymax)
+
+        if title:
+            ax.set_title(title, fontsize=14, fontweight="bold")
+
+        with instrument.stage("tight_layout"):
+            ax.figure.tight_layout()
+    if show and ax is not None:
+        plt.show()
 
-    lattice.place(ax, labels=labels)
+    return ax
 
-    # Auto limits
-    (xmin, xmax), (ymin, ymax) = lattice.auto_lims()
-    ax.set_xlim(xmin, xmax)
-    ax.set_ylim(ymin, ymax)
 
-    if title:
-        ax.set_title(title, fontsize=14, fontweight="bold")
+def render_chip(
+    rows: int = 3,
+    cols: int = 3,
+    pitch: float = 0,
+    figsize: Optional[Tuple[float, float]] = None,
+    dpi: float = 100,
+    fmt: str = "png",
+    labels: bool = True,
+    fluxonium_dims: FluxoniumDims | None = None,
+    coupler_dims: TunableTransmonDims | None = None,
+    title: str | None = None,
+    cell_pattern: str | None = "checkerboard",
+    path: str | None = None,
+    cache: Union[RenderCache, bool, None] = None,
+    lattice: SquareLattice | None = None,
+    ground_gap: float | None = None,
+) -> bytes:
+    """
+    Render :func:`draw_chip` to PNG/SVG bytes off-screen, optionally cached.
 
-    plt.tight_layout()
-    if show and ax is not None:
-        plt.show()
+    Parameters
+    ----------
+    fmt : str
+        Any format ``Figure.savefig`` accepts (``"png"``, ``"svg"``, …).
+    path : str or None
+        Also write the image to this file.
+    cache : RenderCache, bool or None
+        Cache to consult first; ``True`` uses ``RenderCache()`` with its
+        default directory.  On a hit nothing is drawn.
 
-    return ax
+    Other parameters are those of :func:`draw_chip`.  The cache key of a
+    pre-built *lattice* uses its resolved config (auto pitch filled in).
+
+    Returns
+    -------
+    data : bytes
+        The encoded image.
+    """
+    from matplotlib.figure import Figure
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+
+    if cache is True:
+        cache = RenderCache()
+    if lattice is not None:
+        rows, cols = lattice.cfg.rows, lattice.cfg.cols
+        config = lattice.cfg
+        fluxonium_dims, coupler_dims = lattice.fluxonium_dims, lattice.coupler_dims
+    else:
+        config = LatticeConfig(rows=rows, cols=cols, pitch=pitch)
+    figsize = tuple(figsize) if figsize is not None else _auto_figsize(rows, cols)
+    key = None
+    data = None
+    if cache:
+        key = render_key(
+            config=config,
+            fluxonium_dims=fluxonium_dims or FluxoniumDims(),
+            coupler_dims=coupler_dims or TunableTransmonDims(),
+            palette=DEFAULT_PALETTE, figsize=figsize, dpi=dpi, fmt=fmt.lower(),
+            labels=labels, title=title, cell_pattern=cell_pattern,
+            ground_gap=ground_gap, rc=rc_params_key(),
+        )
+        data = cache.get(key)
+
+    if data is None:
+        fig = Figure(figsize=figsize)
+        FigureCanvasAgg(fig)
+        ax = fig.add_subplot()
+        draw_chip(rows, cols, pitch, labels=labels, fluxonium_dims=fluxonium_dims,
+                  coupler_dims=coupler_dims, title=title, ax=ax, show=False,
+                  cell_pattern=cell_pattern, lattice=lattice, ground_gap=ground_gap)
+        buf = io.BytesIO()
+        # No timestamp in the metadata and a fixed SVG id salt (unless one
+        # is set), so equal inputs give equal bytes
+        rc = {} if plt.rcParams["svg.hashsalt"] else {"svg.hashsalt": "render_chip"}
+        with instrument.stage("savefig"), plt.rc_context(rc):
+            fig.savefig(buf, format=fmt, dpi=dpi,
+                        metadata={"Date": None} if fmt.lower() in ("svg", "pdf") else None)
+        data = buf.getvalue()
+        if cache:
+            cache.put(key, data)
+
+    if path is not None:
+        with open(path, "wb") as f:
+            f.write(data)
+    return data
 
 
 # ── quick-draw single components (useful during development) ───────────
@@ -0,0 +1,157 @@
+"""
+Minimal GDSII stream writer for chip polygons.
+
+Only what a mask layout of this chip needs: one library of cells holding
+``BOUNDARY`` elements on numbered layers and ``AREF`` arrays of other
+cells (millions of repeated flux holes as a few hundred records).  GDSII
+boundaries cannot have holes, so polygons with holes are *keyholed*: each
+hole is joined to the outline by a zero-width slit::
+
+    from visualization.gds import GdsCell, write_gds
+
+    chip = GdsCell("CHIP")
+    chip.add_polygons(geom.metal(), layer=1)
+    write_gds("chip.gds", [chip])
+
+Coordinates are in µm (user unit) on a 1 nm database grid by default.
+"""
+
+from __future__ import annotations
+
+import struct
+import time
+from dataclasses import dataclass, field
+from typing import Iterable, List, Sequence, Tuple
+
+import numpy as np
+
+from .boolean import Polygon, as_polygon
+
+# A record holds at most 65535 bytes: 8190 vertices plus the closing one
+MAX_POINTS = 8190
+
+# Record types (type byte, data type byte)
+_HEADER, _BGNLIB, _LIBNAME, _UNITS, _ENDLIB = 0x0002, 0x0102, 0x0206, 0x0305, 0x0400
+_BGNSTR, _STRNAME, _ENDSTR = 0x0502, 0x0606, 0x0700
+_BOUNDARY, _LAYER, _DATATYPE, _XY, _ENDEL = 0x0800, 0x0D02, 0x0E02, 0x1003, 0x1100
+_AREF, _SNAME, _COLROW = 0x0B00, 0x1206, 0x1302
+
+# AREF column and row counts are signed 16-bit
+MAX_REPEAT = 32767
+
+
+def keyhole(polygon: Polygon) -> np.ndarray:
+    """Single ring equivalent to *polygon*, holes bridged to the outline.
+
+    Holes are taken by decreasing maximum x; a horizontal slit runs from
+    a hole's rightmost vertex to the nearest edge of the ring built so
+    far, so slits never cross.
+    """
+    ring = polygon.exterior
+    for hole in sorted(polygon.holes, key=lambda h: -h[:, 0].max()):
+        k = int(np.argmax(hole[:, 0]))
+        m = hole[k]
+        a, b = ring, np.roll(ring, -1, axis=0)
+        straddle = (a[:, 1] > m[1]) != (b[:, 1] > m[1])
+        dy = np.where(straddle, b[:, 1] - a[:, 1], 1.0)
+        x = a[:, 0] + (m[1] - a[:, 1]) * (b[:, 0] - a[:, 0]) / dy
+        x = np.where(straddle & (x >= m[0]), x, np.inf)
+        i = int(np.argmin(x))
+        hit = np.array([x[i], m[1]])
+        loop = np.roll(hole, -k, axis=0)
+        ring = np.vstack([ring[:i + 1], hit, loop, m, hit, ring[i + 1:]])
+    return ring
+
+
+def _record(rtype: int, data: bytes = b"") -> bytes:
+    return struct.pack(">HH", 4 + len(data), rtype) + data
+
+
+def _string(s: str) -> bytes:
+    data = s.encode("ascii")
+    return data + b"\0" * (len(data) % 2)
+
+
+def _real8(x: float) -> bytes:
+    """GDSII 8-byte real: sign, excess-64 base-16 exponent, 56-bit mantissa."""
+    if x == 0:
+        return bytes(8)
+    sign, x = (0x80, -x) if x < 0 else (0, x)
+    exp = 64
+    while x >= 1:
+        x /= 16
+        exp += 1
+    while x < 1 / 16:
+        x *= 16
+        exp -= 1
+    mant = int(round(x * (1 << 56)))
+    if mant >> 56:
+        mant >>= 4
+        exp += 1
+    return bytes([sign | exp]) + mant.to_bytes(7, "big")
+
+
+@dataclass
+class GdsCell:
+    """A GDSII structure: boundaries as ``(layer, datatype, ring)`` and
+    arrays as ``(cell name, (x, y), cols, rows, (dx, dy))``."""
+    name: str
+    boundaries: List[Tuple[int, int, np.ndarray]] = field(default_factory=list)
+    arrays: List[tuple] = field(default_factory=list)
+
+    def add_polygons(self, polygons: Iterable, layer: int, datatype: int = 0,
+                     max_points: int = MAX_POINTS) -> "GdsCell":
+        """Add *polygons* (keyholed if they have holes) on *layer*."""
+        for p in polygons:
+            poly = as_polygon(p)
+            ring = keyhole(poly) if poly.holes else poly.exterior
+            if len(ring) > max_points:
+                raise ValueError(f"{self.name}: polygon with {len(ring)} vertices "
+                                 f"exceeds the GDSII limit of {max_points}")
+            self.boundaries.append((layer, datatype, ring))
+        return self
+
+    def add_array(self, cell: str, origin, cols: int, rows: int, pitch) -> "GdsCell":
+        """Place *cell* ``cols × rows`` times from *origin* at *pitch* ``(dx, dy)``."""
+        if not (0 < cols <= MAX_REPEAT and 0 < rows <= MAX_REPEAT):
+            raise ValueError(f"{self.name}: array of {cols} x {rows} exceeds "
+                             f"the GDSII limit of {MAX_REPEAT}")
+        self.arrays.append((cell, tuple(origin), int(cols), int(rows), tuple(pitch)))
+        return self
+
+    def _stream(self, db_per_user: float, stamp: bytes) -> List[bytes]:
+        out = [_record(_BGNSTR, stamp), _record(_STRNAME, _string(self.name))]
+        for layer, datatype, ring in self.boundaries:
+            xy = np.round(np.vstack([ring, ring[:1]]) * db_per_user).astype(">i4")
+            out += [_record(_BOUNDARY), _record(_LAYER, struct.pack(">h", layer)),
+                    _record(_DATATYPE, struct.pack(">h", datatype)),
+                    _record(_XY, xy.tobytes()), _record(_ENDEL)]
+        for cell, (x, y), cols, rows, (dx, dy) in self.arrays:
+            # Origin, then the displaced column and row corners
+            xy = np.round(np.array([[x, y], [x + cols * dx, y], [x, y + rows * dy]])
+                          * db_per_user).astype(">i4")
+            out += [_record(_AREF), _record(_SNAME, _string(cell)),
+                    _record(_COLROW, struct.pack(">hh", cols, rows)),
+                    _record(_XY, xy.tobytes()), _record(_ENDEL)]
+        out.append(_record(_ENDSTR))
+        return out
+
+
+def gds_bytes(cells: Sequence[GdsCell], libname: str = "CHIP",
+              unit: float = 1e-6, precision: float = 1e-9) -> bytes:
+    """GDSII stream of *cells*; *unit* and *precision* are in metres."""
+    stamp = struct.pack(">12h", *(time.localtime()[:6] * 2))
+    db_per_user = unit / precision
+    out = [_record(_HEADER, struct.pack(">h", 600)), _record(_BGNLIB, stamp),
+           _record(_LIBNAME, _string(libname)),
+           _record(_UNITS, _real8(precision / unit) + _real8(precision))]
+    for cell in cells:
+        out.extend(cell._stream(db_per_user, stamp))
+    out.append(_record(_ENDLIB))
+    return b"".join(out)
+
+
+def write_gds(path: str, cells: Sequence[GdsCell], **kwargs) -> None:
+    """Write :func:`gds_bytes` to *path*."""
+    with open(path, "wb") as f:
+        f.write(gds_bytes(cells, **kwargs))
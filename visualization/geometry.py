@@ -0,0 +1,84 @@
+"""
+Merged metal geometry of a placed lattice, for exports and analysis.
+
+Records ``SquareLattice.place`` into a :class:`~visualization.layers.LayerSink`
+(no matplotlib figure) and unions each component's overlapping shapes
+with :mod:`visualization.boolean`::
+
+    from visualization.geometry import ChipGeometry
+
+    geom = ChipGeometry.from_lattice(lattice)
+    geom.layer("xmon_body")      # per-component union within one layer
+    geom.metal()                 # per-component union across all metal layers
+    geom.stats()                 # raw vs merged polygon counts
+
+Components repeat a few variants, so each distinct shape group is
+unioned once and translated to its other positions.
+"""
+
+from __future__ import annotations
+
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from .boolean import Polygon, union_groups
+from .layers import LAYER_NAMES, LayerSink
+
+# Layers of circuit metal (not decoration, not the ground plane cut around it)
+METAL_LAYERS = tuple(n for n in LAYER_NAMES if n not in ("ground", "cells", "labels"))
+
+
+class ChipGeometry:
+    """
+    Polygons of a drawn lattice, raw and merged.
+
+    Parameters
+    ----------
+    sink : LayerSink
+        Recorded drawing; polygons must carry component tags.
+    bounds : (xmin, ymin, xmax, ymax)
+        Chip outline (``SquareLattice.auto_lims`` by default).
+    """
+
+    def __init__(self, sink: LayerSink, bounds: Tuple[float, float, float, float]):
+        self.sink = sink
+        self.bounds = tuple(float(v) for v in bounds)
+        self._layers: Dict[str, List[Polygon]] = {}
+        self._metal: Dict[Tuple[str, ...], List[Polygon]] = {}
+
+    @classmethod
+    def from_lattice(cls, lattice, cell_pattern: str = "checkerboard",
+                     first_cell: str = "resonator", margin: float = 350) -> "ChipGeometry":
+        sink = LayerSink()
+        lattice.place(sink, cell_pattern=cell_pattern, first_cell=first_cell,
+                      shade_cells=False)
+        (xmin, xmax), (ymin, ymax) = lattice.auto_lims(margin)
+        return cls(sink, (xmin, ymin, xmax, ymax))
+
+    def layer(self, name: str) -> List[Polygon]:
+        """*name*'s polygons, unioned per component."""
+        if name not in self._layers:
+            self._layers[name] = self.sink.merged(name)[0]
+        return self._layers[name]
+
+    def metal(self, layers: Optional[Sequence[str]] = None) -> List[Polygon]:
+        """Polygons of *layers* (default all metal), unioned per component."""
+        layers = tuple(layers or METAL_LAYERS)
+        if layers not in self._metal:
+            polys, keys = [], []
+            for name in layers:
+                for i, (poly, owner) in enumerate(zip(self.sink._polys[name],
+                                                      self.sink._owners[name])):
+                    polys.append(poly)
+                    keys.append((name, i) if owner is None else owner)
+            self._metal[layers] = union_groups(polys, keys)[0]
+        return self._metal[layers]
+
+    def stats(self) -> Dict[str, Tuple[int, int]]:
+        """``{layer: (raw, merged)}`` polygon counts, plus ``"metal"``."""
+        out = {}
+        for name in METAL_LAYERS:
+            raw = len(self.sink.polygons(name))
+            if raw:
+                out[name] = (raw, len(self.layer(name)))
+        out["metal"] = (sum(r for r, _ in out.values()), len(self.metal()))
+        return out
@@ -0,0 +1,182 @@
+"""
+Ground plane with CPW gap cut-outs.
+
+The ground metal is the chip area minus a clearance of width *gap*
+around every piece of circuit metal::
+
+    from visualization.ground import GroundPlane
+
+    ground = GroundPlane.from_lattice(lattice, gap=20)
+    ground.polygons()                 # [Polygon, ...], one or more per tile
+    ground.rasterize(pixel=2.0)       # (ny, nx) bool mask
+    ground.to_svg("chip.svg")         # ground + metal, direct SVG
+    ground.to_gds("chip.gds")         # ground + metal, GDSII
+
+Each component's merged metal is offset once per variant
+(:func:`visualization.boolean.offset`, cached by translation).  The chip
+is then cut into square tiles (one lattice pitch by default, so tiles
+repeat); each tile's ground is the tile minus the clearances that touch
+it.  Repeated tiles reuse the cached result, and tiles whose ground
+would exceed the GDSII vertex limit are split into quarters.
+"""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, List, Optional, Tuple
+
+import numpy as np
+
+from . import instrument
+from .boolean import Polygon, _memo, _translation_key, difference, offset
+from .geometry import ChipGeometry
+from .gds import MAX_POINTS, GdsCell, write_gds
+from .raster import rasterize
+from .styles import DEFAULT_PALETTE, Palette
+from .svg import write_svg
+
+if TYPE_CHECKING:
+    from matplotlib.axes import Axes
+
+# Vertex matching tolerance of the offset and tile cuts (0.1 nm)
+_TOL = 1e-4
+
+
+def _box_ring(x0: float, y0: float, x1: float, y1: float) -> np.ndarray:
+    return np.array([[x0, y0], [x1, y0], [x1, y1], [x0, y1]], dtype=float)
+
+
+def _gds_points(poly: Polygon) -> int:
+    """Vertex count of *poly* once keyholed (three extra per hole)."""
+    return len(poly.exterior) + sum(len(h) + 3 for h in poly.holes)
+
+
+class GroundPlane:
+    """
+    Ground metal of a chip: its outline minus the metal clearance.
+
+    Parameters
+    ----------
+    geometry : ChipGeometry
+        Circuit metal and chip outline.
+    gap : float
+        Clearance between circuit metal and ground (CPW gap), data units.
+    tile : float
+        Tile edge length.
+    arc_step : float
+        Angle (rad) between chords of the rounded clearance corners.
+    max_points : int
+        Largest keyholed polygon allowed in a tile before it is split.
+    """
+
+    def __init__(self, geometry: ChipGeometry, gap: float = 20.0, tile: float = 500.0,
+                 arc_step: float = np.pi / 8, max_points: int = MAX_POINTS):
+        self.geometry = geometry
+        self.gap = float(gap)
+        self.tile = float(tile)
+        self.arc_step = arc_step
+        self.max_points = max_points
+        self._clearance: Optional[List[Polygon]] = None
+        self._polygons: Optional[List[Polygon]] = None
+
+    @classmethod
+    def from_lattice(cls, lattice, gap: float = 20.0, tile: Optional[float] = None,
+                     cell_pattern: str = "checkerboard", first_cell: str = "resonator",
+                     margin: float = 350, **kwargs) -> "GroundPlane":
+        """Ground plane of *lattice*; tiles default to one lattice pitch."""
+        geom = ChipGeometry.from_lattice(lattice, cell_pattern, first_cell, margin)
+        return cls(geom, gap, tile or lattice.cfg.pitch, **kwargs)
+
+    @property
+    def bounds(self) -> Tuple[float, float, float, float]:
+        return self.geometry.bounds
+
+    def clearance(self) -> List[Polygon]:
+        """Circuit metal grown by *gap*, per component (may overlap)."""
+        if self._clearance is None:
+            with instrument.stage("ground_offset"):
+                self._clearance = [p for poly in self.geometry.metal()
+                                   for p in offset(poly, self.gap, self.arc_step, _TOL)]
+        return self._clearance
+
+    def polygons(self) -> List[Polygon]:
+        """Ground polygons, tile by tile (adjacent tiles share edges)."""
+        if self._polygons is None:
+            clear = self.clearance()
+            boxes = np.array([p.bounds for p in clear]).reshape(-1, 4)
+            x0, y0, x1, y1 = self.bounds
+            xs = np.append(np.arange(x0, x1, self.tile), x1)
+            ys = np.append(np.arange(y0, y1, self.tile), y1)
+            out: List[Polygon] = []
+            with instrument.stage("ground_tiles"):
+                for ty0, ty1 in zip(ys[:-1], ys[1:]):
+                    for tx0, tx1 in zip(xs[:-1], xs[1:]):
+                        out.extend(self._cut((tx0, ty0, tx1, ty1), clear, boxes,
+                                             np.arange(len(clear))))
+            instrument.count("ground_polygons", len(out))
+            self._polygons = out
+        return self._polygons
+
+    def _cut(self, box, clear: List[Polygon], boxes: np.ndarray,
+             idx: np.ndarray) -> List[Polygon]:
+        """Ground in *box*: the box minus the clearances *idx* touching it."""
+        x0, y0, x1, y1 = box
+        b = boxes[idx]
+        idx = idx[(b[:, 0] < x1) & (b[:, 2] > x0) & (b[:, 1] < y1) & (b[:, 3] > y0)]
+        if len(idx) == 0:
+            return [Polygon(_box_ring(x0, y0, x1, y1))]
+
+        origin = np.array([x0, y0])
+        rect = _box_ring(0.0, 0.0, x1 - x0, y1 - y0)
+        cut = [clear[i].translated(-origin) for i in idx.tolist()]
+        key = b"G" + _translation_key([rect] + [r for p in cut for r in p.rings()],
+                                      np.zeros(2), _TOL)
+        local = _memo(key, lambda: difference([rect], cut, _TOL))
+        if (max((_gds_points(p) for p in local), default=0) > self.max_points
+                and min(x1 - x0, y1 - y0) > 2 * self.gap):
+            xm, ym = (x0 + x1) / 2, (y0 + y1) / 2
+            return [p for sub in ((x0, y0, xm, ym), (xm, y0, x1, ym),
+                                  (x0, ym, xm, y1), (xm, ym, x1, y1))
+                    for p in self._cut(sub, clear, boxes, idx)]
+        return [p.translated(origin) for p in local]
+
+    # ── outputs ─────────────────────────────────────────────────────────
+    def rasterize(self, pixel: float, bounds=None) -> np.ndarray:
+        """Ground mask at *pixel* size over *bounds* (default the chip)."""
+        return rasterize(self.polygons(), bounds or self.bounds, pixel)
+
+    def draw(self, ax: Axes, color=None, zorder: float = -2):
+        """Add the ground as one ``PolyCollection`` (a single path, so tile
+        seams do not show) to *ax* and return it."""
+        from matplotlib.collections import PolyCollection
+
+        paths = [p.path_data() for p in self.polygons()]
+        coll = PolyCollection([], facecolors=[color or DEFAULT_PALETTE.ground_plane],
+                              edgecolors="none", zorder=zorder)
+        if paths:
+            coll.set_verts_and_codes([np.vstack([v for v, _ in paths])],
+                                     [np.concatenate([c for _, c in paths])])
+        coll.set_label("ground")
+        ax.add_collection(coll)
+        return coll
+
+    def to_svg(self, path: str, metal: bool = True,
+               palette: Palette = DEFAULT_PALETTE, **kwargs) -> None:
+        """Write the ground (and merged metal) as SVG."""
+        layers = [("ground", self.polygons(), palette.ground_plane)]
+        if metal:
+            layers.append(("metal", self.geometry.metal(), palette.xmon_body))
+        write_svg(path, self.bounds, layers, background=palette.background, **kwargs)
+
+    def gds_cell(self, name: str = "CHIP", layer: int = 1,
+                 metal_layer: Optional[int] = None) -> GdsCell:
+        """Cell with the ground on *layer* and the metal on *metal_layer*
+        (default the same layer)."""
+        chip = GdsCell(name).add_polygons(self.polygons(), layer,
+                                          max_points=self.max_points)
+        return chip.add_polygons(self.geometry.metal(),
+                                 layer if metal_layer is None else metal_layer)
+
+    def to_gds(self, path: str, layer: int = 1, metal_layer: Optional[int] = None,
+               cell: str = "CHIP", **kwargs) -> None:
+        """Write :meth:`gds_cell` as GDSII."""
+        write_gds(path, [self.gds_cell(cell, layer, metal_layer)], **kwargs)
@@ -0,0 +1,244 @@
+"""
+Lightweight timing / counting instrumentation for the 2D and 3D builds.
+
+Library code marks its stages and components; nothing is recorded unless
+a :class:`Recorder` is active, in which case every ``stage`` /
+``component`` call is a shared no-op context manager::
+
+    from visualization import instrument
+
+    with instrument.recording(trace_memory=True) as rec:
+        draw_chip(rows=10, cols=10, show=False)
+    rec.to_json("profile.json")
+
+Recorded data
+-------------
+stages      wall time and call count per nested stage path
+            (``"draw_chip/place/couplers"``), with tracemalloc
+            current/peak deltas when *trace_memory* is on
+components  wall time, call count and counter deltas (artists, scene
+            objects, vertices …) per component class
+counters    free-form totals (``count(name, n)``)
+snapshots   top allocation sites from :meth:`Recorder.snapshot`
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import platform
+import time
+import tracemalloc
+from contextlib import contextmanager
+from typing import Callable, Dict, List, Optional
+
+import numpy as np
+
+
+_active: Optional["Recorder"] = None
+
+
+class _NullContext:
+    """Shared no-op context manager used while no recorder is active."""
+
+    def __enter__(self):
+        return None
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NULL = _NullContext()
+
+
+def _bump(table: dict, key: str, **values):
+    entry = table.get(key)
+    if entry is None:
+        entry = table[key] = {}
+    for k, v in values.items():
+        entry[k] = entry.get(k, 0) + v
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+#  RECORDER
+# ═══════════════════════════════════════════════════════════════════════════
+class Recorder:
+    """
+    Collects stage timings, component statistics and counters.
+
+    Parameters
+    ----------
+    trace_memory : bool
+        Start ``tracemalloc`` while recording and attach allocation deltas
+        to every stage.
+    """
+
+    def __init__(self, trace_memory: bool = False):
+        self.trace_memory = trace_memory
+        self.stages: Dict[str, dict] = {}
+        self.components: Dict[str, dict] = {}
+        self.counters: Dict[str, float] = {}
+        self.snapshots: List[dict] = []
+        self._stack: List[str] = []
+        # Highest traced memory seen so far by each open stage
+        self._peaks: List[int] = []
+        self._started_tracemalloc = False
+
+    # ── lifecycle ──────────────────────────────────────────────────────
+    def start(self):
+        if self.trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracemalloc = True
+
+    def stop(self):
+        if self._started_tracemalloc:
+            tracemalloc.stop()
+            self._started_tracemalloc = False
+
+    # ── recording ──────────────────────────────────────────────────────
+    @contextmanager
+    def stage(self, name: str):
+        self._stack.append(name)
+        path = "/".join(self._stack)
+        mem0 = 0
+        if self.trace_memory:
+            # Save the enclosing stage's peak before resetting it for this one
+            mem0, peak = tracemalloc.get_traced_memory()
+            if self._peaks:
+                self._peaks[-1] = max(self._peaks[-1], peak)
+            self._peaks.append(mem0)
+            tracemalloc.reset_peak()
+        t0 = time.perf_counter()
+        try:
+            yield
+        finally:
+            dt = time.perf_counter() - t0
+            self._stack.pop()
+            _bump(self.stages, path, calls=1, seconds=dt)
+            if self.trace_memory:
+                cur, peak = tracemalloc.get_traced_memory()
+                peak = max(self._peaks.pop(), peak)
+                if self._peaks:
+                    self._peaks[-1] = max(self._peaks[-1], peak)
+                entry = self.stages[path]
+                entry["mem_delta_bytes"] = entry.get("mem_delta_bytes", 0) + cur - mem0
+                entry["mem_peak_bytes"] = max(entry.get("mem_peak_bytes", 0),
+                                              peak - mem0)
+
+    @contextmanager
+    def component(self, name: str, counter: Callable[[], dict] | None = None):
+        before = counter() if counter is not None else None
+        t0 = time.perf_counter()
+        try:
+            yield
+        finally:
+            dt = time.perf_counter() - t0
+            deltas = {}
+            if counter is not None:
+                after = counter()
+                deltas = {k: after[k] - before.get(k, 0) for k in after}
+            _bump(self.components, name, calls=1, seconds=dt, **deltas)
+
+    def count(self, name: str, n: float = 1):
+        self.counters[name] = self.counters.get(name, 0) + n
+
+    def snapshot(self, label: str, top: int = 10):
+        """Record the *top* allocation sites (needs *trace_memory*)."""
+        if not tracemalloc.is_tracing():
+            return
+        stats = tracemalloc.take_snapshot().statistics("lineno")[:top]
+        cur, peak = tracemalloc.get_traced_memory()
+        self.snapshots.append({
+            "label": label,
+            "current_bytes": cur,
+            "peak_bytes": peak,
+            "top": [{"where": str(s.traceback[0]), "bytes": s.size,
+                     "count": s.count} for s in stats],
+        })
+
+    # ── export ─────────────────────────────────────────────────────────
+    def to_dict(self) -> dict:
+        return {
+            "machine": machine_info(),
+            "stages": self.stages,
+            "components": self.components,
+            "counters": self.counters,
+            "snapshots": self.snapshots,
+        }
+
+    def to_json(self, path=None, indent: int = 2) -> str:
+        """Return the recording as JSON, also writing it to *path* if given."""
+        text = json.dumps(self.to_dict(), indent=indent)
+        if path is not None:
+            with open(path, "w") as f:
+                f.write(text)
+        return text
+
+
+def machine_info() -> dict:
+    """Interpreter, platform and library versions for result files."""
+    info = {
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "processor": platform.processor(),
+        "cpu_count": os.cpu_count(),
+        "numpy": np.__version__,
+    }
+    try:
+        import matplotlib
+        info["matplotlib"] = matplotlib.__version__
+    except ImportError:
+        pass
+    return info
+
+
+# ── module-level API used by library code ──────────────────────────────────
+
+@contextmanager
+def recording(trace_memory: bool = False):
+    """Activate a fresh :class:`Recorder` for the duration of the block."""
+    global _active
+    previous = _active
+    rec = Recorder(trace_memory=trace_memory)
+    rec.start()
+    _active = rec
+    try:
+        yield rec
+    finally:
+        _active = previous
+        rec.stop()
+
+
+def active() -> Optional[Recorder]:
+    """The recorder currently collecting data, or None."""
+    return _active
+
+
+def stage(name: str):
+    """Time a named (nestable) stage; no-op when nothing is recording."""
+    rec = _active
+    return _NULL if rec is None else rec.stage(name)
+
+
+def component(name: str, counter: Callable[[], dict] | None = None):
+    """Time one component placement; *counter* returns counts to diff."""
+    rec = _active
+    return _NULL if rec is None else rec.component(name, counter)
+
+
+def count(name: str, n: float = 1):
+    """Add *n* to counter *name*; no-op when nothing is recording."""
+    rec = _active
+    if rec is not None:
+        rec.count(name, n)
+
+
+def artist_counter(ax):
+    """Counter callable returning the number of artists on *ax*."""
+    def counter():
+        children = getattr(ax, "_children", None)   # matplotlib >= 3.5
+        n = len(children) if children is not None else len(ax.get_children())
+        return {"artists": n}
+    return counter
@@ -0,0 +1,275 @@
+"""
+Batched chip labels with zoom and collision culling.
+
+One ``ax.text`` per qubit and coupler is slow to lay out and, on large
+lattices, piles up into unreadable noise.  :class:`LabelCollection` draws
+every label of a chip as a single artist:
+
+* glyph outlines are cached per font and character and composed into
+  label paths once, so drawing is one ``draw_path`` call per colour on
+  every backend (Agg, SVG, PDF);
+* labels are drawn only above a zoom level (*min_scale* pixels per data
+  unit) and only when their anchor box is inside the axes;
+* overlapping labels are dropped through a spatial hash in screen space,
+  earlier labels winning, so the number drawn is bounded by the screen
+  area rather than by the lattice size.
+
+::
+
+    coll = LabelCollection([(0, -40), (200, -30)], ["D0", "C0"],
+                           [LabelStyle(weight="bold"), LabelStyle(style="italic")])
+    ax.add_artist(coll)
+"""
+
+from __future__ import annotations
+
+import functools
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+from matplotlib import ft2font
+from matplotlib.artist import Artist, allow_rasterization
+from matplotlib.colors import to_rgba
+from matplotlib.font_manager import FontProperties, findfont, get_font
+from matplotlib.path import Path
+from matplotlib.transforms import IdentityTransform
+
+from .styles import DEFAULT_PALETTE
+
+
+# Glyphs are loaded at this size (points at 72 dpi) and scaled per label
+_GLYPH_SIZE = 100.0
+_NO_HINTING = (ft2font.LoadFlags.NO_HINTING if hasattr(ft2font, "LoadFlags")
+               else ft2font.LOAD_NO_HINTING)
+
+
+@dataclass(frozen=True)
+class LabelStyle:
+    """Font and alignment of a group of labels (``ax.text`` keywords)."""
+    fontsize: float = 8
+    color: str = DEFAULT_PALETTE.label_color
+    weight: str = "normal"
+    style: str = "normal"
+    family: str = "sans-serif"
+    ha: str = "center"
+    va: str = "top"
+
+    @classmethod
+    def from_text_kwargs(cls, kw: dict) -> "LabelStyle":
+        return cls(fontsize=kw.get("fontsize", cls.fontsize),
+                   color=kw.get("color", cls.color),
+                   weight=kw.get("fontweight", kw.get("weight", cls.weight)),
+                   style=kw.get("fontstyle", kw.get("style", cls.style)),
+                   family=kw.get("family", kw.get("fontfamily", cls.family)),
+                   ha=kw.get("ha", kw.get("horizontalalignment", cls.ha)),
+                   va=kw.get("va", kw.get("verticalalignment", cls.va)))
+
+
+# ── glyph cache ─────────────────────────────────────────────────────────────
+
+@functools.lru_cache(maxsize=None)
+def _font_file(family: str, weight: str, style: str) -> str:
+    return findfont(FontProperties(family=family, weight=weight, style=style))
+
+
+@functools.lru_cache(maxsize=4096)
+def _glyph(path: str, char: str) -> Tuple[np.ndarray, np.ndarray, float]:
+    """Outline ``(verts, codes)`` and advance of *char*, at ``_GLYPH_SIZE`` points."""
+    font = get_font(path)
+    font.set_size(_GLYPH_SIZE, 72)
+    glyph = font.load_char(ord(char), flags=_NO_HINTING)
+    verts, codes = font.get_path()
+    return (np.asarray(verts, dtype=float).reshape(-1, 2),
+            np.asarray(codes, dtype=np.uint8), glyph.linearHoriAdvance / 65536)
+
+
+def text_outline(s: str, style: LabelStyle):
+    """``(verts, codes, box)`` of *s* in points relative to its anchor.
+
+    *box* is ``(x0, y0, x1, y1)`` of the aligned line (advance width ×
+    ascent of ``l`` to descent of ``p``, as ``Text`` lays out one line).
+    """
+    path = _font_file(style.family, style.weight, style.style)
+    scale = style.fontsize / _GLYPH_SIZE
+    parts, codes, x = [], [], 0.0
+    for char in s:
+        v, c, advance = _glyph(path, char)
+        if len(v):
+            parts.append(v + (x, 0.0))
+            codes.append(c)
+        x += advance
+    ascent = _glyph(path, "l")[0][:, 1].max(initial=0.0)
+    descent = _glyph(path, "p")[0][:, 1].min(initial=0.0)
+    dx = {"left": 0.0, "center": -x / 2, "right": -x}[style.ha]
+    dy = {"top": -ascent, "bottom": -descent, "center": -(ascent + descent) / 2,
+          "baseline": 0.0, "center_baseline": -ascent / 2}[style.va]
+    verts = (np.vstack(parts) + (dx, dy)) * scale if parts else np.zeros((0, 2))
+    codes = np.concatenate(codes) if codes else np.zeros(0, np.uint8)
+    box = np.array([dx, dy + descent, dx + x, dy + ascent]) * scale
+    return verts, codes, box
+
+
+# ── culling ─────────────────────────────────────────────────────────────────
+
+def cull_overlaps(boxes: np.ndarray, pad: float = 0.0) -> np.ndarray:
+    """Indices of a greedy non-overlapping subset of *boxes*, in input order.
+
+    Each box is tested only against accepted boxes in the spatial-hash
+    cells it touches; cells are as large as the largest box, so a box
+    touches at most four.
+    """
+    boxes = np.asarray(boxes, dtype=float)
+    if len(boxes) == 0:
+        return np.zeros(0, dtype=int)
+    b = boxes + (-pad, -pad, pad, pad)
+    cell = max(float((b[:, 2:] - b[:, :2]).max()), 1e-9)
+    lo = np.floor(b[:, :2] / cell).astype(int).tolist()
+    hi = np.floor(b[:, 2:] / cell).astype(int).tolist()
+    rows = b.tolist()
+    grid: Dict[Tuple[int, int], List[int]] = {}
+    keep = []
+    for i, (x0, y0, x1, y1) in enumerate(rows):
+        cells = [(gx, gy) for gx in range(lo[i][0], hi[i][0] + 1)
+                 for gy in range(lo[i][1], hi[i][1] + 1)]
+        clear = True
+        for key in cells:
+            for k in grid.get(key, ()):
+                a = rows[k]
+                if x0 < a[2] and a[0] < x1 and y0 < a[3] and a[1] < y1:
+                    clear = False
+                    break
+            if not clear:
+                break
+        if clear:
+            keep.append(i)
+            for key in cells:
+                grid.setdefault(key, []).append(i)
+    return np.asarray(keep, dtype=int)
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+#  ARTIST
+# ═══════════════════════════════════════════════════════════════════════════
+class LabelCollection(Artist):
+    """
+    Many short text labels drawn as one artist.
+
+    Parameters
+    ----------
+    xy : (N, 2) array
+        Anchor of each label in data coordinates.
+    texts : sequence of str
+        Label strings; earlier labels win overlaps.
+    styles : LabelStyle or sequence of LabelStyle
+        One style for all labels, or one per label.
+    min_scale : float or None
+        Draw nothing while the view shows fewer screen pixels per data
+        unit than this.
+    pad_px : float
+        Free margin kept around each drawn label.
+    """
+
+    zorder = 3
+
+    def __init__(self, xy, texts: Sequence[str], styles=LabelStyle(),
+                 min_scale: Optional[float] = None, pad_px: float = 2.0):
+        super().__init__()
+        self.set_in_layout(False)
+        self._xy = np.asarray(xy, dtype=float).reshape(-1, 2)
+        self.texts = list(texts)
+        if isinstance(styles, LabelStyle):
+            styles = [styles] * len(self.texts)
+        self.styles = list(styles)
+        self.min_scale = min_scale
+        self.pad_px = pad_px
+        self._colors = np.array([to_rgba(s.color) for s in self.styles]).reshape(-1, 4)
+
+        # Outlines in points, concatenated; label i owns verts[starts[i]:starts[i+1]]
+        verts, codes, boxes = [], [], []
+        for s, style in zip(self.texts, self.styles):
+            v, c, box = text_outline(s, style)
+            verts.append(v)
+            codes.append(c)
+            boxes.append(box)
+        counts = np.array([len(v) for v in verts], dtype=int)
+        self._starts = np.concatenate([[0], np.cumsum(counts)])
+        self._verts = np.vstack(verts) if verts else np.zeros((0, 2))
+        self._codes = np.concatenate(codes) if codes else np.zeros(0, np.uint8)
+        self._boxes = np.array(boxes, dtype=float).reshape(-1, 4)
+        self._shown = np.zeros(0, dtype=int)
+        self._view_key = None
+
+    def __len__(self):
+        return len(self.texts)
+
+    def set_color(self, color):
+        """Recolour every label."""
+        self._colors[:] = to_rgba(color)
+        self.stale = True
+
+    def shown(self) -> List[str]:
+        """Labels drawn in the last draw."""
+        return [self.texts[i] for i in self._shown]
+
+    def _visible_labels(self, renderer) -> np.ndarray:
+        """Indices that pass the zoom, viewport and overlap culls."""
+        ax = self.axes
+        trans = ax.transData
+        scale = renderer.points_to_pixels(1.0)
+        x0, y0, x1, y1 = ax.bbox.extents
+        key = (trans.get_matrix().tobytes(), (x0, y0, x1, y1), scale)
+        if key == self._view_key:
+            return self._shown
+        self._view_key = key
+        if len(self) == 0 or (self.min_scale is not None
+                              and abs(trans.transform([1, 0])[0] - trans.transform([0, 0])[0])
+                              < self.min_scale):
+            self._shown = np.zeros(0, dtype=int)
+            return self._shown
+        anchors = trans.transform(self._xy)
+        boxes = self._boxes * scale + np.tile(anchors, 2)
+        inside = np.nonzero((boxes[:, 0] < x1) & (boxes[:, 2] > x0)
+                            & (boxes[:, 1] < y1) & (boxes[:, 3] > y0))[0]
+        self._shown = inside[cull_overlaps(boxes[inside], self.pad_px)]
+        return self._shown
+
+    @allow_rasterization
+    def draw(self, renderer):
+        if not self.get_visible() or self.axes is None:
+            return
+        idx = self._visible_labels(renderer)
+        self.stale = False
+        if len(idx) == 0:
+            return
+        renderer.open_group("labels", gid=self.get_gid())
+        scale = renderer.points_to_pixels(1.0)
+        anchors = self.axes.transData.transform(self._xy[idx])
+        counts = self._starts[idx + 1] - self._starts[idx]
+        colors = self._colors[idx]
+        for color in np.unique(colors, axis=0):
+            sel = np.all(colors == color, axis=1)
+            n = counts[sel]
+            # Vertex rows of the selected labels, concatenated
+            rows = (np.arange(n.sum()) - np.repeat(np.cumsum(n) - n, n)
+                    + np.repeat(self._starts[idx[sel]], n))
+            verts = self._verts[rows] * scale + np.repeat(anchors[sel], counts[sel], axis=0)
+            gc = renderer.new_gc()
+            gc.set_clip_rectangle(self.axes.bbox)
+            gc.set_linewidth(0)
+            gc.set_snap(False)
+            gc.set_alpha(self.get_alpha())
+            gc.set_url(self.get_url())
+            renderer.draw_path(gc, Path(verts, self._codes[rows]), IdentityTransform(),
+                               tuple(color))
+            gc.restore()
+        renderer.close_group("labels")
+
+
+def label_collection(entries, **kwargs) -> LabelCollection:
+    """:class:`LabelCollection` from ``(x, y, s, text_kwargs)`` tuples."""
+    entries = list(entries)
+    return LabelCollection([(x, y) for x, y, _, _ in entries],
+                           [s for _, _, s, _ in entries],
+                           [LabelStyle.from_text_kwargs(kw) for _, _, _, kw in entries],
+                           **kwargs)
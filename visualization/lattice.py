@@ -9,16 +9,26 @@ automatically from a ``LatticeConfig``.
 from __future__ import annotations
 
 import numpy as np
-import matplotlib.patches as patches
-from matplotlib.axes import Axes
-from typing import Tuple, Dict, List, Optional
+from contextlib import nullcontext
+from typing import TYPE_CHECKING, Tuple, Dict, List, Optional
 
 from .styles import LatticeConfig, FluxoniumDims, TunableTransmonDims, DEFAULT_PALETTE
 from .qubits import FluxoniumQubit, TunableTransmonCoupler
+from .layers import LayerSink, _rgba, add_patch
+from . import instrument
+
+if TYPE_CHECKING:
+    from matplotlib.axes import Axes
 
 
 # ── small helpers ───────────────────────────────────────────────────────────
 
+def _component(ax, name: str):
+    """``ax.component(name)`` on a :class:`LayerSink`, else a no-op context."""
+    group = getattr(ax, "component", None)
+    return group(name) if group is not None else nullcontext()
+
+
 def _edge_angle(direction: str) -> float:
     """Return the global rotation of a coupler for a given lattice edge direction."""
     # Long arms of the coupler point at the two data qubits it connects.
@@ -172,12 +182,13 @@ class SquareLattice:
         first_cell: str, alpha: float,
     ):
         """Draw subtle background rectangles to distinguish cell types."""
+        add_polygon = getattr(ax, "add_polygon", None)
         ox, oy = origin
         p = self.cfg.pitch
         half = p * 0.46
 
-        res_color  = "#d0e0ff"   # light blue  → resonator cells
-        flux_color = "#ffe0d0"   # light peach → flux-line cells
+        res_color = DEFAULT_PALETTE.resonator_cell
+        flux_color = DEFAULT_PALETTE.flux_cell
 
         for r in range(self.cfg.rows - 1):
             for c in range(self.cfg.cols - 1):
@@ -185,12 +196,18 @@ class SquareLattice:
                 cy = r * p + p / 2 + oy
                 ct = self._cell_type(r, c, first_cell)
                 color = res_color if ct == "resonator" else flux_color
-                rect = patches.Rectangle(
+                if add_polygon is not None:
+                    corners = np.array([[-1, -1], [1, -1], [1, 1], [-1, 1], [-1, -1]])
+                    add_polygon("cells", corners * half + (cx, cy),
+                                _rgba(color, alpha), _rgba("#00000000"), 1.0)
+                    continue
+                from matplotlib.patches import Rectangle
+                rect = Rectangle(
                     (cx - half, cy - half), 2 * half, 2 * half,
                     facecolor=color, edgecolor="none", alpha=alpha,
                     zorder=-1,
                 )
-                ax.add_patch(rect)
+                add_patch(ax, rect, "cells")
 
     # ── drawing ─────────────────────────────────────────────────────────
     def place(
@@ -203,6 +220,7 @@ class SquareLattice:
         first_cell: str = "resonator",
         shade_cells: bool = True,
         shade_alpha: float = 0.15,
+        layered: bool = True,
     ):
         """
         Draw the full lattice on *ax*.
@@ -224,39 +242,65 @@ class SquareLattice:
             Draw a subtle colour wash behind each unit cell.
         shade_alpha : float
             Opacity of the cell shading rectangles.
+        layered : bool
+            Draw each semantic layer as one collection (see
+            :mod:`visualization.layers`) instead of one patch per shape.
+
+        Returns
+        -------
+        layers : ChipLayers or None
+            The layer groups when drawn *layered* onto an Axes.
         """
+        target = ax
+        if layered and not hasattr(ax, "add_polygon"):
+            ax = LayerSink()
         ox, oy = origin
+        counter = instrument.artist_counter(ax) if instrument.active() else None
 
         # ── cell shading (behind everything) ───────────────────────────
         if shade_cells and cell_pattern == "checkerboard":
-            self._draw_cell_shading(ax, origin, first_cell, shade_alpha)
+            with instrument.stage("cell_shading"):
+                self._draw_cell_shading(ax, origin, first_cell, shade_alpha)
 
         # ── data qubits ────────────────────────────────────────────────
-        for idx, ((r, c), pos) in enumerate(sorted(self._site_positions.items())):
-            gx, gy = pos[0] + ox, pos[1] + oy
-            self._data_qubit.place(ax, (gx, gy))
-            if labels:
-                ax.text(gx, gy - 40, f"D{idx}", ha="center", va="top",
-                        fontsize=label_fontsize, color=DEFAULT_PALETTE.label_color,
-                        fontweight="bold")
+        with instrument.stage("data_qubits"):
+            for idx, ((r, c), pos) in enumerate(sorted(self._site_positions.items())):
+                gx, gy = pos[0] + ox, pos[1] + oy
+                with instrument.component("FluxoniumQubit", counter), \
+                        _component(ax, f"D{idx}"):
+                    self._data_qubit.place(ax, (gx, gy))
+                if labels:
+                    ax.text(gx, gy - 40, f"D{idx}", ha="center", va="top",
+                            fontsize=label_fontsize, color=DEFAULT_PALETTE.label_color,
+                            fontweight="bold")
 
         # ── couplers ───────────────────────────────────────────────────
-        for idx, (edge_key, edge_info) in enumerate(sorted(self._edge_positions.items())):
-            pos = edge_info["xy"]
-            gx, gy = pos[0] + ox, pos[1] + oy
-            coupler_angle = _edge_angle(edge_info["direction"])
-
-            mirror = False
-            if cell_pattern == "checkerboard":
-                mirror = self._mirror_for_edge(
-                    edge_key, edge_info["direction"], first_cell,
-                )
-
-            self._coupler.place(ax, (gx, gy), angle=coupler_angle, mirror=mirror)
-            if labels:
-                ax.text(gx, gy - 30, f"C{idx}", ha="center", va="top",
-                        fontsize=label_fontsize - 1, color=DEFAULT_PALETTE.label_color,
-                        fontstyle="italic")
+        with instrument.stage("couplers"):
+            for idx, (edge_key, edge_info) in enumerate(sorted(self._edge_positions.items())):
+                pos = edge_info["xy"]
+                gx, gy = pos[0] + ox, pos[1] + oy
+                coupler_angle = _edge_angle(edge_info["direction"])
+
+                mirror = False
+                if cell_pattern == "checkerboard":
+                    mirror = self._mirror_for_edge(
+                        edge_key, edge_info["direction"], first_cell,
+                    )
+
+                with instrument.component("TunableTransmonCoupler", counter), \
+                        _component(ax, f"C{idx}"):
+                    self._coupler.place(ax, (gx, gy), angle=coupler_angle, mirror=mirror)
+                if labels:
+                    ax.text(gx, gy - 30, f"C{idx}", ha="center", va="top",
+                            fontsize=label_fontsize - 1, color=DEFAULT_PALETTE.label_color,
+                            fontstyle="italic")
+
+        if counter is not None:
+            instrument.count("artists", counter()["artists"])
+        if ax is not target:
+            with instrument.stage("flush_layers"):
+                return ax.flush(target)
+        return None
 
     # ── auto view limits ───────────────────────────────────────────────
     def auto_lims(self, margin: float = 350) -> Tuple[Tuple[float, float], Tuple[float, float]]:
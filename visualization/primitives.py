@@ -4,26 +4,57 @@ Low-level geometric building blocks for superconducting chip visualization.
 Every primitive stores its geometry in local coordinates (centered at origin)
 and exposes a `.place(ax, xy, angle, **style)` method that stamps a copy onto
 a matplotlib Axes with the requested global position & rotation.
+
+Geometry is plain NumPy; matplotlib is imported on the first ``place``
+onto an Axes (placing onto a :class:`~visualization.layers.LayerSink`
+stays NumPy-only).
 """
 
 from __future__ import annotations
 
 import numpy as np
-import matplotlib.patches as patches
-import matplotlib.path as mpath
-import matplotlib.transforms as transforms
-from matplotlib.axes import Axes
-from typing import List, Tuple
+from typing import TYPE_CHECKING, List, Tuple
 
 from .styles import (
     XmonDims, CouplerXmonDims, JJChainDims, DCSqUIDDims, ResonatorDims,
     FluxLineDims,
     DEFAULT_PALETTE,
 )
+from .layers import _rgba, add_patch
+
+if TYPE_CHECKING:
+    from matplotlib.axes import Axes
+    from matplotlib.patches import Rectangle
+
+_UNIT_SQUARE = np.array([[0.0, 0.0], [1.0, 0.0], [1.0, 1.0], [0.0, 1.0], [0.0, 0.0]])
 
 
 # ── helpers ─────────────────────────────────────────────────────────────────
 
+def _rotation(angle: float, xy=(0.0, 0.0)) -> np.ndarray:
+    """Homogeneous 3 × 3 matrix: rotate by *angle* degrees, then move to *xy*."""
+    c, s = np.cos(np.radians(angle)), np.sin(np.radians(angle))
+    return np.array([[c, -s, xy[0]], [s, c, xy[1]], [0.0, 0.0, 1.0]])
+
+
+def _base_transform(ax: Axes, xy, angle: float):
+    """Local → display transform: rotate by *angle*, move to *xy*, then data.
+
+    On a :class:`~visualization.layers.LayerSink` (anything with
+    ``add_polygon``) this is a NumPy matrix in data coordinates, so
+    recording geometry never imports matplotlib.
+    """
+    if hasattr(ax, "add_polygon"):
+        return _rotation(angle, xy)
+    from matplotlib.transforms import Affine2D
+    return Affine2D().rotate_deg(angle).translate(xy[0], xy[1]) + ax.transData
+
+
+def _apply(matrix: np.ndarray, points: np.ndarray) -> np.ndarray:
+    """*points* ``(N, 2)`` mapped by a homogeneous *matrix*."""
+    return points @ matrix[:2, :2].T + matrix[:2, 2]
+
+
 def _stamp_rect(
     ax: Axes,
     xy: Tuple[float, float],
@@ -31,11 +62,26 @@ def _stamp_rect(
     h: float,
     local_angle: float,
     base_transform,
+    layer: str = "misc",
     **kwargs,
-) -> patches.Rectangle:
-    """Create a Rectangle, compose its local rotation with *base_transform*, add to *ax*."""
-    r = patches.Rectangle(xy, w, h, **kwargs)
-    final = transforms.Affine2D().rotate_deg(local_angle) + base_transform
+) -> Rectangle | None:
+    """Create a Rectangle, compose its local rotation with *base_transform*, add to *ax*.
+
+    On a :class:`~visualization.layers.LayerSink` only the transformed
+    corners are recorded under *layer*; no patch is created.
+    """
+    add_polygon = getattr(ax, "add_polygon", None)
+    if add_polygon is not None:
+        corners = _UNIT_SQUARE * (w, h) + xy
+        add_polygon(layer, _apply(base_transform @ _rotation(local_angle), corners),
+                    _rgba(kwargs.get("facecolor"), kwargs.get("alpha")))
+        return None
+
+    from matplotlib.transforms import Affine2D
+    from matplotlib.patches import Rectangle
+
+    final = Affine2D().rotate_deg(local_angle) + base_transform
+    r = Rectangle(xy, w, h, **kwargs)
     r.set_transform(final)
     ax.add_patch(r)
     return r
@@ -113,17 +159,15 @@ class Xmon:
         return np.array([dist * np.cos(rad), dist * np.sin(rad)])
 
     # ── drawing ─────────────────────────────────────────────────────────
-    def place(self, ax: Axes, xy=(0, 0), angle: float = 0, color=None):
+    def place(self, ax: Axes, xy=(0, 0), angle: float = 0, color=None,
+              layer: str = "xmon_body"):
         if color is None:
             color = DEFAULT_PALETTE.xmon_body
-        base = (
-            transforms.Affine2D().rotate_deg(angle).translate(xy[0], xy[1])
-            + ax.transData
-        )
+        base = _base_transform(ax, xy, angle)
         for (rect_args, local_angle) in self._patches:
             _stamp_rect(
                 ax, (rect_args[0], rect_args[1]), rect_args[2], rect_args[3],
-                local_angle, base, facecolor=color, edgecolor=None,
+                local_angle, base, layer, facecolor=color, edgecolor=None,
             )
 
 
@@ -170,15 +214,12 @@ class JJChain:
         if color_bridge is None:
             color_bridge = DEFAULT_PALETTE.jj_chain_bridge
 
-        base = (
-            transforms.Affine2D().rotate_deg(angle).translate(xy[0], xy[1])
-            + ax.transData
-        )
+        base = _base_transform(ax, xy, angle)
         for r in self._islands:
-            _stamp_rect(ax, (r[0], r[1]), r[2], r[3], 0, base,
+            _stamp_rect(ax, (r[0], r[1]), r[2], r[3], 0, base, "chain_island",
                         facecolor=color_island, edgecolor=None)
         for r in self._bridges:
-            _stamp_rect(ax, (r[0], r[1]), r[2], r[3], 0, base,
+            _stamp_rect(ax, (r[0], r[1]), r[2], r[3], 0, base, "chain_bridge",
                         facecolor=color_bridge, edgecolor=None, alpha=0.9)
 
 
@@ -195,13 +236,11 @@ class JosephsonJunction:
     def place(self, ax: Axes, xy=(0, 0), angle: float = 0, color=None, **kw):
         if color is None:
             color = DEFAULT_PALETTE.junction
-        base = (
-            transforms.Affine2D().rotate_deg(angle).translate(xy[0], xy[1])
-            + ax.transData
-        )
+        base = _base_transform(ax, xy, angle)
         _stamp_rect(
             ax, (-self.width / 2, -self.height / 2), self.width, self.height,
-            0, base, facecolor=color, edgecolor=None, zorder=kw.get("zorder", 10),
+            0, base, "junction", facecolor=color, edgecolor=None,
+            zorder=kw.get("zorder", 10),
         )
 
 
@@ -233,10 +272,7 @@ class DCSqUID:
             color = DEFAULT_PALETTE.dc_squid_body
         leg_color = DEFAULT_PALETTE.squid_leg
 
-        base = (
-            transforms.Affine2D().rotate_deg(angle).translate(xy[0], xy[1])
-            + ax.transData
-        )
+        base = _base_transform(ax, xy, angle)
         d = self.dims
         half_sep = d.leg_separation / 2
         hw = d.leg_width / 2  # half-width of each leg
@@ -246,7 +282,7 @@ class DCSqUID:
             cy = sign * half_sep
             _stamp_rect(
                 ax, (0, cy - hw), d.leg_length, d.leg_width,
-                0, base, facecolor=leg_color, edgecolor=None,
+                0, base, "squid_leg", facecolor=leg_color, edgecolor=None,
             )
 
         # ── U-bar connecting the far ends of the two legs ──────────────
@@ -254,7 +290,7 @@ class DCSqUID:
         _stamp_rect(
             ax, (d.leg_length - u_hw, -half_sep),
             d.u_bar_width, d.leg_separation,
-            0, base, facecolor=leg_color, edgecolor=None,
+            0, base, "squid_leg", facecolor=leg_color, edgecolor=None,
         )
 
         # ── two JJ rectangles at the midpoint of each leg ─────────────
@@ -263,7 +299,7 @@ class DCSqUID:
             jj_y = sign * half_sep - d.junction_height / 2
             _stamp_rect(
                 ax, (jj_x, jj_y), d.junction_width, d.junction_height,
-                0, base, facecolor=color, edgecolor=None, zorder=10,
+                0, base, "squid_junction", facecolor=color, edgecolor=None, zorder=10,
             )
 
 
@@ -356,13 +392,8 @@ class Resonator:
         return np.array([(pts[:, 0].min() + pts[:, 0].max()) / 2,
                          (pts[:, 1].min() + pts[:, 1].max()) / 2])
 
-    def place(self, ax: Axes, xy=(0, 0), angle: float = 0, color=None):
-        if color is None:
-            color = DEFAULT_PALETTE.resonator
-        base = (
-            transforms.Affine2D().rotate_deg(angle).translate(xy[0], xy[1])
-            + ax.transData
-        )
+    def ribbon(self) -> np.ndarray:
+        """Closed outline ``(N, 2)`` of the meander ribbon in local coordinates."""
         centreline = self._build_meander_path()
         hw = self.dims.width  # half-width in data units
 
@@ -386,14 +417,32 @@ class Resonator:
         left = centreline + normals * hw
         right = centreline - normals * hw
 
-        ribbon = np.concatenate([left, right[::-1]], axis=0)
-        codes = [mpath.Path.MOVETO] + [mpath.Path.LINETO] * (len(ribbon) - 2) + [mpath.Path.CLOSEPOLY]
-        path = mpath.Path(ribbon, codes)
-        pp = patches.PathPatch(
+        return np.concatenate([left, right[::-1]], axis=0)
+
+    def place(self, ax: Axes, xy=(0, 0), angle: float = 0, color=None):
+        if color is None:
+            color = DEFAULT_PALETTE.resonator
+        base = _base_transform(ax, xy, angle)
+        ribbon = self.ribbon()
+        add_polygon = getattr(ax, "add_polygon", None)
+        if add_polygon is not None:
+            # The patch's CLOSEPOLY vertex is ignored; close on the first one.
+            # Edge as the patch's default (black, 1 pt)
+            verts = np.vstack([ribbon[:-1], ribbon[:1]])
+            add_polygon("resonator", _apply(base, verts), _rgba(color),
+                        (0.0, 0.0, 0.0, 1.0), 1.0)
+            return
+
+        from matplotlib.patches import PathPatch
+        from matplotlib.path import Path
+
+        codes = [Path.MOVETO] + [Path.LINETO] * (len(ribbon) - 2) + [Path.CLOSEPOLY]
+        path = Path(ribbon, codes)
+        pp = PathPatch(
             path, facecolor=color, edgecolor=None,
         )
         pp.set_transform(base)
-        ax.add_patch(pp)
+        add_patch(ax, pp, "resonator")
 
 
 # ═══════════════════════════════════════════════════════════════════════════
@@ -427,14 +476,11 @@ class FluxLine:
                       if squid_dims else 40)
         start_offset = squid_half + d.standoff
 
-        base = (
-            transforms.Affine2D().rotate_deg(angle).translate(xy[0], xy[1])
-            + ax.transData
-        )
+        base = _base_transform(ax, xy, angle)
 
         # Main feed line as a filled rectangle (data coordinates)
         hw = d.width  # half-width
         _stamp_rect(
             ax, (start_offset, -hw), d.length, 2 * hw,
-            0, base, facecolor=color, edgecolor=None,
+            0, base, "flux_line", facecolor=color, edgecolor=None,
         )
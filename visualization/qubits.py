@@ -8,17 +8,20 @@ Each composite knows how to place itself and exposes **anchor points**
 from __future__ import annotations
 
 import numpy as np
-import matplotlib.patches as patches
-import matplotlib.transforms as transforms
-from matplotlib.axes import Axes
-from typing import Dict, Tuple
+from typing import TYPE_CHECKING, Dict, Tuple
 
 from .styles import (
     FluxoniumDims, TunableTransmonDims,
     CouplerXmonDims, DCSqUIDDims, ResonatorDims, FluxLineDims,
     DEFAULT_PALETTE,
 )
-from .primitives import Xmon, JJChain, JosephsonJunction, DCSqUID, Resonator, FluxLine, _stamp_rect
+from .primitives import (
+    Xmon, JJChain, JosephsonJunction, DCSqUID, Resonator, FluxLine,
+    _base_transform, _stamp_rect,
+)
+
+if TYPE_CHECKING:
+    from matplotlib.axes import Axes
 
 
 # ═══════════════════════════════════════════════════════════════════════════
@@ -103,16 +106,11 @@ class FluxoniumQubit:
         bar_center = (end_A + end_B) / 2
         bar_len = d.chain_separation + d.connector_bar_extra
 
-        base_bar = (
-            transforms.Affine2D()
-            .rotate_deg(chain_global_angle + 90)
-            .translate(bar_center[0], bar_center[1])
-            + ax.transData
-        )
+        base_bar = _base_transform(ax, bar_center, chain_global_angle + 90)
         _stamp_rect(
             ax, (-bar_len / 2, -d.connector_bar_height / 2),
             bar_len, d.connector_bar_height,
-            0, base_bar, facecolor=color_connector, edgecolor=None,
+            0, base_bar, "connector", facecolor=color_connector, edgecolor=None,
         )
 
         # Phase-slip junction
@@ -206,7 +204,7 @@ class TunableTransmonCoupler:
             res_angle = self._res_angle
 
         # 1) Xmon body (asymmetric arms)
-        self._xmon.place(ax, xy, angle, color=color_body)
+        self._xmon.place(ax, xy, angle, color=color_body, layer="coupler_body")
 
         # 2) DC SQUID: legs extend outward from the arm tip
         squid_local = self._arm_endpoint(squid_angle)
@@ -20,6 +20,9 @@ class Palette:
     coupler_body: str = "#B8A07A"
     flux_line: str = "#8B6C42"
     label_color: str = "#333333"
+    ground_plane: str = "#D6D9E0"
+    resonator_cell: str = "#d0e0ff"         # checkerboard cell shading
+    flux_cell: str = "#ffe0d0"
 
 
 DEFAULT_PALETTE = Palette()
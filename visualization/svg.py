@@ -0,0 +1,121 @@
+"""
+Direct SVG export of chip polygons.
+
+Writes polygons as filled ``<path>`` elements in data coordinates (y up),
+one element per layer, without going through matplotlib — a full-chip
+ground plane is a few megabytes of path data rather than a figure.
+Regular arrays of small squares (flux holes) are written as rectangles
+filled with a ``<pattern>``, one element per array instead of per square::
+
+    from visualization.svg import write_svg
+
+    write_svg("chip.svg", geom.bounds, [
+        ("ground", ground.polygons(), "#C9CDD6"),
+        ("metal", geom.metal(), "#9EAAB2"),
+    ], background="#F5F5F7")
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Iterable, Optional, Sequence, Tuple
+from xml.sax.saxutils import quoteattr
+
+import numpy as np
+
+from .boolean import as_polygon
+
+
+def _fmt(values: np.ndarray, digits: int) -> list:
+    return np.char.mod(f"%.{digits}f", np.round(values, digits)).tolist()
+
+
+def path_data(polygons: Iterable, digits: int = 3) -> str:
+    """SVG path ``d`` of *polygons*: one ``M … Z`` subpath per ring.
+
+    Exteriors run counter-clockwise and holes clockwise, so the default
+    nonzero fill rule punches the holes and adjacent tiles fill seamlessly.
+    """
+    parts = []
+    for p in polygons:
+        for ring in as_polygon(p).rings():
+            xy = np.char.add(np.char.add(_fmt(ring[:, 0], digits), " "),
+                             _fmt(ring[:, 1], digits)).tolist()
+            parts.append("M" + " L".join(xy) + "Z")
+    return "".join(parts)
+
+
+@dataclass
+class ArrayFill:
+    """Squares of side *size* centred on ``origin + (i, j)·pitch`` over the
+    lattice-index rectangles *arrays* ``(i, j, cols, rows)``."""
+    name: str
+    origin: Tuple[float, float]
+    pitch: float
+    size: float
+    fill: str
+    arrays: np.ndarray
+
+    def elements(self) -> list:
+        """``<pattern>`` definition and one ``<rect>`` per array."""
+        (ox, oy), p, h = self.origin, self.pitch, self.size
+        pid = quoteattr(f"{self.name}-pattern")
+        out = [f'<defs><pattern id={pid} patternUnits="userSpaceOnUse" '
+               f'x="{ox - p / 2:.10g}" y="{oy - p / 2:.10g}" width="{p:.10g}" height="{p:.10g}">'
+               f'<rect x="{(p - h) / 2:.10g}" y="{(p - h) / 2:.10g}" width="{h:.10g}" '
+               f'height="{h:.10g}" fill={quoteattr(self.fill)}/></pattern></defs>',
+               f'<g id={quoteattr(self.name)} fill="url(#{self.name}-pattern)">']
+        a = np.asarray(self.arrays, dtype=float).reshape(-1, 4)
+        x = ox + (a[:, 0] - 0.5) * p
+        y = oy + (a[:, 1] - 0.5) * p
+        for x0, y0, w, hh in zip(x.tolist(), y.tolist(), (a[:, 2] * p).tolist(),
+                                 (a[:, 3] * p).tolist()):
+            out.append(f'<rect x="{x0:.10g}" y="{y0:.10g}" width="{w:.10g}" height="{hh:.10g}"/>')
+        out.append("</g>")
+        return out
+
+
+def svg_document(bounds, layers: Sequence[Tuple[str, Iterable, str]],
+                 background: Optional[str] = None, scale: float = 1.0,
+                 digits: int = 3, arrays: Sequence[ArrayFill] = ()) -> str:
+    """SVG text of *layers*, drawn back to front.
+
+    Parameters
+    ----------
+    bounds : (xmin, ymin, xmax, ymax)
+        Visible area in data units.
+    layers : sequence of ``(name, polygons, fill)``
+        Each becomes one ``<path id=name>``.
+    background : str or None
+        Fill of a rectangle behind everything.
+    scale : float
+        Output size in px per data unit.
+    arrays : sequence of ArrayFill
+        Pattern-filled square arrays, drawn over the layers.
+    """
+    x0, y0, x1, y1 = (float(v) for v in bounds)
+    w, h = x1 - x0, y1 - y0
+    out = ['<?xml version="1.0" encoding="utf-8"?>',
+           f'<svg xmlns="http://www.w3.org/2000/svg" width="{w * scale:.10g}" '
+           f'height="{h * scale:.10g}" viewBox="{x0:.10g} {-y1:.10g} {w:.10g} {h:.10g}">']
+    if background is not None:
+        out.append(f'<rect x="{x0:.10g}" y="{-y1:.10g}" width="{w:.10g}" height="{h:.10g}" '
+                   f'fill={quoteattr(background)}/>')
+    # Flip y so data coordinates are written unchanged
+    out.append('<g transform="scale(1 -1)">')
+    for name, polygons, fill in layers:
+        d = path_data(polygons, digits)
+        if d:
+            out.append(f'<path id={quoteattr(name)} fill={quoteattr(fill)} d="{d}"/>')
+    for fill in arrays:
+        out.extend(fill.elements())
+    out.append("</g>")
+    out.append("</svg>")
+    return "\n".join(out) + "\n"
+
+
+def write_svg(path: str, bounds, layers: Sequence[Tuple[str, Iterable, str]],
+              **kwargs) -> None:
+    """Write :func:`svg_document` to *path*."""
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(svg_document(bounds, layers, **kwargs))
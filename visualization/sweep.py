@@ -0,0 +1,282 @@
+"""
+Parallel parameter sweeps over chip design variants.
+
+Renders one image per point of a parameter grid in a process pool, then
+writes a contact sheet and an index CSV::
+
+    python -m visualization.sweep -o sweep/ -j 8 \\
+        --set rows=3 --set cols=3 \\
+        --grid fluxonium.xmon.arm_len=120,140,160 \\
+        --grid coupler.resonator.num_turns=3,5,7
+
+Grid keys are ``rows``, ``cols``, ``pitch``, ``labels``, ``title``,
+``cell_pattern``, ``dpi``, or a dotted path into the dims dataclasses:
+``fluxonium.<FluxoniumDims field>…`` and ``coupler.<TunableTransmonDims
+field>…``.  From Python::
+
+    from visualization.sweep import run_sweep
+    run_sweep({"fluxonium.chain.length": [150, 200, 250]}, "sweep/",
+              fixed={"rows": 2, "cols": 2})
+
+Every variant is drawn on a pyplot-free ``Figure`` with the Agg canvas
+(:func:`visualization.draw.render_chip`) and written by the worker
+itself, so only a small result row travels back.  Workers keep the
+lattices they built and reuse their component geometry for variants with
+the same layout; ``--max-tasks`` recycles workers to bound memory.
+"""
+
+from __future__ import annotations
+
+import argparse
+import csv
+import dataclasses
+import itertools
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Any, Dict, List, Optional, Sequence
+
+from .styles import LatticeConfig, FluxoniumDims, TunableTransmonDims
+
+
+# Non-dims parameters and their defaults
+_TOP_LEVEL = {"rows": 3, "cols": 3, "pitch": 0, "labels": True, "title": None,
+              "cell_pattern": "checkerboard", "dpi": 100}
+_DIMS = {"fluxonium": FluxoniumDims, "coupler": TunableTransmonDims}
+
+
+# ── parameters ──────────────────────────────────────────────────────────────
+
+def _replace_path(obj, path: Sequence[str], value):
+    """Copy of dataclass *obj* with the field at dotted *path* set to *value*."""
+    name = path[0]
+    if name not in {f.name for f in dataclasses.fields(obj)}:
+        raise ValueError(f"{type(obj).__name__} has no field {name!r}")
+    if len(path) > 1:
+        value = _replace_path(getattr(obj, name), path[1:], value)
+    return dataclasses.replace(obj, **{name: value})
+
+
+def variant_inputs(params: Dict[str, Any]) -> Dict[str, Any]:
+    """``render_chip`` keyword arguments for one point of the grid."""
+    kw = dict(_TOP_LEVEL)
+    dims = {k: cls() for k, cls in _DIMS.items()}
+    for key, value in params.items():
+        head, _, rest = key.partition(".")
+        if head in _DIMS and rest:
+            dims[head] = _replace_path(dims[head], rest.split("."), value)
+        elif key in _TOP_LEVEL:
+            kw[key] = value
+        else:
+            raise ValueError(f"unknown sweep parameter {key!r}")
+    kw["fluxonium_dims"] = dims["fluxonium"]
+    kw["coupler_dims"] = dims["coupler"]
+    return kw
+
+
+def expand_grid(grid: Dict[str, Sequence], fixed: Optional[Dict[str, Any]] = None
+                ) -> List[Dict[str, Any]]:
+    """Cartesian product of *grid*, each point merged over *fixed*."""
+    keys = list(grid)
+    points = []
+    for values in itertools.product(*(grid[k] for k in keys)):
+        params = dict(fixed or {})
+        params.update(zip(keys, values))
+        variant_inputs(params)           # validate before spawning workers
+        points.append(params)
+    return points
+
+
+def parse_value(text: str):
+    """``"140"`` → 140, ``"true"`` → True, ``"[8, 8]"`` → [8, 8]; else the string."""
+    try:
+        return json.loads(text)
+    except ValueError:
+        return text
+
+
+# ── worker ──────────────────────────────────────────────────────────────────
+
+# Per-process lattices keyed by layout, reused across variants
+_LATTICES: Dict[str, Any] = {}
+_MAX_LATTICES = 32
+
+
+def _lattice(kw):
+    from .lattice import SquareLattice
+    key = repr((kw["rows"], kw["cols"], kw["pitch"],
+                kw["fluxonium_dims"], kw["coupler_dims"]))
+    lattice = _LATTICES.get(key)
+    if lattice is None:
+        if len(_LATTICES) >= _MAX_LATTICES:
+            _LATTICES.pop(next(iter(_LATTICES)))
+        lattice = SquareLattice(LatticeConfig(kw["rows"], kw["cols"], kw["pitch"]),
+                                fluxonium_dims=kw["fluxonium_dims"],
+                                coupler_dims=kw["coupler_dims"])
+        _LATTICES[key] = lattice
+    return lattice
+
+
+def _render_variant(job):
+    index, params, path, fmt, cache_dir = job
+    from .draw import render_chip
+    from .cache import RenderCache
+    kw = variant_inputs(params)
+    cache = RenderCache(cache_dir) if cache_dir else None
+    t0 = time.perf_counter()
+    data = render_chip(lattice=_lattice(kw), dpi=kw["dpi"], fmt=fmt,
+                       labels=kw["labels"], title=kw["title"],
+                       cell_pattern=kw["cell_pattern"], path=path, cache=cache)
+    return {"index": index, "file": os.path.basename(path), "bytes": len(data),
+            "seconds": round(time.perf_counter() - t0, 4), "pid": os.getpid()}
+
+
+# ── contact sheet ───────────────────────────────────────────────────────────
+
+def contact_sheet(paths: Sequence[str], captions: Sequence[str], out: str,
+                  columns: Optional[int] = None, thumb: int = 320):
+    """Grid of *thumb*-wide thumbnails of *paths* with a caption under each.
+
+    Images are opened one at a time, so memory is bounded by the sheet.
+    """
+    from PIL import Image, ImageDraw
+    n = len(paths)
+    columns = columns or max(1, round(n ** 0.5))
+    rows = -(-n // columns)
+    caption_h = 14 * max((c.count("\n") + 1 for c in captions), default=1) + 6
+    with Image.open(paths[0]) as first:
+        aspect = first.height / first.width
+    cell_w, cell_h = thumb, round(thumb * aspect) + caption_h
+    sheet = Image.new("RGB", (columns * cell_w, rows * cell_h), "white")
+    draw = ImageDraw.Draw(sheet)
+    for i, (path, caption) in enumerate(zip(paths, captions)):
+        x, y = (i % columns) * cell_w, (i // columns) * cell_h
+        with Image.open(path) as im:
+            im = im.convert("RGB")
+            im.thumbnail((cell_w, cell_h - caption_h))
+            sheet.paste(im, (x + (cell_w - im.width) // 2, y))
+        draw.multiline_text((x + 4, y + cell_h - caption_h + 2), caption,
+                            fill=(40, 40, 40), spacing=2)
+    sheet.save(out)
+    return out
+
+
+# ── driver ──────────────────────────────────────────────────────────────────
+
+def run_sweep(grid: Dict[str, Sequence], out_dir: str,
+              fixed: Optional[Dict[str, Any]] = None, workers: Optional[int] = None,
+              fmt: str = "png", cache_dir: Optional[str] = None,
+              max_tasks: Optional[int] = None, sheet: bool = True) -> List[dict]:
+    """Render every point of *grid* into *out_dir*.
+
+    Parameters
+    ----------
+    grid : dict
+        Parameter name → values; all combinations are rendered.
+    fixed : dict or None
+        Parameters shared by every variant.
+    workers : int or None
+        Process count (default: CPU count); 1 renders in-process.
+    cache_dir : str or None
+        :class:`~visualization.cache.RenderCache` directory shared by the
+        workers, so re-running a sweep only renders new variants.
+    max_tasks : int or None
+        Replace each worker after this many variants.
+
+    Returns
+    -------
+    rows : list of dict
+        One row per variant, also written to ``<out_dir>/index.csv``.
+    """
+    os.makedirs(out_dir, exist_ok=True)
+    points = expand_grid(grid, fixed)
+    width = len(str(len(points)))
+    jobs = [(i, p, os.path.join(out_dir, f"variant_{i:0{width}d}.{fmt}"), fmt,
+             cache_dir) for i, p in enumerate(points)]
+    workers = workers or os.cpu_count() or 1
+    results = {}
+    t0 = time.perf_counter()
+    if workers == 1:
+        for job in jobs:
+            r = _render_variant(job)
+            results[r["index"]] = r
+    else:
+        kw = {"max_tasks_per_child": max_tasks} if max_tasks else {}
+        if max_tasks:
+            import multiprocessing
+            kw["mp_context"] = multiprocessing.get_context("spawn")
+        with ProcessPoolExecutor(max_workers=min(workers, len(jobs)) or 1, **kw) as pool:
+            futures = [pool.submit(_render_variant, job) for job in jobs]
+            for done, fut in enumerate(as_completed(futures), 1):
+                r = fut.result()
+                results[r["index"]] = r
+                print(f"[sweep] {done}/{len(jobs)} {r['file']} ({r['seconds']:.2f} s)")
+    elapsed = time.perf_counter() - t0
+
+    keys = list(grid)
+    rows = []
+    for i, params in enumerate(points):
+        row = {"index": i, "file": results[i]["file"]}
+        row.update({k: params[k] for k in keys})
+        row.update({k: results[i][k] for k in ("bytes", "seconds")})
+        rows.append(row)
+    with open(os.path.join(out_dir, "index.csv"), "w", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=list(rows[0]))
+        writer.writeheader()
+        writer.writerows(rows)
+
+    if sheet and fmt == "png":
+        captions = [f"#{r['index']}\n" + "\n".join(f"{k}={r[k]}" for k in keys)
+                    for r in rows]
+        contact_sheet([os.path.join(out_dir, r["file"]) for r in rows], captions,
+                      os.path.join(out_dir, "contact_sheet.png"))
+    print(f"[sweep] {len(rows)} variants in {elapsed:.1f} s with {workers} workers")
+    return rows
+
+
+# ── CLI ─────────────────────────────────────────────────────────────────────
+
+def _parse_assign(text, split_values):
+    key, sep, value = text.partition("=")
+    if not sep:
+        raise argparse.ArgumentTypeError(f"expected key=value, got {text!r}")
+    if split_values:
+        return key, [parse_value(v) for v in value.split(",")]
+    return key, parse_value(value)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="python -m visualization.sweep",
+        description="Render chip design variants over a parameter grid.",
+    )
+    parser.add_argument("-o", "--out", default="sweep",
+                        help="output directory (default: sweep)")
+    parser.add_argument("--grid", action="append", default=[],
+                        type=lambda t: _parse_assign(t, True),
+                        help="swept parameter, e.g. fluxonium.xmon.arm_len=120,140")
+    parser.add_argument("--set", action="append", default=[],
+                        type=lambda t: _parse_assign(t, False),
+                        help="fixed parameter, e.g. rows=4")
+    parser.add_argument("-j", "--jobs", type=int, default=None,
+                        help="worker processes (default: CPU count)")
+    parser.add_argument("--format", default="png", help="png or svg (default: png)")
+    parser.add_argument("--cache", default=None, help="render cache directory")
+    parser.add_argument("--max-tasks", type=int, default=None,
+                        help="variants per worker before it is replaced")
+    parser.add_argument("--no-sheet", action="store_true",
+                        help="skip the contact sheet")
+    args = parser.parse_args(argv)
+    if not args.grid:
+        parser.error("at least one --grid parameter is required")
+
+    run_sweep(dict(args.grid), args.out, fixed=dict(args.set), workers=args.jobs,
+              fmt=args.format, cache_dir=args.cache, max_tasks=args.max_tasks,
+              sheet=not args.no_sheet)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,447 @@
+"""
+Interactive pan/zoom viewer for large chip layouts.
+
+``draw_chip`` adds one patch per rectangle, so every pan or zoom of a
+40 × 40 chip redraws ~10⁵ patches.  :class:`ChipViewer` draws the same
+layout from a few prototype footprints instead:
+
+* each component variant (data qubit; coupler per angle and mirror) is
+  recorded once as polygons, overlapping shapes of one colour unioned,
+  and instanced by translation;
+* the chip is cut into square tiles per zoom level; only tiles touching
+  the viewport are shown, each as one ``PolyCollection``;
+* detail follows the zoom: polygons smaller than ``min_px`` screen pixels
+  are left out of a tile; labels are one
+  :class:`~visualization.labels.LabelCollection`, drawn only for
+  components inside the view, once they are large enough to read, and
+  without overlaps;
+* built tiles are kept in an LRU cache, so panning back is free;
+* the component under the cursor is found through a uniform grid hash
+  and shown in the corner.
+
+In Jupyter (``%matplotlib widget``) or any interactive backend::
+
+    from visualization.viewer import view_chip
+    viewer = view_chip(rows=40, cols=40)
+
+Use the toolbar or the scroll wheel to zoom.
+"""
+
+from __future__ import annotations
+
+import math
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import matplotlib.patches as patches
+from matplotlib.axes import Axes
+from matplotlib.collections import PolyCollection
+from matplotlib.path import Path
+
+from .styles import LatticeConfig, DEFAULT_PALETTE
+from .lattice import SquareLattice, _edge_angle
+from .labels import LabelCollection, LabelStyle
+from .layers import LAYER_NAMES, LayerSink
+from .gds import keyhole
+
+
+# ── footprints ──────────────────────────────────────────────────────────────
+
+@dataclass
+class Footprint:
+    """Polygons of one component variant in local coordinates.
+
+    Vertices of all polygons are stacked in ``verts``; polygon *i* is
+    ``verts[starts[i]:starts[i + 1]]``.  Polygons are sorted by zorder.
+    """
+
+    verts: np.ndarray      # (V, 2)
+    starts: np.ndarray     # (P + 1,)
+    colors: np.ndarray     # (P, 4) RGBA
+    extents: np.ndarray    # (P,) larger bbox side of each polygon
+    bbox: np.ndarray       # (xmin, ymin, xmax, ymax)
+
+    @classmethod
+    def record(cls, component, **place_kw) -> "Footprint":
+        sink = LayerSink()
+        with sink.component("footprint"):
+            component.place(sink, (0.0, 0.0), **place_kw)
+        # Layers back to front; overlapping shapes of one style become one
+        # polygon, holes keyholed (no ring codes here)
+        polys, colors = [], []
+        for layer in LAYER_NAMES:
+            if not sink.polygons(layer):
+                continue
+            merged, styles = sink.merged(layer)
+            for poly, (color, _, _) in zip(merged, styles):
+                polys.append(keyhole(poly) if poly.holes else poly.exterior)
+                colors.append(color)
+        lengths = np.array([len(p) for p in polys])
+        verts = np.concatenate(polys)
+        lo = np.array([p.min(axis=0) for p in polys])
+        hi = np.array([p.max(axis=0) for p in polys])
+        return cls(
+            verts=verts,
+            starts=np.concatenate([[0], np.cumsum(lengths)]),
+            colors=np.array(colors, dtype=float),
+            extents=(hi - lo).max(axis=1),
+            bbox=np.concatenate([verts.min(axis=0), verts.max(axis=0)]),
+        )
+
+    def polygons(self, offset, min_extent=0.0) -> List[np.ndarray]:
+        """Polygons shifted by *offset*, skipping those below *min_extent*."""
+        moved = self.verts + offset
+        s = self.starts
+        return [moved[s[i]:s[i + 1]] for i in np.nonzero(self.extents >= min_extent)[0]]
+
+
+@dataclass
+class ComponentInfo:
+    """One placed component of the chip."""
+    name: str          # "D0", "C12"
+    kind: str          # "data_qubit" | "coupler"
+    site: tuple        # (r, c) or ((r1, c1), (r2, c2))
+    xy: np.ndarray
+    variant: tuple     # key into ChipViewer.footprints
+
+
+def chip_components(lattice: SquareLattice, cell_pattern="checkerboard",
+                    first_cell="resonator") -> List[ComponentInfo]:
+    """Components in ``SquareLattice.place`` order, with their footprint keys."""
+    out = []
+    for idx, (rc, pos) in enumerate(sorted(lattice.site_positions.items())):
+        out.append(ComponentInfo(f"D{idx}", "data_qubit", rc, pos, ("data_qubit",)))
+    for idx, (edge_key, info) in enumerate(sorted(lattice.edge_positions.items())):
+        mirror = False
+        if cell_pattern == "checkerboard":
+            mirror = lattice._mirror_for_edge(edge_key, info["direction"], first_cell)
+        out.append(ComponentInfo(f"C{idx}", "coupler", edge_key, info["xy"],
+                                 ("coupler", _edge_angle(info["direction"]), mirror)))
+    return out
+
+
+# ── spatial hash ────────────────────────────────────────────────────────────
+
+class GridIndex:
+    """Uniform grid over axis-aligned boxes for point and window queries."""
+
+    def __init__(self, boxes: np.ndarray, cell: float):
+        self.boxes = np.asarray(boxes, dtype=float)
+        self.cell = float(cell)
+        self._cells: Dict[Tuple[int, int], List[int]] = {}
+        lo = np.floor(self.boxes[:, :2] / self.cell).astype(int)
+        hi = np.floor(self.boxes[:, 2:] / self.cell).astype(int)
+        for i, ((x0, y0), (x1, y1)) in enumerate(zip(lo, hi)):
+            for gx in range(x0, x1 + 1):
+                for gy in range(y0, y1 + 1):
+                    self._cells.setdefault((gx, gy), []).append(i)
+
+    def at(self, x: float, y: float) -> List[int]:
+        """Indices of boxes containing ``(x, y)``."""
+        key = (math.floor(x / self.cell), math.floor(y / self.cell))
+        return [i for i in self._cells.get(key, ())
+                if self.boxes[i, 0] <= x <= self.boxes[i, 2]
+                and self.boxes[i, 1] <= y <= self.boxes[i, 3]]
+
+    def window(self, xmin, ymin, xmax, ymax) -> np.ndarray:
+        """Indices of boxes overlapping the window."""
+        b = self.boxes
+        return np.nonzero((b[:, 0] <= xmax) & (b[:, 2] >= xmin)
+                          & (b[:, 1] <= ymax) & (b[:, 3] >= ymin))[0]
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+#  VIEWER
+# ═══════════════════════════════════════════════════════════════════════════
+class ChipViewer:
+    """
+    Viewport-culled, level-of-detail view of a lattice on *ax*.
+
+    Parameters
+    ----------
+    lattice : SquareLattice
+        Layout to show.
+    ax : Axes
+        Target axes; limits are set to the whole chip.
+    labels : bool
+        Show D/C labels once a component spans *label_px* pixels.
+    tile_px : int
+        Tile side in screen pixels at the tile's zoom level.
+    cache_tiles : int
+        Number of built tiles kept in the LRU cache.
+    min_px : float
+        Polygons smaller than this on screen are not drawn.
+    """
+
+    def __init__(
+        self,
+        lattice: SquareLattice,
+        ax: Axes,
+        labels: bool = True,
+        cell_pattern: str = "checkerboard",
+        first_cell: str = "resonator",
+        shade_cells: bool = True,
+        shade_alpha: float = 0.15,
+        tile_px: int = 256,
+        cache_tiles: int = 128,
+        min_px: float = 2.0,
+        label_px: float = 60.0,
+        label_fontsize: float = 8,
+    ):
+        self.lattice = lattice
+        self.ax = ax
+        self.labels = labels
+        self.tile_px = tile_px
+        self.cache_tiles = cache_tiles
+        self.min_px = min_px
+        self.label_px = label_px
+        self.label_fontsize = label_fontsize
+
+        self.components = chip_components(lattice, cell_pattern, first_cell)
+        self.footprints: Dict[tuple, Footprint] = {}
+        for comp in self.components:
+            if comp.variant not in self.footprints:
+                self.footprints[comp.variant] = self._record(comp.variant)
+        self._xy = np.array([c.xy for c in self.components], dtype=float)
+        local = np.array([self.footprints[c.variant].bbox for c in self.components])
+        self.boxes = local + np.tile(self._xy, 2)
+        self._reach = np.abs(local).max()          # farthest polygon from a centre
+        self._comp_extent = float((local[:, 2:] - local[:, :2]).max())
+        self.index = GridIndex(self.boxes, cell=lattice.cfg.pitch / 2)
+
+        self._tiles: "OrderedDict[tuple, list]" = OrderedDict()
+        self._shown: set = set()
+        self._hover: Optional[int] = None
+        self.stats = {"built": 0, "hits": 0, "evicted": 0}
+
+        ax.set_aspect("equal")
+        ax.set_facecolor(DEFAULT_PALETTE.background)
+        ax.axis("off")
+        if shade_cells and cell_pattern == "checkerboard":
+            self._shade_cells(first_cell, shade_alpha)
+        (xmin, xmax), (ymin, ymax) = lattice.auto_lims()
+        ax.set_xlim(xmin, xmax)
+        ax.set_ylim(ymin, ymax)
+        self._labels = self._make_labels() if labels else None
+
+        self._info = ax.text(0.01, 0.99, "", transform=ax.transAxes, ha="left",
+                             va="top", fontsize=9, family="monospace", zorder=20,
+                             bbox=dict(facecolor="white", alpha=0.8, edgecolor="none"))
+        self._outline = patches.Rectangle((0, 0), 0, 0, fill=False, lw=1.2,
+                                          edgecolor="#d62728", visible=False, zorder=20)
+        ax.add_patch(self._outline)
+
+        self._cids = [
+            ax.callbacks.connect("xlim_changed", self._on_limits),
+            ax.callbacks.connect("ylim_changed", self._on_limits),
+        ]
+        canvas = ax.figure.canvas
+        self._cids_canvas = [
+            canvas.mpl_connect("motion_notify_event", self._on_move),
+            canvas.mpl_connect("scroll_event", self._on_scroll),
+            canvas.mpl_connect("resize_event", self._on_limits),
+        ]
+        self.update()
+
+    def _record(self, variant) -> Footprint:
+        if variant[0] == "data_qubit":
+            return Footprint.record(self.lattice._data_qubit)
+        _, angle, mirror = variant
+        return Footprint.record(self.lattice._coupler, angle=angle, mirror=mirror)
+
+    def _shade_cells(self, first_cell, alpha):
+        p = self.lattice.cfg.pitch
+        half = p * 0.46
+        rows, cols = self.lattice.cfg.rows, self.lattice.cfg.cols
+        polys, colors = [], []
+        for r in range(rows - 1):
+            for c in range(cols - 1):
+                cx, cy = c * p + p / 2, r * p + p / 2
+                polys.append([(cx - half, cy - half), (cx + half, cy - half),
+                              (cx + half, cy + half), (cx - half, cy + half)])
+                res = self.lattice._cell_type(r, c, first_cell) == "resonator"
+                colors.append(DEFAULT_PALETTE.resonator_cell if res
+                              else DEFAULT_PALETTE.flux_cell)
+        if polys:
+            self.ax.add_collection(PolyCollection(
+                polys, facecolors=colors, edgecolors="none", alpha=alpha, zorder=-1))
+
+    # ── level of detail ─────────────────────────────────────────────────
+    def _scale(self) -> float:
+        """Screen pixels per data unit."""
+        x0, x1 = self.ax.get_xlim()
+        return self.ax.bbox.width / max(abs(x1 - x0), 1e-12)
+
+    def level(self) -> int:
+        """Zoom level: tiles of level *L* are built for ``2**L`` px per unit."""
+        return math.floor(math.log2(self._scale()))
+
+    def _tile_size(self, level: int) -> float:
+        return self.tile_px / 2.0 ** level
+
+    def visible_tiles(self) -> List[tuple]:
+        level = self.level()
+        size = self._tile_size(level)
+        (x0, x1), (y0, y1) = sorted(self.ax.get_xlim()), sorted(self.ax.get_ylim())
+        # Components are binned by centre; widen by their reach
+        r = self._reach
+        return [(level, i, j)
+                for i in range(math.floor((x0 - r) / size), math.floor((x1 + r) / size) + 1)
+                for j in range(math.floor((y0 - r) / size), math.floor((y1 + r) / size) + 1)]
+
+    # ── tiles ───────────────────────────────────────────────────────────
+    def _build_tile(self, key) -> list:
+        level, i, j = key
+        size = self._tile_size(level)
+        scale = 2.0 ** level
+        cx, cy = self._xy[:, 0], self._xy[:, 1]
+        members = np.nonzero((cx >= i * size) & (cx < (i + 1) * size)
+                             & (cy >= j * size) & (cy < (j + 1) * size))[0]
+        if len(members) == 0:
+            return []
+        min_extent = self.min_px / scale
+        polys, colors = [], []
+        for m in members:
+            fp = self.footprints[self.components[m].variant]
+            keep = fp.extents >= min_extent
+            polys.extend(fp.polygons(self._xy[m], min_extent))
+            colors.append(fp.colors[keep])
+        artists = []
+        if polys:
+            coll = PolyCollection(polys, facecolors=np.concatenate(colors),
+                                  edgecolors="none", antialiaseds=scale > 0.5)
+            self.ax.add_collection(coll, autolim=False)
+            artists.append(coll)
+        return artists
+
+    def _tile(self, key) -> list:
+        artists = self._tiles.get(key)
+        if artists is not None:
+            self._tiles.move_to_end(key)
+            self.stats["hits"] += 1
+            return artists
+        artists = self._build_tile(key)
+        self.stats["built"] += 1
+        self._tiles[key] = artists
+        return artists
+
+    def _evict(self, keep):
+        """Drop least recently used tiles beyond the cache size (never *keep*)."""
+        for key in list(self._tiles):
+            if len(self._tiles) <= max(self.cache_tiles, len(keep)):
+                break
+            if key in keep:
+                continue
+            for a in self._tiles.pop(key):
+                a.remove()
+            self.stats["evicted"] += 1
+
+    def update(self):
+        """Show the tiles covering the current view, hide the others."""
+        wanted = set(self.visible_tiles())
+        for key in wanted:
+            artists = self._tile(key)
+            if key not in self._shown:
+                for a in artists:
+                    a.set_visible(True)
+        for key in self._shown - wanted:
+            for a in self._tiles.get(key, ()):
+                a.set_visible(False)
+        self._shown = wanted
+        self._evict(wanted)
+
+    def _make_labels(self) -> LabelCollection:
+        """One culled label artist for every component, shown past *label_px*."""
+        styles = {
+            True: LabelStyle(fontsize=self.label_fontsize, weight="bold"),
+            False: LabelStyle(fontsize=self.label_fontsize - 1, style="italic"),
+        }
+        data = [c.kind == "data_qubit" for c in self.components]
+        drop = np.where(data, 40.0, 30.0)          # as SquareLattice.place
+        xy = self._xy - np.column_stack([np.zeros_like(drop), drop])
+        labels = LabelCollection(xy, [c.name for c in self.components],
+                                 [styles[d] for d in data],
+                                 min_scale=self.label_px / self._comp_extent)
+        self.ax.add_artist(labels)
+        return labels
+
+    # ── lookup ──────────────────────────────────────────────────────────
+    def _hit(self, x: float, y: float) -> Optional[int]:
+        hits = self.index.at(x, y)
+        for i in hits:
+            fp = self.footprints[self.components[i].variant]
+            local = (x - self._xy[i, 0], y - self._xy[i, 1])
+            s = fp.starts
+            for p in range(len(s) - 1):
+                if Path(fp.verts[s[p]:s[p + 1]]).contains_point(local):
+                    return i
+        return hits[0] if hits else None
+
+    def component_at(self, x: float, y: float) -> Optional[ComponentInfo]:
+        """Component whose footprint contains ``(x, y)`` (else whose box does)."""
+        i = self._hit(x, y)
+        return None if i is None else self.components[i]
+
+    # ── events ──────────────────────────────────────────────────────────
+    def _on_limits(self, *_):
+        self.update()
+
+    def _on_move(self, event):
+        if event.inaxes is not self.ax:
+            return
+        idx = self._hit(event.xdata, event.ydata)
+        if idx == self._hover:
+            return
+        self._hover = idx
+        if idx is None:
+            self._info.set_text("")
+            self._outline.set_visible(False)
+        else:
+            comp = self.components[idx]
+            self._info.set_text(f"{comp.name}  {comp.kind}  {comp.site}")
+            x0, y0, x1, y1 = self.boxes[idx]
+            self._outline.set_bounds(x0, y0, x1 - x0, y1 - y0)
+            self._outline.set_visible(True)
+        self.ax.figure.canvas.draw_idle()
+
+    def _on_scroll(self, event, factor=1.25):
+        if event.inaxes is not self.ax:
+            return
+        f = 1 / factor if event.button == "up" else factor
+        x, y = event.xdata, event.ydata
+        x0, x1 = self.ax.get_xlim()
+        y0, y1 = self.ax.get_ylim()
+        self.ax.set_xlim(x + (x0 - x) * f, x + (x1 - x) * f)
+        self.ax.set_ylim(y + (y0 - y) * f, y + (y1 - y) * f)
+        self.ax.figure.canvas.draw_idle()
+
+    def disconnect(self):
+        """Detach the event callbacks."""
+        for cid in self._cids:
+            self.ax.callbacks.disconnect(cid)
+        for cid in self._cids_canvas:
+            self.ax.figure.canvas.mpl_disconnect(cid)
+
+
+def view_chip(
+    rows: int = 3,
+    cols: int = 3,
+    pitch: float = 0,
+    figsize: Tuple[float, float] = (9, 9),
+    show: bool = True,
+    **viewer_kw,
+) -> ChipViewer:
+    """Open an interactive :class:`ChipViewer` on a new figure.
+
+    Keep a reference to the returned viewer while interacting.
+    """
+    import matplotlib.pyplot as plt
+    lattice = SquareLattice(LatticeConfig(rows=rows, cols=cols, pitch=pitch))
+    fig, ax = plt.subplots(figsize=figsize)
+    viewer = ChipViewer(lattice, ax, **viewer_kw)
+    fig.tight_layout()
+    if show:
+        plt.show()
+    return viewer
@@ -1,13 +1,56 @@
-"""3D Blender visualization for superconducting quantum processor chips."""
+"""3D Blender visualization for superconducting quantum processor chips.
 
-from .primitives import (
-    clear_scene, create_cuboid, create_dolan_bridge,
-    create_half_bridge, create_extruded_path,
-    get_material, create_material, GLOBAL_SCALE,
-)
+Geometry (``geometry``, ``scene``, ``components``, ``chip``), keyframe
+tracks (``keyframes``), camera paths (``camera_paths``), Bloch-ensemble
+transforms (``ensemble``), the dephasing simulator (``dephasing``) and
+the ``gltf`` exporter are pure NumPy and import anywhere.  The bpy-bound
+helpers (``primitives``, ``bpy_backend``, ``renderer``, ``animation``,
+``camera``, ``bloch``) are loaded on first attribute access, so
+``import visualization_3d`` works outside Blender.
+``fake_bpy.install()`` registers a recording ``bpy`` stand-in under
+which the bpy-bound modules run headless in plain CPython.
+"""
+
+import importlib
+
+from .geometry import GLOBAL_SCALE, MATERIAL_PALETTE
+from .scene import Scene, MeshData, SceneObject, Instance
 from .components import (
     JJChain3D, Xmon3D, DCSqUID3D, Resonator3D, FluxLine3D,
     Fluxonium3D, Coupler3D,
     LAYER_H, ISLAND_HEIGHT,
 )
-from .renderer import BlenderRenderer
+from .chip import ChipBuilder
+from .gltf import export_glb
+from .keyframes import frame_range, spin_euler, look_at_quaternions, look_at_euler
+from .camera_paths import CameraPath, orbit, turntable, dolly, lattice_flyover
+from .ensemble import directions_from_angles, arrow_instances, velocity_instances
+from .dephasing import QuasiStatic, OrnsteinUhlenbeck, Telegraph, Ensemble, simulate
+
+# bpy-bound names → defining submodule
+_LAZY = {
+    "clear_scene": "primitives",
+    "create_cuboid": "primitives",
+    "create_dolan_bridge": "primitives",
+    "create_half_bridge": "primitives",
+    "create_extruded_path": "primitives",
+    "get_material": "primitives",
+    "create_material": "primitives",
+    "upload": "bpy_backend",
+    "BlenderRenderer": "renderer",
+    "write_fcurves": "animation",
+    "write_keyframes": "animation",
+    "keyframe_path": "camera",
+    "follow_path": "camera",
+    "camera_only": "camera",
+    "BlochSphere": "bloch",
+}
+
+
+def __getattr__(name):
+    module = _LAZY.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{module}", __name__), name)
+    globals()[name] = value
+    return value
@@ -0,0 +1,109 @@
+"""
+Bulk F-curve writing for Blender animations.
+
+Instead of ``scene.frame_set(f)`` + ``obj.keyframe_insert(...)`` for every
+frame and object — two operator-level calls per key, each forcing a scene
+re-evaluation — the whole track is computed up front (see
+``visualization_3d.keyframes``) and written per channel with
+``keyframe_points.add(n)`` and one ``foreach_set("co", …)``::
+
+    from visualization_3d.keyframes import frame_range, spin_euler
+    from visualization_3d.animation import write_keyframes
+
+    frames = frame_range(0, 60)
+    write_keyframes(arrow_empties, "rotation_euler", frames,
+                    spin_euler(theta_list, angular_speeds, frames))
+
+Works with legacy actions (``action.fcurves``) and, on Blender ≥ 4.4,
+with layered actions through ``fcurve_ensure_for_datablock``.
+"""
+
+import bpy
+import numpy as np
+
+from .keyframes import interleave
+
+
+# Blender's Keyframe.interpolation enum values
+INTERPOLATION = {"CONSTANT": 0, "LINEAR": 1, "BEZIER": 2}
+
+
+def _action_for(id_block, action_name=None):
+    anim = id_block.animation_data or id_block.animation_data_create()
+    if anim.action is None:
+        anim.action = bpy.data.actions.new(action_name or f"{id_block.name}Action")
+    return anim.action
+
+
+def _fresh_fcurve(action, id_block, data_path, index):
+    """Return an empty F-curve for ``data_path[index]`` on *action*."""
+    if hasattr(action, "fcurve_ensure_for_datablock"):   # layered actions
+        fc = action.fcurve_ensure_for_datablock(id_block, data_path, index=index)
+        if len(fc.keyframe_points):
+            fc.keyframe_points.clear()
+        return fc
+    fc = action.fcurves.find(data_path, index=index)
+    if fc is not None:
+        action.fcurves.remove(fc)
+    return action.fcurves.new(data_path, index=index)
+
+
+def write_fcurves(id_block, data_path, frames, values, interpolation="LINEAR",
+                  action_name=None, first_index=0):
+    """Replace the keys of ``id_block.<data_path>`` with one bulk write per channel.
+
+    Parameters
+    ----------
+    id_block : bpy.types.ID
+        Object (or camera / light data, …) to animate.
+    data_path : str
+        Animated property, e.g. ``"location"``, ``"rotation_euler"``,
+        ``"lens"`` (on camera data).
+    frames : array_like, shape (F,)
+        Frame numbers.
+    values : array_like, shape (F,) or (F, C)
+        One column per array index of the property.
+    interpolation : str
+        ``"CONSTANT"``, ``"LINEAR"`` or ``"BEZIER"``.
+    first_index : int
+        Array index of column 0 (to animate e.g. only Z of a location).
+
+    Returns
+    -------
+    fcurves : list
+        The written F-curves, one per column.
+    """
+    co = interleave(frames, values)
+    n = co.shape[1] // 2
+    interp = np.full(n, INTERPOLATION[interpolation], dtype=np.int32)
+
+    action = _action_for(id_block, action_name)
+    fcurves = []
+    for c, buf in enumerate(co):
+        fc = _fresh_fcurve(action, id_block, data_path, first_index + c)
+        points = fc.keyframe_points
+        points.add(n)
+        points.foreach_set("co", buf)
+        points.foreach_set("interpolation", interp)
+        fc.update()
+        fcurves.append(fc)
+    return fcurves
+
+
+def write_keyframes(id_blocks, data_path, frames, values, interpolation="LINEAR"):
+    """:func:`write_fcurves` for many blocks sharing *frames*.
+
+    *values* is ``(N, F)`` or ``(N, F, C)``, row *i* for ``id_blocks[i]``.
+    """
+    values = np.asarray(values)
+    if len(values) != len(id_blocks):
+        raise ValueError(f"{len(id_blocks)} blocks but {len(values)} value tracks")
+    for block, track in zip(id_blocks, values):
+        write_fcurves(block, data_path, frames, track, interpolation)
+
+
+def set_frame_range(frames, scene=None):
+    """Set the scene's frame range to cover *frames*."""
+    scene = scene or bpy.context.scene
+    scene.frame_start = int(np.min(frames))
+    scene.frame_end = int(np.max(frames))
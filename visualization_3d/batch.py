@@ -0,0 +1,260 @@
+"""
+Headless batch rendering of chip variants.
+
+Reads a JSON file of job specs and renders each one in its own
+``blender -b`` process, at most ``--jobs`` at a time::
+
+    python -m visualization_3d.batch variants.json -o renders/ -j 4
+
+Spec file: a list of objects (or ``{"jobs": [...]}``), e.g. ::
+
+    [{"name": "6x6",
+      "lattice": {"rows": 6, "cols": 6},
+      "fluxonium_dims": {"chain": {"gap": 12}},
+      "coupler_dims": {"resonator": {"num_turns": 7}},
+      "camera": {"location": [10, -20, 15], "rotation_deg": [55, 0, 0],
+                 "lens": 50},
+      "resolution": [1920, 1080], "samples": 64}]
+
+Every job gets ``<out>/<name>/`` holding the spec (``job.json``), the
+Blender log (``blender.log``), the image (``<name>.png``) and, once it
+finished successfully, ``result.json``; names must be plain file
+names (no path separators or ``..``).  Re-running the same batch skips
+jobs that already have a result, so interrupted batches resume where
+they stopped.  ``--blender`` accepts any executable with Blender's
+command-line interface, which lets the driver be exercised locally with
+a stand-in script.
+
+This module never imports ``bpy``; the Blender side lives in
+``batch_job.py``.
+"""
+
+import argparse
+import dataclasses
+import json
+import os
+import subprocess
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, asdict
+from typing import List, Optional
+
+
+JOB_SCRIPT = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                          "batch_job.py")
+
+
+@dataclass
+class JobResult:
+    """Outcome of one batch job."""
+    name: str
+    status: str              # "ok", "failed", "skipped"
+    returncode: Optional[int]
+    elapsed: float
+    output: str
+    log: str
+
+
+# ── spec handling ───────────────────────────────────────────────────────
+
+def check_name(name) -> str:
+    """Return *name* if it is a plain file name, else raise ``ValueError``.
+
+    Job names become directories under the output directory, so path
+    separators, ``..`` and absolute paths are rejected.
+    """
+    if (not isinstance(name, str) or name in ("", ".", "..")
+            or os.path.basename(name) != name
+            or (os.altsep is not None and os.altsep in name)):
+        raise ValueError(f"job name {name!r} is not a plain file name")
+    return name
+
+
+def load_specs(path) -> List[dict]:
+    """Load job specs from *path* and give every job a unique ``name``."""
+    with open(path) as f:
+        data = json.load(f)
+    specs = data["jobs"] if isinstance(data, dict) else data
+    names = set()
+    for i, spec in enumerate(specs):
+        check_name(spec.setdefault("name", f"job{i:03d}"))
+        if spec["name"] in names:
+            raise ValueError(f"duplicate job name {spec['name']!r}")
+        names.add(spec["name"])
+    return specs
+
+
+def _dataclass_from_dict(cls, data):
+    """Build dataclass *cls* from a (possibly nested, partial) dict."""
+    kwargs = {}
+    types = {f.name: f.type for f in dataclasses.fields(cls)}
+    for key, value in (data or {}).items():
+        if key not in types:
+            raise ValueError(f"{cls.__name__} has no field {key!r}")
+        ftype = types[key]
+        if dataclasses.is_dataclass(ftype) and isinstance(value, dict):
+            value = _dataclass_from_dict(ftype, value)
+        kwargs[key] = value
+    return cls(**kwargs)
+
+
+def lattice_from_spec(spec):
+    """Return the ``SquareLattice`` described by a job *spec*."""
+    from visualization.styles import (
+        LatticeConfig, FluxoniumDims, TunableTransmonDims,
+    )
+    from visualization.lattice import SquareLattice
+
+    return SquareLattice(
+        _dataclass_from_dict(LatticeConfig, spec.get("lattice")),
+        fluxonium_dims=_dataclass_from_dict(FluxoniumDims,
+                                            spec.get("fluxonium_dims")),
+        coupler_dims=_dataclass_from_dict(TunableTransmonDims,
+                                          spec.get("coupler_dims")),
+    )
+
+
+# ── running ─────────────────────────────────────────────────────────────
+
+def _job_paths(out_dir, name):
+    job_dir = os.path.join(out_dir, check_name(name))
+    return (job_dir,
+            os.path.join(job_dir, f"{name}.png"),
+            os.path.join(job_dir, "blender.log"),
+            os.path.join(job_dir, "result.json"))
+
+
+def _write_json(path, data):
+    """Write *data* atomically (temp file + rename)."""
+    tmp = f"{path}.tmp{os.getpid()}"
+    with open(tmp, "w") as f:
+        json.dump(data, f, indent=2)
+    os.replace(tmp, path)
+
+
+def is_done(out_dir, name) -> bool:
+    """True if job *name* already finished successfully in *out_dir*."""
+    _, output, _, result = _job_paths(out_dir, name)
+    if not (os.path.exists(result) and os.path.exists(output)):
+        return False
+    try:
+        with open(result) as f:
+            return json.load(f).get("status") == "ok"
+    except (OSError, ValueError):
+        return False
+
+
+def _run_job(spec, out_dir, blender, timeout):
+    name = spec["name"]
+    job_dir, output, log, result = _job_paths(out_dir, name)
+    os.makedirs(job_dir, exist_ok=True)
+    job_file = os.path.join(job_dir, "job.json")
+    _write_json(job_file, spec)
+    # A stale image from an interrupted run must not count as output
+    if os.path.exists(output):
+        os.remove(output)
+
+    cmd = [blender, "-b", "--factory-startup", "--python-exit-code", "1",
+           "--python", JOB_SCRIPT, "--", job_file, output]
+    t0 = time.perf_counter()
+    with open(log, "w") as logf:
+        logf.write(" ".join(cmd) + "\n\n")
+        logf.flush()
+        try:
+            rc = subprocess.run(cmd, stdout=logf, stderr=subprocess.STDOUT,
+                                timeout=timeout).returncode
+        except subprocess.TimeoutExpired:
+            rc = None
+            logf.write(f"\n[batch] timed out after {timeout} s\n")
+    elapsed = time.perf_counter() - t0
+
+    ok = rc == 0 and os.path.exists(output)
+    res = JobResult(name, "ok" if ok else "failed", rc, elapsed, output, log)
+    if ok:
+        _write_json(result, asdict(res))
+    return res
+
+
+def run_batch(specs, out_dir, blender="blender", workers=None,
+              timeout=None, resume=True) -> List[JobResult]:
+    """Render every spec in its own Blender process.
+
+    Parameters
+    ----------
+    specs : list of dict
+        Job specs (see module docstring); each needs a unique ``name``.
+    out_dir : str
+        Output directory; one sub-directory per job.
+    blender : str
+        Blender executable (or a stand-in with the same CLI).
+    workers : int or None
+        Maximum concurrent Blender processes (default: CPU count).
+    timeout : float or None
+        Per-job wall-clock limit in seconds.
+    resume : bool
+        Skip jobs that already have a successful ``result.json``.
+
+    Returns
+    -------
+    results : list of JobResult
+        In spec order; also written to ``<out_dir>/summary.json``.
+    """
+    os.makedirs(out_dir, exist_ok=True)
+    workers = workers or os.cpu_count() or 1
+
+    results = [None] * len(specs)
+    pending = []
+    for i, spec in enumerate(specs):
+        if resume and is_done(out_dir, spec["name"]):
+            _, output, log, _ = _job_paths(out_dir, spec["name"])
+            results[i] = JobResult(spec["name"], "skipped", 0, 0.0, output, log)
+        else:
+            pending.append(i)
+
+    # Threads only wait on child processes, so they bound concurrency
+    # without competing for the GIL.
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = {i: pool.submit(_run_job, specs[i], out_dir, blender, timeout)
+                   for i in pending}
+        for i, fut in futures.items():
+            results[i] = fut.result()
+            r = results[i]
+            print(f"[batch] {r.name}: {r.status} ({r.elapsed:.1f} s)")
+
+    _write_json(os.path.join(out_dir, "summary.json"),
+                [asdict(r) for r in results])
+    return results
+
+
+# ── CLI ─────────────────────────────────────────────────────────────────
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="python -m visualization_3d.batch",
+        description="Render chip variants in parallel headless Blender processes.",
+    )
+    parser.add_argument("specs", help="JSON file with a list of job specs")
+    parser.add_argument("-o", "--out", default="renders",
+                        help="output directory (default: renders)")
+    parser.add_argument("-j", "--jobs", type=int, default=None,
+                        help="max concurrent Blender processes (default: CPU count)")
+    parser.add_argument("--blender", default=os.environ.get("BLENDER", "blender"),
+                        help="Blender executable (default: $BLENDER or 'blender')")
+    parser.add_argument("--timeout", type=float, default=None,
+                        help="per-job timeout in seconds")
+    parser.add_argument("--no-resume", action="store_true",
+                        help="re-render jobs that already finished")
+    args = parser.parse_args(argv)
+
+    results = run_batch(load_specs(args.specs), args.out, blender=args.blender,
+                        workers=args.jobs, timeout=args.timeout,
+                        resume=not args.no_resume)
+    failed = [r.name for r in results if r.status == "failed"]
+    if failed:
+        print(f"[batch] {len(failed)} failed: {', '.join(failed)}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,68 @@
+"""
+Blender-side entry point for ``visualization_3d.batch``.
+
+Executed by each worker as::
+
+    blender -b --python batch_job.py -- job.json output.png
+
+Builds the lattice described by the job spec, renders it with
+``BlenderRenderer``, applies the optional camera / render overrides and
+writes a still image to *output*.  The project root is derived from this
+file's location, so no hard-coded path is needed.
+"""
+
+import json
+import math
+import os
+import sys
+
+_PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if _PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, _PROJECT_ROOT)
+
+import bpy
+
+from visualization_3d.batch import lattice_from_spec
+from visualization_3d.renderer import BlenderRenderer
+
+
+def _apply_overrides(spec):
+    scene = bpy.context.scene
+    cam_spec = spec.get("camera")
+    if cam_spec:
+        cam = scene.camera
+        if "location" in cam_spec:
+            cam.location = cam_spec["location"]
+        if "rotation_deg" in cam_spec:
+            cam.rotation_euler = [math.radians(a) for a in cam_spec["rotation_deg"]]
+        if "lens" in cam_spec:
+            cam.data.lens = cam_spec["lens"]
+
+    if "resolution" in spec:
+        scene.render.resolution_x, scene.render.resolution_y = spec["resolution"]
+        scene.render.resolution_percentage = 100
+    if "engine" in spec:
+        scene.render.engine = spec["engine"]
+    if "samples" in spec:
+        if scene.render.engine == "CYCLES":
+            scene.cycles.samples = spec["samples"]
+        else:
+            scene.eevee.taa_render_samples = spec["samples"]
+
+
+def main(job_path, output):
+    with open(job_path) as f:
+        spec = json.load(f)
+
+    BlenderRenderer(lattice_from_spec(spec)).render()
+    _apply_overrides(spec)
+
+    scene = bpy.context.scene
+    scene.render.image_settings.file_format = "PNG"
+    scene.render.filepath = output
+    bpy.ops.render.render(write_still=True)
+    print(f"[batch_job] wrote {output}")
+
+
+if __name__ == "__main__":
+    main(*sys.argv[sys.argv.index("--") + 1:])
@@ -0,0 +1,273 @@
+"""
+Instanced Bloch-sphere ensembles for Blender.
+
+``old/dephasing_bloch_sphere.py`` built every ensemble member from four
+operator-created objects (shaft, tip, velocity shaft, velocity tip) and
+a 256×128 UV sphere, which limits the scenes to a handful of arrows.
+Here the ensemble is a point cloud: one vertex per member carrying its
+rotation and scale as named attributes, turned into arrow instances by a
+small geometry-nodes group.  Updating 10 k arrows is one ``foreach_set``
+per attribute::
+
+    from visualization_3d.bloch import BlochSphere
+    from visualization_3d.ensemble import directions_from_angles
+
+    bloch = BlochSphere(radius=2.0)
+    bloch.build()
+    bloch.set_ensemble(directions_from_angles(theta, phi),
+                       thickness=0.03, velocities=omega)
+    bloch.animate(direction_tracks)       # (N, F, 3), one row per frame
+
+The sphere is a cube-sphere whose resolution follows its on-screen size
+(``ensemble.sphere_subdivisions``).
+"""
+
+import bpy
+import numpy as np
+
+from .geometry import arrow_mesh, cube_sphere_mesh
+from .ensemble import arrow_instances, velocity_instances, sphere_subdivisions
+from .primitives import new_mesh
+
+
+# Point attributes read by the instancing node group
+ROTATION_ATTR = "ens_rotation"
+SCALE_ATTR = "ens_scale"
+
+
+# ── materials ───────────────────────────────────────────────────────────
+
+def _principled(name, color, roughness=0.3, metal=0.0, alpha=1.0,
+                transmission=0.0):
+    """Plain Principled-BSDF material (reused if *name* exists)."""
+    mat = bpy.data.materials.get(name)
+    if mat is not None:
+        return mat
+    mat = bpy.data.materials.new(name=name)
+    mat.use_nodes = True
+    bsdf = mat.node_tree.nodes.get("Principled BSDF")
+    bsdf.inputs["Base Color"].default_value = color
+    bsdf.inputs["Roughness"].default_value = roughness
+    bsdf.inputs["Metallic"].default_value = metal
+    bsdf.inputs["Alpha"].default_value = alpha
+    # "Transmission" was renamed in Blender 4.0
+    for trans_name in ("Transmission Weight", "Transmission"):
+        if trans_name in bsdf.inputs:
+            bsdf.inputs[trans_name].default_value = transmission
+            break
+    if alpha < 1.0:
+        mat.blend_method = "BLEND"
+    mat.shadow_method = "NONE"
+    return mat
+
+
+# ── instancing ──────────────────────────────────────────────────────────
+
+def _instancing_group(name, prototype):
+    """Geometry-nodes group: instance *prototype* on every input point.
+
+    Rotation (XYZ Euler) and scale per point come from the
+    ``ROTATION_ATTR`` / ``SCALE_ATTR`` point attributes.
+    """
+    group = bpy.data.node_groups.new(name, "GeometryNodeTree")
+    if hasattr(group, "interface"):           # Blender ≥ 4.0
+        group.interface.new_socket(name="Geometry", in_out="INPUT",
+                                   socket_type="NodeSocketGeometry")
+        group.interface.new_socket(name="Geometry", in_out="OUTPUT",
+                                   socket_type="NodeSocketGeometry")
+    else:
+        group.inputs.new("NodeSocketGeometry", "Geometry")
+        group.outputs.new("NodeSocketGeometry", "Geometry")
+
+    nodes, links = group.nodes, group.links
+    group_in = nodes.new("NodeGroupInput")
+    group_out = nodes.new("NodeGroupOutput")
+    info = nodes.new("GeometryNodeObjectInfo")
+    info.inputs["Object"].default_value = prototype
+    on_points = nodes.new("GeometryNodeInstanceOnPoints")
+
+    links.new(group_in.outputs[0], on_points.inputs["Points"])
+    links.new(info.outputs["Geometry"], on_points.inputs["Instance"])
+    for attr, socket in ((ROTATION_ATTR, "Rotation"), (SCALE_ATTR, "Scale")):
+        named = nodes.new("GeometryNodeInputNamedAttribute")
+        named.data_type = "FLOAT_VECTOR"
+        named.inputs["Name"].default_value = attr
+        links.new(named.outputs["Attribute"], on_points.inputs[socket])
+    links.new(on_points.outputs["Instances"], group_out.inputs[0])
+    return group
+
+
+class Instancer:
+    """One object instancing a prototype mesh on a point cloud.
+
+    :meth:`set` rewrites locations, rotations and scales in bulk; the
+    point mesh is only rebuilt when the number of instances changes.
+    """
+
+    def __init__(self, name, prototype, collection):
+        self.name = name
+        self.object = bpy.data.objects.new(name, self._points_mesh(0))
+        collection.objects.link(self.object)
+        mod = self.object.modifiers.new(name="Instances", type="NODES")
+        mod.node_group = _instancing_group(f"{name}_Instancing", prototype)
+
+    def _points_mesh(self, n):
+        mesh = new_mesh(f"{self.name}_Points", np.zeros((n, 3)), np.zeros((0, 4)))
+        for attr in (ROTATION_ATTR, SCALE_ATTR):
+            mesh.attributes.new(attr, "FLOAT_VECTOR", "POINT")
+        return mesh
+
+    def __len__(self):
+        return len(self.object.data.vertices)
+
+    def set(self, locations, rotations, scales):
+        """Replace all instances; arrays are ``(N, 3)``."""
+        n = len(locations)
+        mesh = self.object.data
+        if len(mesh.vertices) != n:
+            old, mesh = mesh, self._points_mesh(n)
+            self.object.data = mesh
+            bpy.data.meshes.remove(old)
+        mesh.vertices.foreach_set(
+            "co", np.ascontiguousarray(locations, dtype=np.float32).ravel())
+        for attr, values in ((ROTATION_ATTR, rotations), (SCALE_ATTR, scales)):
+            mesh.attributes[attr].data.foreach_set(
+                "vector", np.ascontiguousarray(values, dtype=np.float32).ravel())
+        mesh.update()
+
+
+# ── Bloch sphere ────────────────────────────────────────────────────────
+
+class BlochSphere:
+    """Transparent sphere, axes and an instanced ensemble of state vectors.
+
+    Parameters
+    ----------
+    radius : float
+        Sphere radius in Blender units; ensemble lengths are in units of
+        the radius.
+    screen_radius_px : float
+        Expected on-screen radius of the sphere; sets the mesh resolution.
+    arrow_segments : int
+        Sides of the shared arrow mesh.
+    """
+
+    def __init__(self, radius=2.0, screen_radius_px=500, arrow_segments=12,
+                 name="Bloch"):
+        self.radius = radius
+        self.screen_radius_px = screen_radius_px
+        self.arrow_segments = arrow_segments
+        self.name = name
+        self.collection = None
+        self.sphere = None
+        self.arrows = None
+        self.velocity_arrows = None
+        self.axes = None
+        self._handler = None
+        self._state = {}
+
+    # ── scene ───────────────────────────────────────────────────────────
+
+    def build(self, parent_collection=None, axes=True):
+        """Create the sphere, the arrow prototypes and the instancers."""
+        parent_collection = parent_collection or bpy.context.scene.collection
+        self.collection = bpy.data.collections.new(self.name)
+        parent_collection.children.link(self.collection)
+
+        n = sphere_subdivisions(self.screen_radius_px)
+        verts, faces = cube_sphere_mesh(n)
+        sphere_mesh = new_mesh(f"{self.name}_Sphere", verts * self.radius, faces)
+        sphere_mesh.materials.append(_principled(
+            "BlochSphereMaterial", (0.15, 0.33, 0.33, 0.4), roughness=0.05,
+            alpha=0.2, transmission=0.7))
+        self.sphere = bpy.data.objects.new(f"{self.name}_Sphere", sphere_mesh)
+        self.collection.objects.link(self.sphere)
+
+        arrow_verts, arrow_faces = arrow_mesh(self.arrow_segments)
+        self.arrows = self._instancer(
+            "Arrows", arrow_verts, arrow_faces,
+            _principled("BlochArrowMaterial", (0.0, 0.0, 0.0, 1.0)))
+        self.velocity_arrows = self._instancer(
+            "Velocity", arrow_verts, arrow_faces,
+            _principled("BlochVelocityMaterial", (1.0, 0.0, 0.0, 1.0)))
+        if axes:
+            self.axes = self._instancer(
+                "Axes", arrow_verts, arrow_faces,
+                _principled("BlochAxisMaterial", (0.2, 0.2, 0.2, 1.0),
+                            roughness=0.2, metal=0.8))
+            self.axes.set(*arrow_instances(np.eye(3), 1.2 * self.radius, 0.02))
+        return self
+
+    def _instancer(self, label, verts, faces, material):
+        """Hidden prototype object plus the instancer that repeats it."""
+        mesh = new_mesh(f"{self.name}_{label}Proto", verts, faces)
+        mesh.materials.append(material)
+        proto = bpy.data.objects.new(f"{self.name}_{label}Proto", mesh)
+        self.collection.objects.link(proto)
+        proto.hide_render = True
+        proto.hide_set(True)
+        return Instancer(f"{self.name}_{label}", proto, self.collection)
+
+    # ── ensemble ────────────────────────────────────────────────────────
+
+    def set_ensemble(self, directions, lengths=1.0, thickness=0.03,
+                     velocities=None):
+        """Show one arrow per row of *directions* ``(N, 3)``.
+
+        *lengths* (units of the radius), *thickness* and *velocities*
+        broadcast against ``N``.  Velocity arrows are drawn tangentially
+        at the tips when *velocities* is given and hidden otherwise.
+        """
+        directions = np.asarray(directions, dtype=float)
+        lengths = np.broadcast_to(lengths, len(directions)) * self.radius
+        self.arrows.set(*arrow_instances(directions, lengths, thickness))
+        if velocities is None:
+            self.velocity_arrows.set(*(np.zeros((0, 3)),) * 3)
+        else:
+            self.velocity_arrows.set(*velocity_instances(
+                directions, lengths, velocities, thickness))
+
+    def animate(self, direction_tracks, lengths=1.0, thickness=0.03,
+                velocities=None, frame_start=None):
+        """Drive the ensemble from precomputed tracks ``(N, F, 3)``.
+
+        Registers a ``frame_change_pre`` handler that shows
+        ``direction_tracks[:, frame - frame_start]``, so a long animation
+        stores one array instead of ``N × F`` keyframes.  *velocities* may
+        be ``(N,)`` or per frame ``(N, F)``.
+        """
+        scene = bpy.context.scene
+        tracks = np.asarray(direction_tracks, dtype=np.float32)
+        start = scene.frame_start if frame_start is None else frame_start
+        scene.frame_start = start
+        scene.frame_end = start + tracks.shape[1] - 1
+        if velocities is not None:
+            velocities = np.asarray(velocities, dtype=np.float32)
+        self._state = dict(tracks=tracks, start=start, lengths=lengths,
+                           thickness=thickness, velocities=velocities)
+
+        self.stop()
+        self._handler = self._on_frame
+        bpy.app.handlers.frame_change_pre.append(self._handler)
+        self.show_frame(scene.frame_current)
+
+    def show_frame(self, frame):
+        """Display the tracked ensemble at *frame* (clamped to the track)."""
+        state = self._state
+        tracks = state["tracks"]
+        i = int(np.clip(int(frame) - state["start"], 0, tracks.shape[1] - 1))
+        velocities = state["velocities"]
+        if velocities is not None and velocities.ndim == 2:
+            velocities = velocities[:, i]
+        self.set_ensemble(tracks[:, i], state["lengths"], state["thickness"],
+                          velocities)
+
+    def _on_frame(self, scene, depsgraph=None):
+        self.show_frame(scene.frame_current)
+
+    def stop(self):
+        """Unregister the frame handler installed by :meth:`animate`."""
+        handlers = bpy.app.handlers.frame_change_pre
+        if self._handler in handlers:
+            handlers.remove(self._handler)
+        self._handler = None
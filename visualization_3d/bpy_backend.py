@@ -0,0 +1,135 @@
+"""
+Thin Blender backend for :class:`~visualization_3d.scene.Scene`.
+
+Uploads a backend-neutral scene in bulk: each distinct (mesh, material)
+pair becomes one mesh datablock written with ``foreach_set``, and every
+object that uses it is a linked duplicate sharing that datablock.  This
+is the only bpy-bound step of the 3D pipeline.
+
+Instances become a small scene graph::
+
+    <collection>                 (target, e.g. the active collection)
+      Chip        root empty     carries the global scale
+      Substrate   top-level objects, parented to the root
+      D0/         one collection per instance
+        D0        parent empty   instance location / rotation
+        D0_Xmon_Center …         prototype objects, local transforms
+
+so moving, scaling or hiding a whole component is one property write.
+"""
+
+import bpy
+
+from .primitives import new_mesh, get_material, CHIP_TAG
+
+
+class SceneIndex:
+    """Name → Blender object/collection lookup for an uploaded scene.
+
+    Later passes use this instead of scanning ``bpy.data.objects``.
+    """
+
+    def __init__(self):
+        self.objects = {}
+        self.collections = {}
+        self.root = None
+
+    def __getitem__(self, name):
+        return self.objects[name]
+
+    def __contains__(self, name):
+        return name in self.objects
+
+    def __len__(self):
+        return len(self.objects)
+
+
+def _empty(name, collection, size=0.5):
+    obj = bpy.data.objects.new(name, None)
+    obj.empty_display_type = "PLAIN_AXES"
+    obj.empty_display_size = size
+    collection.objects.link(obj)
+    return obj
+
+
+def set_visible(collection, visible=True):
+    """Show or hide a whole component collection in viewport and render."""
+    collection.hide_viewport = not visible
+    collection.hide_render = not visible
+
+
+def upload(scene, collection=None, root=None, root_scale=1.0, index=None,
+           parent=None):
+    """Create Blender objects for every object and instance in *scene*.
+
+    Parameters
+    ----------
+    scene : Scene
+        Scene to upload.
+    collection : bpy.types.Collection or None
+        Target collection (defaults to the active one).
+    root : str or None
+        If given, name of a root empty that parents everything and carries
+        *root_scale*.
+    root_scale : float
+        Uniform scale of the root empty.
+    index : SceneIndex or None
+        Existing index to extend (a new one is created otherwise).
+    parent : bpy.types.Object or None
+        Existing object to parent everything under (ignored when *root*
+        is given).
+
+    Returns
+    -------
+    index : SceneIndex
+        Created objects (including empties) and collections by name.
+    """
+    if collection is None:
+        collection = bpy.context.collection
+    if index is None:
+        index = SceneIndex()
+
+    materials = [get_material(key) for key in scene.materials]
+    meshes = {}   # (mesh index, material index) → mesh datablock
+
+    def make(rec, name, coll, parent):
+        key = (rec.mesh, rec.material)
+        mesh = meshes.get(key)
+        if mesh is None:
+            data = scene.meshes[rec.mesh]
+            mesh = new_mesh(f"{name}_Mesh", data.vertices, data.faces)
+            mesh.materials.append(materials[rec.material])
+            meshes[key] = mesh
+        obj = bpy.data.objects.new(name, mesh)
+        obj.location = rec.location
+        obj.rotation_euler = (0, 0, rec.rotation_z)
+        obj.scale = rec.scale
+        obj.parent = parent
+        coll.objects.link(obj)
+        index.objects[name] = obj
+        return obj
+
+    if root is not None:
+        parent = _empty(root, collection)
+        parent.scale = (root_scale,) * 3
+        index.objects[root] = parent
+        index.root = parent
+
+    for rec in scene.objects:
+        make(rec, rec.name, collection, parent)
+
+    for inst in scene.instances:
+        coll = bpy.data.collections.new(inst.name)
+        coll[CHIP_TAG] = True
+        collection.children.link(coll)
+        index.collections[inst.name] = coll
+
+        holder = _empty(inst.name, coll, size=10)
+        holder.location = inst.location
+        holder.rotation_euler = (0, 0, inst.rotation_z)
+        holder.parent = parent
+        index.objects[inst.name] = holder
+
+        for rec in scene.prototypes[inst.prototype].objects:
+            make(rec, inst.name + rec.name, coll, holder)
+    return index
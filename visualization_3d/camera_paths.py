@@ -0,0 +1,164 @@
+"""
+Analytic camera paths for chip turntables and flythroughs.
+
+Every path is computed for all frames at once from the chip's extent
+(``SquareLattice.auto_lims``) and returned as a :class:`CameraPath`:
+per-frame camera locations and look-at targets in Blender units.
+``camera.keyframe_path`` writes it as bulk F-curves, ``camera.follow_path``
+as a curve + constraints.  No ``bpy`` needed.
+"""
+
+import math
+from dataclasses import dataclass
+
+import numpy as np
+
+from .geometry import GLOBAL_SCALE
+from .keyframes import frame_range, look_at_quaternions
+
+
+@dataclass
+class CameraPath:
+    """Camera locations ``(F, 3)`` and look-at targets ``(F, 3)`` per frame."""
+
+    frames: np.ndarray
+    locations: np.ndarray
+    targets: np.ndarray
+    cyclic: bool = False
+
+    def __len__(self):
+        return len(self.frames)
+
+    def quaternions(self, up=(0, 0, 1)):
+        """``rotation_quaternion`` track ``(F, 4)`` aiming at the targets."""
+        return look_at_quaternions(self.locations, self.targets, up)
+
+    @property
+    def fixed_target(self):
+        """True when every frame looks at the same point."""
+        return bool(np.all(self.targets == self.targets[0]))
+
+
+def chip_bounds(lattice, margin=100, scale=GLOBAL_SCALE):
+    """Centre ``(3,)`` on the substrate plane and span of the chip, in BU."""
+    (xmin, xmax), (ymin, ymax) = lattice.auto_lims(margin=margin)
+    center = np.array([(xmin + xmax) / 2, (ymin + ymax) / 2, 0.0]) * scale
+    span = max(xmax - xmin, ymax - ymin) * scale
+    return center, span
+
+
+def _frames(n_frames, frame_start):
+    return frame_range(frame_start, frame_start + n_frames - 1)
+
+
+def _smoothstep(t):
+    return t * t * (3 - 2 * t)
+
+
+# ── orbits ──────────────────────────────────────────────────────────────
+
+def orbit(center, radius, height, n_frames, turns=1.0, start_angle=-math.pi / 2,
+          frame_start=1, loop=True):
+    """Circle of *radius* at *height* above *center*, looking at *center*.
+
+    With *loop* the last frame stops one step short of the first, so a
+    cyclic playback has no repeated frame.  ``start_angle = −π/2`` starts
+    in front of the chip (−Y), like the static ``BlenderRenderer`` camera.
+    """
+    center = np.asarray(center, dtype=float)
+    t = np.arange(n_frames) / (n_frames if loop else max(n_frames - 1, 1))
+    angle = start_angle + 2 * math.pi * turns * t
+    locations = np.empty((n_frames, 3))
+    locations[:, 0] = center[0] + radius * np.cos(angle)
+    locations[:, 1] = center[1] + radius * np.sin(angle)
+    locations[:, 2] = center[2] + height
+    targets = np.broadcast_to(center, locations.shape).copy()
+    return CameraPath(_frames(n_frames, frame_start), locations, targets,
+                      cyclic=loop and float(turns).is_integer())
+
+
+def turntable(lattice, n_frames, elevation=math.radians(40), distance=1.1,
+              turns=1.0, margin=100, frame_start=1):
+    """Orbit framing the whole chip: *distance* chip spans away, at *elevation*."""
+    center, span = chip_bounds(lattice, margin)
+    r = distance * span
+    return orbit(center, r * math.cos(elevation), r * math.sin(elevation),
+                 n_frames, turns, frame_start=frame_start)
+
+
+# ── dollies ─────────────────────────────────────────────────────────────
+
+def dolly(start, end, target, n_frames, ease=True, frame_start=1):
+    """Straight move from *start* to *end* looking at *target*.
+
+    *ease* applies smoothstep acceleration/deceleration.
+    """
+    start = np.asarray(start, dtype=float)
+    end = np.asarray(end, dtype=float)
+    t = np.linspace(0.0, 1.0, n_frames)
+    if ease:
+        t = _smoothstep(t)
+    locations = start + t[:, None] * (end - start)
+    targets = np.broadcast_to(np.asarray(target, dtype=float),
+                              locations.shape).copy()
+    return CameraPath(_frames(n_frames, frame_start), locations, targets)
+
+
+def dolly_in(lattice, n_frames, start_distance=1.4, end_distance=0.35,
+             elevation=math.radians(50), margin=100, frame_start=1):
+    """Push in from an overview onto the chip centre along a fixed bearing."""
+    center, span = chip_bounds(lattice, margin)
+    bearing = np.array([0.0, -math.cos(elevation), math.sin(elevation)])
+    return dolly(center + bearing * start_distance * span,
+                 center + bearing * end_distance * span,
+                 center, n_frames, frame_start=frame_start)
+
+
+# ── fly-along-lattice ───────────────────────────────────────────────────
+
+def _along(points, u):
+    """Points at arc lengths *u* along polyline *points* (clamped)."""
+    seg = np.linalg.norm(np.diff(points, axis=0), axis=1)
+    s = np.concatenate([[0.0], np.cumsum(seg)])
+    return np.stack([np.interp(u, s, points[:, k]) for k in range(3)], axis=1)
+
+
+def lattice_flyover(lattice, n_frames, height=None, look_ahead=None,
+                    margin=100, frame_start=1):
+    """Serpentine flight over every row of qubit sites.
+
+    The camera flies along row 0, turns onto row 1 in the opposite
+    direction, and so on, at constant speed.  It looks *look_ahead* along
+    the path at the substrate, so turns are anticipated.  *height* and
+    *look_ahead* default to one and two lattice pitches.
+    """
+    s = GLOBAL_SCALE
+    pitch = lattice.cfg.pitch * s
+    height = pitch if height is None else height
+    look_ahead = 2 * pitch if look_ahead is None else look_ahead
+
+    sites = lattice.site_positions
+    rows, cols = lattice.cfg.rows, lattice.cfg.cols
+    waypoints = []
+    for r in range(rows):
+        order = range(cols) if r % 2 == 0 else range(cols - 1, -1, -1)
+        waypoints.extend(sites[(r, c)] for c in order)
+    xy = np.asarray(waypoints, dtype=float) * s
+    if len(xy) == 1:
+        xy = np.vstack([xy - [pitch / 2, 0], xy + [pitch / 2, 0]])
+    # Lead-in/out of *margin* beyond the outer sites
+    lead = margin * s
+    first_dir = xy[1] - xy[0]
+    last_dir = xy[-1] - xy[-2]
+    xy = np.vstack([xy[0] - lead * first_dir / np.linalg.norm(first_dir), xy,
+                    xy[-1] + lead * last_dir / np.linalg.norm(last_dir)])
+    ground = np.column_stack([xy, np.zeros(len(xy))])
+
+    total = np.linalg.norm(np.diff(ground, axis=0), axis=1).sum()
+    u = np.linspace(0.0, total, n_frames)
+    locations = _along(ground, u) + [0.0, 0.0, height]
+    # Targets run past the end along the exit direction, never under the camera
+    exit_dir = np.append(last_dir / np.linalg.norm(last_dir), 0.0)
+    ahead = np.vstack([ground, ground[-1] + look_ahead * exit_dir])
+    targets = _along(ahead, u + look_ahead)
+    return CameraPath(_frames(n_frames, frame_start), locations, targets)
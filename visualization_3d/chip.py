@@ -0,0 +1,92 @@
+"""
+Full-chip scene builder.
+
+Reads the 2D lattice layout from ``visualization.lattice.SquareLattice``
+and produces a backend-neutral :class:`~visualization_3d.scene.Scene`
+with one prototype per component variant and one instance per lattice
+site / edge.  Pure NumPy — no ``bpy`` needed.
+"""
+
+import math
+
+from visualization import instrument
+from visualization.lattice import SquareLattice
+from .components import Fluxonium3D, Coupler3D
+from .scene import Scene, digest
+
+
+class ChipBuilder:
+    """Build the scene description for a full chip lattice."""
+
+    def __init__(self, lattice: SquareLattice):
+        self.lattice = lattice
+        self.fluxonium_3d = Fluxonium3D(lattice.fluxonium_dims)
+        self.coupler_3d = Coupler3D(lattice.coupler_dims)
+
+    def build(self, instanced=True) -> Scene:
+        """Return the chip scene.
+
+        With *instanced* the data qubits and couplers are prototypes plus
+        instancing records; otherwise every instance is expanded into
+        plain objects.
+        """
+        scene = Scene()
+        with instrument.stage("build"):
+            with instrument.stage("data_qubits"):
+                self._add_data_qubits(scene)
+            with instrument.stage("couplers"):
+                self._add_couplers(scene)
+            with instrument.stage("substrate"):
+                self._add_substrate(scene)
+            if not instanced:
+                with instrument.stage("flatten"):
+                    scene = scene.flatten()
+        if instrument.active():
+            for key, value in scene.stats().items():
+                instrument.count(f"scene.{key}", value)
+        return scene
+
+    @staticmethod
+    def _scene_counter(scene):
+        return lambda: {"objects": len(scene.objects), "meshes": len(scene.meshes)}
+
+    def _add_data_qubits(self, scene):
+        proto = scene.prototype(
+            "Fluxonium3D", digest("Fluxonium3D", self.fluxonium_3d.dims))
+        if not proto.objects:
+            with instrument.component("Fluxonium3D", self._scene_counter(proto)):
+                self.fluxonium_3d.place((0, 0, 0), 0, name_prefix="", scene=proto)
+        for idx, ((r, c), pos) in enumerate(
+            sorted(self.lattice.site_positions.items())
+        ):
+            scene.add_instance(f"D{idx}", "Fluxonium3D", (pos[0], pos[1], 0))
+
+    def _add_couplers(self, scene):
+        for idx, (edge_key, edge_info) in enumerate(
+            sorted(self.lattice.edge_positions.items())
+        ):
+            pos = edge_info["xy"]
+            direction = edge_info["direction"]
+            angle = 0 if direction == "horizontal" else 90
+            mirror = self.lattice._mirror_for_edge(edge_key, direction)
+
+            key = "Coupler3D_mirror" if mirror else "Coupler3D"
+            proto = scene.prototype(
+                key, digest(key, self.coupler_3d.dims, mirror))
+            if not proto.objects:
+                with instrument.component("Coupler3D", self._scene_counter(proto)):
+                    self.coupler_3d.place((0, 0, 0), 0, mirror=mirror,
+                                          name_prefix="", scene=proto)
+            scene.add_instance(f"C{idx}", key, (pos[0], pos[1], 0),
+                               rotation_z=math.radians(angle))
+
+    def _add_substrate(self, scene):
+        (xmin, xmax), (ymin, ymax) = self.lattice.auto_lims(margin=200)
+        cx = (xmin + xmax) / 2
+        cy = (ymin + ymax) / 2
+        w = (xmax - xmin) * 5
+        ht = (ymax - ymin) * 5
+
+        # Flat plane slightly below z=0 to avoid z-fighting with object bottoms
+        scene.add_plane((cx, cy, -0.05), (w / 2, ht / 2), name="Substrate",
+                        material="substrate")
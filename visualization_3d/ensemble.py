@@ -0,0 +1,103 @@
+"""
+Per-instance transforms for Bloch-sphere ensembles.
+
+An ensemble of N state vectors is described by NumPy arrays (unit
+directions, lengths, thicknesses, precession velocities); this module
+turns them into instance records — location, XYZ Euler rotation and
+scale — for the unit ``geometry.arrow_mesh``.  ``bloch.BlochSphere``
+writes the records as point attributes of one instancing object, so the
+ensemble size no longer costs one Blender object per arrow.  No ``bpy``
+needed.
+"""
+
+import math
+
+import numpy as np
+
+
+def directions_from_angles(theta, phi):
+    """Unit vectors ``(..., 3)`` from polar angle *theta* and azimuth *phi*.
+
+    The angle arrays broadcast, e.g. ``(N, 1)`` against ``(N, F)`` tracks.
+    """
+    theta, phi = np.broadcast_arrays(np.asarray(theta, dtype=float),
+                                     np.asarray(phi, dtype=float))
+    st = np.sin(theta)
+    return np.stack([st * np.cos(phi), st * np.sin(phi), np.cos(theta)], axis=-1)
+
+
+def align_z_euler(directions):
+    """XYZ Euler angles ``(N, 3)`` rotating +Z onto each direction.
+
+    ``R = Rz(φ) · Ry(θ)``, i.e. Euler ``(0, θ, φ)``.  Zero vectors map to
+    the identity.
+    """
+    d = np.asarray(directions, dtype=float)
+    r = np.linalg.norm(d, axis=-1)
+    safe = np.where(r > 0, r, 1.0)
+    theta = np.arccos(np.clip(d[..., 2] / safe, -1.0, 1.0))
+    phi = np.arctan2(d[..., 1], d[..., 0])
+    out = np.zeros(d.shape)
+    out[..., 1] = np.where(r > 0, theta, 0.0)
+    out[..., 2] = np.where(r > 0, phi, 0.0)
+    return out
+
+
+def azimuthal_tangents(directions):
+    """Unit ``ê_φ`` tangents ``(N, 3)`` — the precession direction about Z.
+
+    Falls back to +X on the poles.
+    """
+    d = np.asarray(directions, dtype=float)
+    t = np.stack([-d[..., 1], d[..., 0], np.zeros(d.shape[:-1])], axis=-1)
+    n = np.linalg.norm(t, axis=-1, keepdims=True)
+    pole = n[..., 0] < 1e-12
+    t[pole] = (1.0, 0.0, 0.0)
+    n[pole] = 1.0
+    return t / n
+
+
+def arrow_instances(directions, lengths=1.0, thickness=0.03, origin=(0, 0, 0)):
+    """Instance records for arrows from *origin* along *directions*.
+
+    Returns ``(locations, rotations, scales)``, each ``(N, 3)``; scale is
+    ``(thickness, thickness, length)`` for the unit arrow mesh.
+    """
+    d = np.asarray(directions, dtype=float)
+    n = len(d)
+    scales = np.empty((n, 3))
+    scales[:, 0] = scales[:, 1] = np.broadcast_to(thickness, n)
+    scales[:, 2] = np.broadcast_to(lengths, n)
+    locations = np.broadcast_to(np.asarray(origin, dtype=float), (n, 3)).copy()
+    return locations, align_z_euler(d), scales
+
+
+def velocity_instances(directions, lengths, velocities, thickness=0.03,
+                       length_scale=0.5):
+    """Tangential "velocity" arrows sitting on the tips of the main arrows.
+
+    Arrow *i* starts at ``lengths[i] · directions[i]``, points along
+    ``sign(vᵢ) · ê_φ`` and is ``|vᵢ| · length_scale`` long with half the
+    main-arrow thickness (the red arrows of the old dephasing scenes).
+    """
+    d = np.asarray(directions, dtype=float)
+    n = len(d)
+    v = np.broadcast_to(np.asarray(velocities, dtype=float), n)
+    tips = d * np.broadcast_to(lengths, n)[:, None]
+    tangents = azimuthal_tangents(d) * np.where(v < 0, -1.0, 1.0)[:, None]
+    _, rotations, scales = arrow_instances(
+        tangents, np.abs(v) * length_scale, np.broadcast_to(thickness, n) * 0.5)
+    return tips, rotations, scales
+
+
+def sphere_subdivisions(screen_radius_px, max_error_px=0.5, lo=4, hi=128):
+    """Cube-sphere resolution *n* for a sphere drawn *screen_radius_px* wide.
+
+    Picks the smallest ``n`` whose chord error ``R · (1 − cos(π / 4n))``
+    stays under *max_error_px*, clamped to ``[lo, hi]``.  A 500 px sphere
+    needs n ≈ 18 (≈ 2 k quads) instead of the 32 k of a 256×128 UV sphere.
+    """
+    ratio = min(max_error_px / max(screen_radius_px, 1e-9), 1.0)
+    cell = 2 * math.acos(1 - ratio)           # max arc per cell
+    n = math.ceil(math.pi / (2 * cell)) if cell > 0 else hi
+    return int(min(max(n, lo), hi))
@@ -0,0 +1,1745 @@
+"""
+Recording stand-in for ``bpy`` / ``bmesh`` / ``mathutils``.
+
+Implements the subset of the Blender Python API used by
+``primitives``, ``bpy_backend`` and ``renderer`` (data-block
+collections, mesh buffers with ``add``/``foreach_set``, objects,
+collections, parenting, node trees, the handful of operators the
+modules call) so the 3D pipeline runs in plain CPython::
+
+    from visualization_3d import fake_bpy
+    fake_bpy.install()                      # registers sys.modules["bpy"] …
+
+    from visualization_3d.renderer import BlenderRenderer
+    BlenderRenderer(lattice).render()
+    fake_bpy.stats()    # {'objects': 2153, 'meshes': 9, 'vertices': …}
+
+Everything is kept in memory: mesh buffers are NumPy arrays, so tests can
+read back vertices and faces.  Every operator call (``bpy.ops.*``), bulk
+buffer write and ``frame_set`` is counted in :data:`calls`.  Rendering
+operators write 1×1 placeholder PNGs where Blender would write images, so
+scripts that check for output files also run.
+
+The stand-in does not evaluate anything: modifiers, constraints and
+geometry-node groups are stored but never applied, there are no drivers
+or depsgraph (``frame_set`` runs the ``frame_change`` handlers but does
+not apply F-curves), and element proxies (``mesh.vertices[i]``) are
+read/write views of single rows.  Actions keep F-curve keys as NumPy
+arrays; ``FCurve.evaluate`` interpolates linearly.
+
+``python -m visualization_3d.fake_bpy`` mimics Blender's command line
+(``-b``, ``--python``, ``-o``, ``-F``, ``-s``/``-e``/``-j``, ``-f``,
+``-a``): scripts run against the stand-in and rendered frames become
+placeholder PNGs, so process-level drivers (``batch``, ``shard``) can be
+exercised without Blender.
+"""
+
+import os
+import struct
+import sys
+import types
+import zlib
+from collections import Counter
+
+import numpy as np
+
+
+#: Call counts, e.g. ``calls["ops.mesh.primitive_cube_add"]``
+calls: Counter = Counter()
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+#  mathutils
+# ═══════════════════════════════════════════════════════════════════════════
+
+class Vector:
+    """Minimal ``mathutils.Vector`` (component access and arithmetic)."""
+
+    __slots__ = ("_v",)
+
+    def __init__(self, seq=(0.0, 0.0, 0.0)):
+        self._v = [float(x) for x in seq]
+
+    def __len__(self):
+        return len(self._v)
+
+    def __iter__(self):
+        return iter(self._v)
+
+    def __getitem__(self, i):
+        return self._v[i]
+
+    def __setitem__(self, i, value):
+        self._v[i] = float(value)
+
+    def __eq__(self, other):
+        try:
+            return self._v == [float(x) for x in other]
+        except TypeError:
+            return NotImplemented
+
+    def __repr__(self):
+        return f"Vector(({', '.join(f'{x:.4f}' for x in self._v)}))"
+
+    def _axis(i):
+        return property(lambda self: self._v[i],
+                        lambda self, value: self.__setitem__(i, value))
+
+    x, y, z, w = _axis(0), _axis(1), _axis(2), _axis(3)
+    del _axis
+
+    def __add__(self, other):
+        return Vector(a + b for a, b in zip(self._v, other))
+
+    def __sub__(self, other):
+        return Vector(a - b for a, b in zip(self._v, other))
+
+    def __mul__(self, s):
+        return Vector(a * s for a in self._v)
+
+    __rmul__ = __mul__
+
+    def __truediv__(self, s):
+        return Vector(a / s for a in self._v)
+
+    def __neg__(self):
+        return Vector(-a for a in self._v)
+
+    def dot(self, other):
+        return sum(a * b for a, b in zip(self._v, other))
+
+    def cross(self, other):
+        ax, ay, az = self._v
+        bx, by, bz = other
+        return Vector((ay * bz - az * by, az * bx - ax * bz, ax * by - ay * bx))
+
+    @property
+    def length(self):
+        return float(np.sqrt(self.dot(self._v)))
+
+    def normalized(self):
+        n = self.length
+        return Vector(self._v) if n == 0 else self / n
+
+    def copy(self):
+        return Vector(self._v)
+
+    def to_tuple(self):
+        return tuple(self._v)
+
+
+Euler = Vector
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+#  ID data-blocks
+# ═══════════════════════════════════════════════════════════════════════════
+
+class ID:
+    """Base data-block: unique name, user count and custom properties."""
+
+    _registry = None    # owning BlendDataCollection
+
+    def __init__(self, name):
+        self._name = name
+        self._users = 0
+        self._props = {}
+        self.animation_data = None
+
+    @property
+    def name(self):
+        return self._name
+
+    @name.setter
+    def name(self, value):
+        if self._registry is not None:
+            self._registry._rename(self, value)
+        else:
+            self._name = value
+
+    @property
+    def users(self):
+        return self._users
+
+    # custom properties: obj["key"]
+    def __getitem__(self, key):
+        return self._props[key]
+
+    def __setitem__(self, key, value):
+        self._props[key] = value
+
+    def __delitem__(self, key):
+        del self._props[key]
+
+    def __contains__(self, key):
+        return key in self._props
+
+    def get(self, key, default=None):
+        return self._props.get(key, default)
+
+    def keys(self):
+        return self._props.keys()
+
+    def animation_data_create(self):
+        if self.animation_data is None:
+            self.animation_data = AnimData()
+        return self.animation_data
+
+    def animation_data_clear(self):
+        self.animation_data = None
+
+    def keyframe_insert(self, data_path, index=-1, frame=None, group=""):
+        """Per-key insert (the slow path the bulk writer replaces)."""
+        calls["keyframe_insert"] += 1
+        scene = bpy.context.scene
+        frame = scene.frame_current if frame is None else frame
+        value = _resolve(self, data_path)
+        values = list(value) if hasattr(value, "__len__") else [value]
+        indices = range(len(values)) if index == -1 else [index]
+        action = self.animation_data_create().action
+        if action is None:
+            action = self.animation_data.action = bpy.data.actions.new(
+                f"{self.name}Action")
+        for i in indices:
+            fc = action.fcurves.find(data_path, index=i) or \
+                action.fcurves.new(data_path, index=i)
+            fc.keyframe_points.insert(frame, values[i])
+        return True
+
+    def _on_remove(self):
+        pass
+
+    def __repr__(self):
+        return f"<{type(self).__name__} {self._name!r}>"
+
+
+def _resolve(block, data_path):
+    value = block
+    for part in data_path.split("."):
+        value = getattr(value, part)
+    return value
+
+
+# ── animation ───────────────────────────────────────────────────────────────
+
+_INTERPOLATION = {"CONSTANT": 0, "LINEAR": 1, "BEZIER": 2}
+
+
+class KeyframePoints:
+    """``fcurve.keyframe_points``: ``co`` (frame, value) and interpolation."""
+
+    def __init__(self):
+        self._co = np.zeros((0, 2), dtype=np.float32)
+        self._interp = np.zeros(0, dtype=np.int32)
+
+    def add(self, count):
+        count = int(count)
+        self._co = np.concatenate([self._co, np.zeros((count, 2), np.float32)])
+        self._interp = np.concatenate(
+            [self._interp, np.full(count, _INTERPOLATION["BEZIER"], np.int32)])
+
+    def insert(self, frame, value):
+        self.add(1)
+        self._co[-1] = (frame, value)
+
+    def clear(self):
+        self._co = self._co[:0]
+        self._interp = self._interp[:0]
+
+    def _target(self, attr):
+        if attr == "co":
+            return self._co
+        if attr == "interpolation":
+            return self._interp
+        raise AttributeError(attr)
+
+    def foreach_set(self, attr, seq):
+        calls["foreach_set"] += 1
+        target = self._target(attr)
+        arr = np.asarray(seq, dtype=target.dtype)
+        if arr.size != target.size:
+            raise RuntimeError(
+                f"internal error setting the array: {attr!r} expects "
+                f"{target.size} items, got {arr.size}")
+        target[...] = arr.reshape(target.shape)
+
+    def foreach_get(self, attr, seq):
+        calls["foreach_get"] += 1
+        seq[...] = self._target(attr).reshape(np.shape(seq))
+
+    def __len__(self):
+        return len(self._co)
+
+
+class FCurve:
+    def __init__(self, data_path, index=0, action_group=""):
+        self.data_path = data_path
+        self.array_index = index
+        self.group = action_group
+        self.keyframe_points = KeyframePoints()
+
+    def update(self):
+        calls["fcurve.update"] += 1
+        kp = self.keyframe_points
+        order = np.argsort(kp._co[:, 0], kind="stable")
+        kp._co, kp._interp = kp._co[order], kp._interp[order]
+
+    def evaluate(self, frame):
+        """Value at *frame* (linear between keys; CONSTANT keys hold)."""
+        co = self.keyframe_points._co
+        if not len(co):
+            return 0.0
+        i = np.searchsorted(co[:, 0], frame, side="right") - 1
+        if 0 <= i < len(co) - 1 and \
+                self.keyframe_points._interp[i] == _INTERPOLATION["CONSTANT"]:
+            return float(co[i, 1])
+        return float(np.interp(frame, co[:, 0], co[:, 1]))
+
+
+class ActionFCurves:
+    def __init__(self):
+        self._curves = {}
+
+    def new(self, data_path, index=0, action_group=""):
+        key = (data_path, index)
+        if key in self._curves:
+            raise RuntimeError(f"F-Curve {data_path!r}[{index}] already exists")
+        fc = self._curves[key] = FCurve(data_path, index, action_group)
+        return fc
+
+    def find(self, data_path, index=0):
+        return self._curves.get((data_path, index))
+
+    def remove(self, fcurve):
+        del self._curves[(fcurve.data_path, fcurve.array_index)]
+
+    def __iter__(self):
+        return iter(list(self._curves.values()))
+
+    def __len__(self):
+        return len(self._curves)
+
+
+class Action(ID):
+    def __init__(self, name):
+        super().__init__(name)
+        self.fcurves = ActionFCurves()
+
+    @property
+    def frame_range(self):
+        frames = [fc.keyframe_points._co[:, 0] for fc in self.fcurves
+                  if len(fc.keyframe_points)]
+        if not frames:
+            return (0.0, 0.0)
+        allf = np.concatenate(frames)
+        return (float(allf.min()), float(allf.max()))
+
+
+class AnimData:
+    def __init__(self):
+        self._action = None
+
+    @property
+    def action(self):
+        return self._action
+
+    @action.setter
+    def action(self, value):
+        if self._action is not None:
+            self._action._users -= 1
+        self._action = value
+        if value is not None:
+            value._users += 1
+
+
+class BlendDataCollection:
+    """``bpy.data.<kind>``: name-unique, ordered collection of data-blocks."""
+
+    def __init__(self, cls):
+        self._cls = cls
+        self._items = {}
+
+    def _unique(self, name):
+        if name not in self._items:
+            return name
+        base, i = name, 1
+        while f"{base}.{i:03d}" in self._items:
+            i += 1
+        return f"{base}.{i:03d}"
+
+    def _rename(self, block, name):
+        if name == block._name:
+            return
+        del self._items[block._name]
+        block._name = self._unique(name)
+        self._items[block._name] = block
+
+    def new(self, name, *args, **kwargs):
+        block = self._cls(self._unique(name), *args, **kwargs)
+        block._registry = self
+        self._items[block._name] = block
+        return block
+
+    def get(self, name, default=None):
+        return self._items.get(name, default)
+
+    def remove(self, block, do_unlink=True):
+        block._on_remove()
+        del self._items[block._name]
+        block._registry = None
+
+    def __getitem__(self, key):
+        if isinstance(key, int):
+            return list(self._items.values())[key]
+        return self._items[key]
+
+    def __contains__(self, name):
+        return name in self._items
+
+    def __iter__(self):
+        return iter(list(self._items.values()))
+
+    def __len__(self):
+        return len(self._items)
+
+    def keys(self):
+        return self._items.keys()
+
+    def values(self):
+        return list(self._items.values())
+
+
+# ── node trees ──────────────────────────────────────────────────────────────
+
+class Socket:
+    def __init__(self, node, name):
+        self.node = node
+        self.name = name
+        self.default_value = 0.0
+        self.links = []
+
+    @property
+    def is_linked(self):
+        return bool(self.links)
+
+
+class Sockets:
+    """Node inputs/outputs; generic nodes grow sockets on first access."""
+
+    def __init__(self, node, names=None):
+        self._node = node
+        self._fixed = names is not None
+        self._list = [Socket(node, n) for n in (names or ())]
+        self._by_name = {s.name: s for s in self._list}
+
+    def __getitem__(self, key):
+        if isinstance(key, int):
+            while key >= len(self._list):
+                if self._fixed:
+                    raise IndexError(key)
+                self._add(f"Socket_{len(self._list)}")
+            return self._list[key]
+        sock = self._by_name.get(key)
+        if sock is None:
+            if self._fixed:
+                raise KeyError(key)
+            sock = self._add(key)
+        return sock
+
+    def _add(self, name):
+        sock = Socket(self._node, name)
+        self._list.append(sock)
+        self._by_name[name] = sock
+        return sock
+
+    def __contains__(self, name):
+        return name in self._by_name
+
+    def __iter__(self):
+        return iter(self._list)
+
+    def __len__(self):
+        return len(self._list)
+
+
+_PRINCIPLED_INPUTS = (
+    "Base Color", "Metallic", "Roughness", "IOR", "Alpha", "Normal",
+    "Weight", "Subsurface Weight", "Subsurface Radius", "Specular IOR Level",
+    "Specular Tint", "Anisotropic", "Tangent", "Transmission Weight",
+    "Coat Weight", "Coat Roughness", "Coat Normal", "Sheen Weight",
+    "Emission Color", "Emission Strength",
+)
+
+
+class ColorRampElement:
+    def __init__(self, position, color):
+        self.position = position
+        self.color = color
+
+
+class ColorRamp:
+    def __init__(self):
+        self.interpolation = "LINEAR"
+        self.elements = _RampElements([ColorRampElement(0.0, (0, 0, 0, 1)),
+                                       ColorRampElement(1.0, (1, 1, 1, 1))])
+
+
+class _RampElements(list):
+    def new(self, position):
+        el = ColorRampElement(position, (0, 0, 0, 1))
+        self.append(el)
+        return el
+
+
+class Node:
+    def __init__(self, type, name, inputs=None, outputs=None):
+        self.type = type
+        self.bl_idname = type
+        self.name = name
+        self.label = ""
+        self.location = (0.0, 0.0)
+        self.inputs = Sockets(self, inputs)
+        self.outputs = Sockets(self, outputs)
+        if type == "ShaderNodeValToRGB":
+            self.color_ramp = ColorRamp()
+
+
+class Nodes:
+    def __init__(self):
+        self._nodes = {}
+
+    def new(self, type):
+        calls["nodes.new"] += 1
+        base, name, i = type, type, 1
+        while name in self._nodes:
+            name = f"{base}.{i:03d}"
+            i += 1
+        node = Node(type, name)
+        self._nodes[name] = node
+        return node
+
+    def _add(self, node):
+        self._nodes[node.name] = node
+        return node
+
+    def get(self, name, default=None):
+        return self._nodes.get(name, default)
+
+    def remove(self, node):
+        self._nodes.pop(node.name, None)
+
+    def clear(self):
+        self._nodes.clear()
+
+    def __getitem__(self, name):
+        return self._nodes[name]
+
+    def __iter__(self):
+        return iter(list(self._nodes.values()))
+
+    def __len__(self):
+        return len(self._nodes)
+
+
+class Link:
+    def __init__(self, from_socket, to_socket):
+        self.from_socket = from_socket
+        self.to_socket = to_socket
+        self.from_node = from_socket.node
+        self.to_node = to_socket.node
+
+
+class Links(list):
+    def new(self, from_socket, to_socket):
+        link = Link(from_socket, to_socket)
+        from_socket.links.append(link)
+        to_socket.links.append(link)
+        self.append(link)
+        return link
+
+
+class NodeTree:
+    def __init__(self):
+        self.nodes = Nodes()
+        self.links = Links()
+
+
+class InterfaceSocket:
+    def __init__(self, name, in_out, socket_type):
+        self.name = name
+        self.in_out = in_out
+        self.socket_type = socket_type
+        self.default_value = 0.0
+
+
+class NodeTreeInterface:
+    """``node_group.interface`` (Blender ≥ 4.0)."""
+
+    def __init__(self):
+        self.items_tree = []
+
+    def new_socket(self, name, in_out="INPUT", socket_type="NodeSocketFloat"):
+        sock = InterfaceSocket(name, in_out, socket_type)
+        self.items_tree.append(sock)
+        return sock
+
+
+class _GroupSockets(list):
+    """``node_group.inputs`` / ``outputs`` (Blender < 4.0)."""
+
+    def __init__(self, in_out):
+        super().__init__()
+        self._in_out = in_out
+
+    def new(self, type, name):
+        sock = InterfaceSocket(name, self._in_out, type)
+        self.append(sock)
+        return sock
+
+
+class NodeGroup(ID):
+    """``bpy.data.node_groups`` entry, e.g. a geometry-nodes tree."""
+
+    def __init__(self, name, type="GeometryNodeTree"):
+        super().__init__(name)
+        self.bl_idname = type
+        self.nodes = Nodes()
+        self.links = Links()
+        if bpy.app.version >= (4, 0, 0):
+            self.interface = NodeTreeInterface()
+        else:
+            self.inputs = _GroupSockets("INPUT")
+            self.outputs = _GroupSockets("OUTPUT")
+
+
+class _NodeOwner(ID):
+    """Material / World: creates the default node tree on ``use_nodes``."""
+
+    def __init__(self, name):
+        super().__init__(name)
+        self.node_tree = None
+        self._use_nodes = False
+
+    @property
+    def use_nodes(self):
+        return self._use_nodes
+
+    @use_nodes.setter
+    def use_nodes(self, value):
+        self._use_nodes = bool(value)
+        if value and self.node_tree is None:
+            self.node_tree = NodeTree()
+            self._default_nodes(self.node_tree)
+
+    def _default_nodes(self, tree):
+        pass
+
+
+class Material(_NodeOwner):
+    def __init__(self, name):
+        super().__init__(name)
+        self.diffuse_color = (0.8, 0.8, 0.8, 1.0)
+        self.blend_method = "OPAQUE"
+        self.shadow_method = "OPAQUE"
+
+    def _default_nodes(self, tree):
+        bsdf = tree.nodes._add(Node("ShaderNodeBsdfPrincipled", "Principled BSDF",
+                                    _PRINCIPLED_INPUTS, ("BSDF",)))
+        out = tree.nodes._add(Node("ShaderNodeOutputMaterial", "Material Output",
+                                   ("Surface", "Volume", "Displacement"), ()))
+        tree.links.new(bsdf.outputs["BSDF"], out.inputs["Surface"])
+
+
+class World(_NodeOwner):
+    def _default_nodes(self, tree):
+        bg = tree.nodes._add(Node("ShaderNodeBackground", "Background",
+                                  ("Color", "Strength", "Weight"), ("Background",)))
+        out = tree.nodes._add(Node("ShaderNodeOutputWorld", "World Output",
+                                   ("Surface", "Volume"), ()))
+        tree.links.new(bg.outputs["Background"], out.inputs["Surface"])
+
+
+# ── meshes ──────────────────────────────────────────────────────────────────
+
+# attribute → (width, dtype) per element domain
+_VERTEX_ATTRS = {"co": (3, np.float32), "normal": (3, np.float32),
+                 "select": (1, np.bool_), "hide": (1, np.bool_)}
+_EDGE_ATTRS = {"vertices": (2, np.int32), "select": (1, np.bool_)}
+_LOOP_ATTRS = {"vertex_index": (1, np.int32), "edge_index": (1, np.int32)}
+_POLY_ATTRS = {"loop_start": (1, np.int32), "loop_total": (1, np.int32),
+               "material_index": (1, np.int32), "use_smooth": (1, np.bool_),
+               "select": (1, np.bool_)}
+
+
+class Element:
+    """Read/write view of one row of a mesh element domain."""
+
+    __slots__ = ("_owner", "index")
+
+    def __init__(self, owner, index):
+        object.__setattr__(self, "_owner", owner)
+        object.__setattr__(self, "index", index)
+
+    def __getattr__(self, attr):
+        row = self._owner._column(attr)[self.index]
+        if attr == "co":
+            return Vector(row)
+        return row.item() if row.size == 1 else tuple(row.tolist())
+
+    def __setattr__(self, attr, value):
+        self._owner._column(attr)[self.index] = np.asarray(value).reshape(-1)
+
+
+class MeshElements:
+    """``mesh.vertices`` / ``edges`` / ``loops`` / ``polygons``."""
+
+    def __init__(self, attrs):
+        self._attrs = attrs
+        self._data = {}
+        self._n = 0
+
+    def _column(self, attr):
+        if attr not in self._attrs:
+            raise AttributeError(attr)
+        col = self._data.get(attr)
+        if col is None:
+            width, dtype = self._attrs[attr]
+            col = self._data[attr] = np.zeros((self._n, width), dtype=dtype)
+        return col
+
+    def add(self, count):
+        count = int(count)
+        for attr, col in self._data.items():
+            self._data[attr] = np.concatenate(
+                [col, np.zeros((count, col.shape[1]), dtype=col.dtype)])
+        self._n += count
+
+    def foreach_set(self, attr, seq):
+        calls["foreach_set"] += 1
+        width, dtype = self._attrs[attr]
+        arr = np.asarray(seq, dtype=dtype)
+        if arr.size != self._n * width:
+            raise RuntimeError(
+                f"internal error setting the array: {attr!r} expects "
+                f"{self._n * width} items, got {arr.size}")
+        self._data[attr] = arr.reshape(self._n, width).copy()
+
+    def foreach_get(self, attr, seq):
+        calls["foreach_get"] += 1
+        src = self._column(attr).ravel()
+        if isinstance(seq, np.ndarray):
+            seq[...] = src.reshape(seq.shape)
+        else:
+            seq[:] = src.tolist()
+
+    def __len__(self):
+        return self._n
+
+    def __getitem__(self, i):
+        if not -self._n <= i < self._n:
+            raise IndexError(i)
+        return Element(self, i % self._n)
+
+    def __iter__(self):
+        return (Element(self, i) for i in range(self._n))
+
+
+class AttributeData:
+    """``attribute.data``: one typed column, bulk access only."""
+
+    def __init__(self, owner, width, dtype):
+        self._owner = owner
+        self._width = width
+        self._dtype = dtype
+        self._array = np.zeros((owner._n, width), dtype=dtype)
+
+    def _sync(self):
+        if len(self._array) != self._owner._n:
+            self._array = np.resize(self._array, (self._owner._n, self._width))
+
+    def foreach_set(self, attr, seq):
+        calls["foreach_set"] += 1
+        self._sync()
+        arr = np.asarray(seq, dtype=self._dtype)
+        if arr.size != self._array.size:
+            raise RuntimeError(
+                f"internal error setting the array: {attr!r} expects "
+                f"{self._array.size} items, got {arr.size}")
+        self._array = arr.reshape(self._array.shape).copy()
+
+    def foreach_get(self, attr, seq):
+        calls["foreach_get"] += 1
+        self._sync()
+        seq[...] = self._array.reshape(seq.shape)
+
+    def __len__(self):
+        self._sync()
+        return len(self._array)
+
+
+# attribute data_type → (width, dtype)
+_ATTRIBUTE_TYPES = {
+    "FLOAT": (1, np.float32), "INT": (1, np.int32), "BOOLEAN": (1, np.bool_),
+    "FLOAT_VECTOR": (3, np.float32), "FLOAT_COLOR": (4, np.float32),
+    "QUATERNION": (4, np.float32),
+}
+
+
+class Attribute:
+    def __init__(self, name, data_type, domain, owner):
+        self.name = name
+        self.data_type = data_type
+        self.domain = domain
+        width, dtype = _ATTRIBUTE_TYPES[data_type]
+        self.data = AttributeData(owner, width, dtype)
+
+
+class MeshAttributes:
+    """``mesh.attributes`` for generic (named) attributes."""
+
+    def __init__(self, mesh):
+        self._mesh = mesh
+        self._items = {}
+
+    def new(self, name, type, domain):
+        owner = {"POINT": self._mesh.vertices, "EDGE": self._mesh.edges,
+                 "CORNER": self._mesh.loops, "FACE": self._mesh.polygons}[domain]
+        attr = self._items[name] = Attribute(name, type, domain, owner)
+        return attr
+
+    def get(self, name, default=None):
+        return self._items.get(name, default)
+
+    def remove(self, attr):
+        del self._items[attr.name]
+
+    def __getitem__(self, name):
+        return self._items[name]
+
+    def __contains__(self, name):
+        return name in self._items
+
+    def __iter__(self):
+        return iter(list(self._items.values()))
+
+    def __len__(self):
+        return len(self._items)
+
+
+class IDMaterials(list):
+    """``mesh.materials``: material slots that count as material users."""
+
+    def append(self, mat):
+        if mat is not None:
+            mat._users += 1
+        super().append(mat)
+
+    def clear(self):
+        for mat in self:
+            if mat is not None:
+                mat._users -= 1
+        super().clear()
+
+    def pop(self, index=-1):
+        mat = super().pop(index)
+        if mat is not None:
+            mat._users -= 1
+        return mat
+
+
+class Mesh(ID):
+    def __init__(self, name):
+        super().__init__(name)
+        self.vertices = MeshElements(_VERTEX_ATTRS)
+        self.edges = MeshElements(_EDGE_ATTRS)
+        self.loops = MeshElements(_LOOP_ATTRS)
+        self.polygons = MeshElements(_POLY_ATTRS)
+        self.attributes = MeshAttributes(self)
+        self.materials = IDMaterials()
+
+    def from_pydata(self, vertices, edges, faces):
+        calls["mesh.from_pydata"] += 1
+        verts = np.asarray(vertices, dtype=np.float32).reshape(-1, 3)
+        self.vertices.add(len(verts))
+        self.vertices.foreach_set("co", verts.ravel())
+        if len(edges):
+            e = np.asarray(edges, dtype=np.int32).reshape(-1, 2)
+            self.edges.add(len(e))
+            self.edges.foreach_set("vertices", e.ravel())
+        sizes = np.array([len(f) for f in faces], dtype=np.int32)
+        flat = (np.concatenate([np.asarray(f, dtype=np.int32) for f in faces])
+                if len(faces) else np.zeros(0, np.int32))
+        self.loops.add(len(flat))
+        self.loops.foreach_set("vertex_index", flat)
+        self.polygons.add(len(sizes))
+        self.polygons.foreach_set("loop_start", np.cumsum(sizes) - sizes)
+        self.polygons.foreach_set("loop_total", sizes)
+
+    def update(self, calc_edges=False):
+        calls["mesh.update"] += 1
+        n = len(self.polygons)
+        if n:
+            starts = self.polygons._column("loop_start").ravel()
+            ends = np.append(starts[1:], len(self.loops))
+            self.polygons._data["loop_total"] = (ends - starts).reshape(n, 1).astype(np.int32)
+
+    def validate(self, verbose=False):
+        """Return True if the mesh had invalid indices (Blender's convention)."""
+        idx = self.loops._column("vertex_index")
+        return bool(idx.size and (idx.min() < 0 or idx.max() >= len(self.vertices)))
+
+    def transform(self, matrix):
+        co = self.vertices._column("co")
+        m = np.asarray(matrix, dtype=float)
+        co[:] = (co @ m[:3, :3].T + m[:3, 3]).astype(np.float32)
+
+    def _on_remove(self):
+        self.materials.clear()
+        for obj in list(bpy.data.objects):
+            if obj.data is self:
+                obj.data = None
+
+
+class Camera(ID):
+    def __init__(self, name):
+        super().__init__(name)
+        self.type = "PERSP"
+        self.lens = 50.0
+        self.clip_start = 0.1
+        self.clip_end = 1000.0
+        self.sensor_width = 36.0
+
+
+class Light(ID):
+    def __init__(self, name, type="POINT"):
+        super().__init__(name)
+        self.type = type
+        self.energy = 10.0
+        self.color = (1.0, 1.0, 1.0)
+        self.size = 0.25
+        self.use_nodes = False
+
+
+_SPLINE_POINT_ATTRS = {"co": (4, np.float32), "radius": (1, np.float32),
+                       "tilt": (1, np.float32)}
+
+
+class Spline:
+    def __init__(self, type):
+        self.type = type
+        self.points = MeshElements(_SPLINE_POINT_ATTRS)
+        self.points.add(1)                  # Blender starts with one point
+        self.use_cyclic_u = False
+        self.order_u = 4
+
+
+class Splines(list):
+    def new(self, type):
+        spline = Spline(type)
+        self.append(spline)
+        return spline
+
+
+class Curve(ID):
+    def __init__(self, name, type="CURVE"):
+        super().__init__(name)
+        self.type = type
+        self.dimensions = "3D"
+        self.bevel_depth = 0.0
+        self.splines = Splines()
+        self.use_path = True
+        self.path_duration = 100
+        self.eval_time = 0.0
+        self.materials = IDMaterials()
+
+    def _on_remove(self):
+        self.materials.clear()
+
+
+# ── objects and collections ─────────────────────────────────────────────────
+
+class Modifiers(list):
+    def new(self, name, type):
+        mod = types.SimpleNamespace(name=name, type=type, show_viewport=True,
+                                    show_render=True, node_group=None)
+        self.append(mod)
+        return mod
+
+
+# Default constraint names by type
+_CONSTRAINT_NAMES = {"FOLLOW_PATH": "Follow Path", "TRACK_TO": "Track To",
+                     "COPY_LOCATION": "Copy Location", "CHILD_OF": "Child Of"}
+
+
+class Constraints(list):
+    def new(self, type):
+        base = _CONSTRAINT_NAMES.get(type, type.title().replace("_", " "))
+        name, i = base, 1
+        while any(c.name == name for c in self):
+            name = f"{base}.{i:03d}"
+            i += 1
+        con = types.SimpleNamespace(name=name, type=type, target=None,
+                                    influence=1.0, mute=False)
+        self.append(con)
+        return con
+
+
+def _vector_property(attr):
+    return property(lambda self: getattr(self, attr),
+                    lambda self, value: setattr(self, attr, Vector(value)))
+
+
+class Object(ID):
+    def __init__(self, name, data=None):
+        super().__init__(name)
+        self._data = None
+        self._parent = None
+        self._children = []
+        self._collections = []
+        self._location = Vector((0, 0, 0))
+        self._rotation_euler = Vector((0, 0, 0))
+        self._rotation_quaternion = Vector((1, 0, 0, 0))
+        self._scale = Vector((1, 1, 1))
+        self.rotation_mode = "XYZ"
+        self.hide_viewport = False
+        self.hide_render = False
+        self.hide_select = False
+        self.empty_display_type = "PLAIN_AXES"
+        self.empty_display_size = 1.0
+        self.modifiers = Modifiers()
+        self.constraints = Constraints()
+        self.data = data
+
+    location = _vector_property("_location")
+    rotation_euler = _vector_property("_rotation_euler")
+    rotation_quaternion = _vector_property("_rotation_quaternion")
+    scale = _vector_property("_scale")
+
+    @property
+    def type(self):
+        if self._data is None:
+            return "EMPTY"
+        return _OBJECT_TYPES.get(type(self._data), "EMPTY")
+
+    @property
+    def data(self):
+        return self._data
+
+    @data.setter
+    def data(self, value):
+        if self._data is not None:
+            self._data._users -= 1
+        self._data = value
+        if value is not None:
+            value._users += 1
+
+    @property
+    def parent(self):
+        return self._parent
+
+    @parent.setter
+    def parent(self, value):
+        if self._parent is not None:
+            self._parent._children.remove(self)
+        self._parent = value
+        if value is not None:
+            value._children.append(self)
+
+    @property
+    def children(self):
+        return tuple(self._children)
+
+    @property
+    def users_collection(self):
+        return tuple(self._collections)
+
+    @property
+    def users(self):
+        return len(self._collections)
+
+    @property
+    def _selected(self):
+        return id(self) in bpy.context._selection
+
+    @_selected.setter
+    def _selected(self, state):
+        if state:
+            bpy.context._selection[id(self)] = self
+        else:
+            bpy.context._selection.pop(id(self), None)
+
+    def select_set(self, state):
+        self._selected = state
+
+    def select_get(self):
+        return self._selected
+
+    def hide_set(self, state):
+        self.hide_viewport = bool(state)
+
+    def _on_remove(self):
+        for coll in list(self._collections):
+            coll.objects.unlink(self)
+        for child in list(self._children):
+            child.parent = None
+        self.parent = None
+        self.data = None
+        self._selected = False
+        if bpy.context.object is self:
+            bpy.context.object = None
+
+
+_OBJECT_TYPES = {Mesh: "MESH", Camera: "CAMERA", Light: "LIGHT", Curve: "CURVE"}
+
+
+class CollectionObjects:
+    def __init__(self, owner):
+        self._owner = owner
+        self._objects = {}      # id(obj) → obj; names may change after linking
+
+    def link(self, obj):
+        if id(obj) in self._objects:
+            raise RuntimeError(f"Object {obj.name!r} already in collection "
+                               f"{self._owner.name!r}")
+        self._objects[id(obj)] = obj
+        obj._collections.append(self._owner)
+
+    def unlink(self, obj):
+        if self._objects.pop(id(obj), None) is not None:
+            obj._collections.remove(self._owner)
+
+    def get(self, name, default=None):
+        for obj in self._objects.values():
+            if obj.name == name:
+                return obj
+        return default
+
+    def __getitem__(self, name):
+        obj = self.get(name)
+        if obj is None:
+            raise KeyError(name)
+        return obj
+
+    def __contains__(self, obj):
+        if isinstance(obj, str):
+            return self.get(obj) is not None
+        return id(obj) in self._objects
+
+    def __iter__(self):
+        return iter(list(self._objects.values()))
+
+    def __len__(self):
+        return len(self._objects)
+
+
+class CollectionChildren:
+    def __init__(self, owner):
+        self._owner = owner
+        self._children = []
+
+    def link(self, coll):
+        if coll in self._children:
+            raise RuntimeError(f"Collection {coll.name!r} already linked")
+        self._children.append(coll)
+        coll._parents.append(self._owner)
+        coll._users += 1
+
+    def unlink(self, coll):
+        self._children.remove(coll)
+        coll._parents.remove(self._owner)
+        coll._users -= 1
+
+    def __iter__(self):
+        return iter(list(self._children))
+
+    def __len__(self):
+        return len(self._children)
+
+
+class Collection(ID):
+    def __init__(self, name):
+        super().__init__(name)
+        self.objects = CollectionObjects(self)
+        self.children = CollectionChildren(self)
+        self._parents = []
+        self.hide_viewport = False
+        self.hide_render = False
+
+    @property
+    def all_objects(self):
+        seen, out = set(), []
+        stack = [self]
+        while stack:
+            coll = stack.pop()
+            for obj in coll.objects:
+                if id(obj) not in seen:
+                    seen.add(id(obj))
+                    out.append(obj)
+            stack.extend(coll.children)
+        return out
+
+    def _on_remove(self):
+        for parent in list(self._parents):
+            parent.children.unlink(self)
+        for child in list(self.children):
+            self.children.unlink(child)
+        for obj in list(self.objects):
+            self.objects.unlink(obj)
+
+
+# ── scene / context ─────────────────────────────────────────────────────────
+
+class RenderSettings:
+    def __init__(self):
+        self.engine = "BLENDER_EEVEE_NEXT"
+        self.resolution_x = 1920
+        self.resolution_y = 1080
+        self.resolution_percentage = 100
+        self.fps = 24
+        self.filepath = "/tmp/"
+        self.film_transparent = False
+        self.use_persistent_data = False
+        self.use_file_extension = True
+        self.image_settings = types.SimpleNamespace(file_format="PNG",
+                                                    color_mode="RGBA")
+
+    def frame_path(self, frame=None):
+        """Blender's rule: the last run of ``#`` becomes the zero-padded
+        frame number, otherwise four digits are appended."""
+        frame = 0 if frame is None else frame
+        path = self.filepath
+        head, sep, tail = path.rpartition("#")
+        if sep:
+            width = len(head) - len(head.rstrip("#")) + 1
+            path = f"{head[:len(head) - width + 1]}{frame:0{width}d}{tail}"
+        else:
+            path = f"{path}{frame:04d}"
+        if self.use_file_extension and not path.lower().endswith(".png"):
+            path += ".png"
+        return path
+
+
+class Scene(ID):
+    def __init__(self, name):
+        super().__init__(name)
+        self.collection = Collection("Scene Collection")
+        self.camera = None
+        self.world = None
+        self.frame_start = 1
+        self.frame_end = 250
+        self.frame_current = 1
+        self.render = RenderSettings()
+        self.cycles = types.SimpleNamespace(samples=4096, device="CPU")
+        self.eevee = types.SimpleNamespace(taa_render_samples=64)
+
+    @property
+    def objects(self):
+        return self.collection.all_objects
+
+    def frame_set(self, frame, subframe=0.0):
+        calls["scene.frame_set"] += 1
+        self.frame_current = int(frame)
+        for handler in bpy.app.handlers.frame_change_pre:
+            handler(self, None)
+        for handler in bpy.app.handlers.frame_change_post:
+            handler(self, None)
+
+
+class ViewLayerObjects:
+    def __init__(self, context):
+        self._context = context
+
+    @property
+    def active(self):
+        return self._context.object
+
+    @active.setter
+    def active(self, obj):
+        self._context.object = obj
+
+    def __iter__(self):
+        return iter(self._context.scene.objects)
+
+
+class Context:
+    def __init__(self, scene):
+        self.scene = scene
+        self.collection = scene.collection
+        self.object = None
+        self._selection = {}    # id(obj) → obj, in selection order
+        self.view_layer = types.SimpleNamespace(objects=ViewLayerObjects(self),
+                                                update=lambda: None)
+
+    @property
+    def active_object(self):
+        return self.object
+
+    @property
+    def selected_objects(self):
+        return list(self._selection.values())
+
+
+class BlendData:
+    def __init__(self):
+        self.objects = BlendDataCollection(Object)
+        self.meshes = BlendDataCollection(Mesh)
+        self.materials = BlendDataCollection(Material)
+        self.collections = BlendDataCollection(Collection)
+        self.cameras = BlendDataCollection(Camera)
+        self.lights = BlendDataCollection(Light)
+        self.worlds = BlendDataCollection(World)
+        self.curves = BlendDataCollection(Curve)
+        self.scenes = BlendDataCollection(Scene)
+        self.actions = BlendDataCollection(Action)
+        self.node_groups = BlendDataCollection(NodeGroup)
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+#  OPERATORS
+# ═══════════════════════════════════════════════════════════════════════════
+
+def _new_active(name, data=None, location=(0, 0, 0), rotation=(0, 0, 0),
+                scale=(1, 1, 1)):
+    """Add an object the way ``*_add`` operators do: linked, selected, active."""
+    bpy.context._selection.clear()
+    obj = bpy.data.objects.new(name, data)
+    bpy.context.collection.objects.link(obj)
+    obj.location, obj.rotation_euler, obj.scale = location, rotation, scale
+    obj._selected = True
+    bpy.context.object = obj
+    return obj
+
+
+def _grid_mesh(name, verts, faces):
+    mesh = bpy.data.meshes.new(name)
+    mesh.from_pydata(verts, [], faces)
+    return mesh
+
+
+def _cube(size=2.0):
+    h = size / 2
+    v = [(x, y, z) for x in (-h, h) for y in (-h, h) for z in (-h, h)]
+    f = [(0, 1, 3, 2), (4, 6, 7, 5), (0, 4, 5, 1),
+         (2, 3, 7, 6), (0, 2, 6, 4), (1, 5, 7, 3)]
+    return v, f
+
+
+def _ring_solid(n, r_bottom, r_top, depth):
+    ang = np.linspace(0, 2 * np.pi, n, endpoint=False)
+    bottom = [(r_bottom * np.cos(a), r_bottom * np.sin(a), -depth / 2) for a in ang]
+    top = [(r_top * np.cos(a), r_top * np.sin(a), depth / 2) for a in ang]
+    faces = [(i, (i + 1) % n, n + (i + 1) % n, n + i) for i in range(n)]
+    faces += [tuple(range(n - 1, -1, -1)), tuple(range(n, 2 * n))]
+    return bottom + top, faces
+
+
+def _uv_sphere(segments, rings, radius):
+    verts = [(0, 0, radius)]
+    for i in range(1, rings):
+        phi = np.pi * i / rings
+        for j in range(segments):
+            th = 2 * np.pi * j / segments
+            verts.append((radius * np.sin(phi) * np.cos(th),
+                          radius * np.sin(phi) * np.sin(th), radius * np.cos(phi)))
+    verts.append((0, 0, -radius))
+    south = len(verts) - 1
+
+    def ring(i, j):
+        return 1 + (i - 1) * segments + j % segments
+
+    faces = [(0, ring(1, j), ring(1, j + 1)) for j in range(segments)]
+    for i in range(1, rings - 1):
+        faces += [(ring(i, j), ring(i + 1, j), ring(i + 1, j + 1), ring(i, j + 1))
+                  for j in range(segments)]
+    faces += [(south, ring(rings - 1, j + 1), ring(rings - 1, j))
+              for j in range(segments)]
+    return verts, faces
+
+
+def _op_select_all(action="TOGGLE"):
+    objs = bpy.context.scene.objects
+    if action == "TOGGLE":
+        action = "DESELECT" if any(o._selected for o in objs) else "SELECT"
+    for obj in objs:
+        obj._selected = {"SELECT": True, "DESELECT": False,
+                         "INVERT": not obj._selected}[action]
+
+
+def _op_select_by_type(type="MESH", extend=False):
+    for obj in bpy.context.scene.objects:
+        if obj.type == type:
+            obj._selected = True
+        elif not extend:
+            obj._selected = False
+
+
+def _op_delete(use_global=False, confirm=True):
+    for obj in bpy.context.selected_objects:
+        bpy.data.objects.remove(obj, do_unlink=True)
+
+
+def _op_cube_add(size=2.0, location=(0, 0, 0), rotation=(0, 0, 0),
+                 scale=(1, 1, 1), **_):
+    _new_active("Cube", _grid_mesh("Cube", *_cube(size)), location, rotation, scale)
+
+
+def _op_plane_add(size=2.0, location=(0, 0, 0), rotation=(0, 0, 0),
+                  scale=(1, 1, 1), **_):
+    h = size / 2
+    verts = [(-h, -h, 0), (h, -h, 0), (h, h, 0), (-h, h, 0)]
+    _new_active("Plane", _grid_mesh("Plane", verts, [(0, 1, 2, 3)]),
+                location, rotation, scale)
+
+
+def _op_uv_sphere_add(segments=32, ring_count=16, radius=1.0,
+                      location=(0, 0, 0), rotation=(0, 0, 0), scale=(1, 1, 1), **_):
+    mesh = _grid_mesh("Sphere", *_uv_sphere(segments, ring_count, radius))
+    _new_active("Sphere", mesh, location, rotation, scale)
+
+
+def _op_cylinder_add(vertices=32, radius=1.0, depth=2.0, location=(0, 0, 0),
+                     rotation=(0, 0, 0), scale=(1, 1, 1), **_):
+    mesh = _grid_mesh("Cylinder", *_ring_solid(vertices, radius, radius, depth))
+    _new_active("Cylinder", mesh, location, rotation, scale)
+
+
+def _op_cone_add(vertices=32, radius1=1.0, radius2=0.0, depth=2.0,
+                 location=(0, 0, 0), rotation=(0, 0, 0), scale=(1, 1, 1), **_):
+    mesh = _grid_mesh("Cone", *_ring_solid(vertices, radius1, max(radius2, 1e-6), depth))
+    _new_active("Cone", mesh, location, rotation, scale)
+
+
+def _op_camera_add(location=(0, 0, 0), rotation=(0, 0, 0), **_):
+    _new_active("Camera", bpy.data.cameras.new("Camera"), location, rotation)
+
+
+def _op_light_add(type="POINT", location=(0, 0, 0), rotation=(0, 0, 0), **_):
+    name = type.capitalize()
+    _new_active(name, bpy.data.lights.new(name, type=type), location, rotation)
+
+
+def _op_empty_add(type="PLAIN_AXES", location=(0, 0, 0), rotation=(0, 0, 0), **_):
+    obj = _new_active("Empty", None, location, rotation)
+    obj.empty_display_type = type
+
+
+# Minimal valid 1×1 grey PNG
+def _placeholder_png():
+    def chunk(tag, data):
+        body = tag + data
+        return struct.pack(">I", len(data)) + body + struct.pack(">I", zlib.crc32(body))
+    return (b"\x89PNG\r\n\x1a\n"
+            + chunk(b"IHDR", struct.pack(">IIBBBBB", 1, 1, 8, 0, 0, 0, 0))
+            + chunk(b"IDAT", zlib.compress(b"\x00\x80"))
+            + chunk(b"IEND", b""))
+
+
+def _write_placeholder(path):
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(path, "wb") as f:
+        f.write(_placeholder_png())
+
+
+def _op_render(animation=False, write_still=False, **_):
+    scene = bpy.context.scene
+    if animation:
+        for frame in range(scene.frame_start, scene.frame_end + 1):
+            scene.frame_set(frame)
+            _write_placeholder(scene.render.frame_path(frame))
+    elif write_still:
+        path = scene.render.filepath
+        if not os.path.splitext(path)[1]:
+            path += ".png"
+        _write_placeholder(path)
+
+
+_OPERATORS = {
+    "object.select_all": _op_select_all,
+    "object.select_by_type": _op_select_by_type,
+    "object.delete": _op_delete,
+    "object.camera_add": _op_camera_add,
+    "object.light_add": _op_light_add,
+    "object.empty_add": _op_empty_add,
+    "mesh.primitive_cube_add": _op_cube_add,
+    "mesh.primitive_plane_add": _op_plane_add,
+    "mesh.primitive_uv_sphere_add": _op_uv_sphere_add,
+    "mesh.primitive_cylinder_add": _op_cylinder_add,
+    "mesh.primitive_cone_add": _op_cone_add,
+    "render.render": _op_render,
+}
+
+
+class _Operator:
+    def __init__(self, idname):
+        self.idname = idname
+        self._impl = _OPERATORS.get(idname)
+
+    def __call__(self, *exec_context, **kwargs):
+        calls["ops." + self.idname] += 1
+        if self._impl is not None:
+            self._impl(**kwargs)
+        return {"FINISHED"}
+
+    def poll(self, *args):
+        return True
+
+
+class _OpsModule:
+    def __init__(self, name):
+        self._name = name
+
+    def __getattr__(self, op):
+        if op.startswith("__"):
+            raise AttributeError(op)
+        return _Operator(f"{self._name}.{op}")
+
+
+class _Ops:
+    def __getattr__(self, name):
+        if name.startswith("__"):
+            raise AttributeError(name)
+        return _OpsModule(name)
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+#  bmesh
+# ═══════════════════════════════════════════════════════════════════════════
+
+class BMVert:
+    def __init__(self, co, index):
+        self.co = Vector(co)
+        self.index = index
+
+
+class BMFace:
+    def __init__(self, verts):
+        self.verts = list(verts)
+
+
+class _BMSeq(list):
+    def __init__(self, factory):
+        super().__init__()
+        self._factory = factory
+
+    def new(self, *args):
+        item = self._factory(self, *args)
+        self.append(item)
+        return item
+
+    def ensure_lookup_table(self):
+        pass
+
+    def index_update(self):
+        for i, item in enumerate(self):
+            item.index = i
+
+
+class BMesh:
+    def __init__(self):
+        self.verts = _BMSeq(lambda seq, co=(0, 0, 0): BMVert(co, len(seq)))
+        self.faces = _BMSeq(lambda seq, verts: BMFace(verts))
+        self.edges = _BMSeq(lambda seq, verts: BMFace(verts))
+
+    def from_mesh(self, mesh):
+        co = mesh.vertices._column("co")
+        for row in co:
+            self.verts.new(row)
+        idx = mesh.loops._column("vertex_index").ravel()
+        starts = mesh.polygons._column("loop_start").ravel()
+        totals = mesh.polygons._column("loop_total").ravel()
+        for s, t in zip(starts, totals):
+            self.faces.new([self.verts[i] for i in idx[s:s + t]])
+
+    def to_mesh(self, mesh):
+        calls["bmesh.to_mesh"] += 1
+        self.verts.index_update()
+        mesh.vertices = MeshElements(_VERTEX_ATTRS)
+        mesh.loops = MeshElements(_LOOP_ATTRS)
+        mesh.polygons = MeshElements(_POLY_ATTRS)
+        mesh.from_pydata([tuple(v.co) for v in self.verts], [],
+                         [[v.index for v in f.verts] for f in self.faces])
+
+    def free(self):
+        pass
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+#  MODULES
+# ═══════════════════════════════════════════════════════════════════════════
+
+def _make_modules():
+    bpy_mod = types.ModuleType("bpy")
+    bpy_mod.__doc__ = "Recording stand-in for Blender's bpy (visualization_3d.fake_bpy)."
+    bpy_mod.ops = _Ops()
+    bpy_mod.app = types.SimpleNamespace(
+        version=(4, 1, 0), version_string="4.1.0 (stand-in)", background=True,
+        handlers=types.SimpleNamespace(frame_change_pre=[], frame_change_post=[],
+                                       render_pre=[], render_post=[]),
+    )
+    bpy_mod.types = types.SimpleNamespace(
+        ID=ID, Object=Object, Mesh=Mesh, Material=Material, World=World,
+        Collection=Collection, Scene=Scene, Camera=Camera, Light=Light,
+        Curve=Curve, Action=Action, FCurve=FCurve, NodeTree=NodeGroup,
+        GeometryNodeTree=NodeGroup,
+    )
+
+    bmesh_mod = types.ModuleType("bmesh")
+    bmesh_mod.new = BMesh
+    bmesh_mod.types = types.SimpleNamespace(BMesh=BMesh, BMVert=BMVert, BMFace=BMFace)
+    bmesh_mod.ops = _OpsModule("bmesh")
+
+    mathutils_mod = types.ModuleType("mathutils")
+    mathutils_mod.Vector = Vector
+    mathutils_mod.Euler = Euler
+    return bpy_mod, bmesh_mod, mathutils_mod
+
+
+bpy, bmesh, mathutils = _make_modules()
+
+
+def reset():
+    """Start from an empty file: one scene, no objects, zeroed counters."""
+    data = BlendData()
+    scene = data.scenes.new("Scene")
+    bpy.data = data
+    bpy.context = Context(scene)
+    for handlers in vars(bpy.app.handlers).values():
+        handlers.clear()
+    calls.clear()
+
+
+def install(version=None):
+    """Register the stand-in as ``bpy``, ``bmesh`` and ``mathutils``.
+
+    *version* overrides ``bpy.app.version`` (e.g. ``(3, 6, 0)`` to
+    exercise pre-4.0 code paths).  Returns the ``bpy`` stand-in.
+    """
+    reset()
+    if version is not None:
+        bpy.app.version = tuple(version)
+    sys.modules["bpy"] = bpy
+    sys.modules["bmesh"] = bmesh
+    sys.modules["mathutils"] = mathutils
+    return bpy
+
+
+def uninstall():
+    """Remove the stand-in modules from ``sys.modules``."""
+    for name, mod in (("bpy", bpy), ("bmesh", bmesh), ("mathutils", mathutils)):
+        if sys.modules.get(name) is mod:
+            del sys.modules[name]
+
+
+def stats():
+    """Data-block and geometry counts plus operator / bulk-write calls."""
+    data = bpy.data
+    return {
+        "objects": len(data.objects),
+        "meshes": len(data.meshes),
+        "materials": len(data.materials),
+        "collections": len(data.collections),
+        "vertices": sum(len(m.vertices) for m in data.meshes),
+        "faces": sum(len(m.polygons) for m in data.meshes),
+        "operator_calls": sum(n for k, n in calls.items() if k.startswith("ops.")),
+        "calls": dict(calls),
+    }
+
+
+reset()
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+#  COMMAND LINE (blender -b … stand-in)
+# ═══════════════════════════════════════════════════════════════════════════
+
+def parse_frame_list(text):
+    """Blender ``-f`` syntax: ``"1,4,10..12"`` → ``[1, 4, 10, 11, 12]``."""
+    frames = []
+    for part in text.split(","):
+        lo, sep, hi = part.partition("..")
+        frames.extend(range(int(lo), int(hi) + 1) if sep else [int(lo)])
+    return frames
+
+
+def _render_frame(scene, frame):
+    scene.frame_set(frame)
+    path = scene.render.frame_path(frame)
+    _write_placeholder(path)
+    print(f"Saved: '{path}'")
+
+
+_VALUE_OPTIONS = {
+    "--python-exit-code", "-P", "--python", "-o", "--render-output",
+    "-F", "--render-format", "-x", "--use-extension", "-s", "--frame-start",
+    "-e", "--frame-end", "-j", "--frame-jump", "-f", "--render-frame",
+}
+
+
+def main(argv=None):
+    """Process Blender-style arguments in order, like ``blender`` does."""
+    import runpy
+    import traceback
+
+    args = list(sys.argv[1:] if argv is None else argv)
+    install()
+    scene = bpy.context.scene
+    exit_code = 0
+    while args:
+        arg = args.pop(0)
+        if arg == "--":
+            break
+        if arg in ("-a", "--render-anim"):
+            step = getattr(scene, "frame_step", 1)
+            for frame in range(scene.frame_start, scene.frame_end + 1, step):
+                _render_frame(scene, frame)
+            continue
+        if arg.endswith(".blend"):
+            reset()                       # "open" the file: empty scene
+            scene = bpy.context.scene
+            continue
+        if arg not in _VALUE_OPTIONS:
+            if arg not in ("-b", "--background", "--factory-startup", "-noaudio"):
+                print(f"[fake_bpy] ignoring argument {arg!r}")
+            continue
+
+        value = args.pop(0)
+        if arg == "--python-exit-code":
+            exit_code = int(value)
+        elif arg in ("-P", "--python"):
+            script_argv = sys.argv
+            sys.argv = [value] + args
+            try:
+                runpy.run_path(value, run_name="__main__")
+            except SystemExit as exc:
+                if exc.code:
+                    return exc.code
+            except Exception:
+                traceback.print_exc()
+                if exit_code:
+                    return exit_code
+            finally:
+                sys.argv = script_argv
+        elif arg in ("-o", "--render-output"):
+            scene.render.filepath = value[2:] if value.startswith("//") else value
+        elif arg in ("-F", "--render-format"):
+            scene.render.image_settings.file_format = value
+        elif arg in ("-x", "--use-extension"):
+            scene.render.use_file_extension = bool(int(value))
+        elif arg in ("-s", "--frame-start"):
+            scene.frame_start = int(value)
+        elif arg in ("-e", "--frame-end"):
+            scene.frame_end = int(value)
+        elif arg in ("-j", "--frame-jump"):
+            scene.frame_step = int(value)
+        elif arg in ("-f", "--render-frame"):
+            for frame in parse_frame_list(value):
+                _render_frame(scene, frame)
+    return 0
+
+
+if __name__ == "__main__":
+    # Run against the importable module so scripts share the same stand-in
+    from visualization_3d import fake_bpy as _module
+    sys.exit(_module.main())
@@ -0,0 +1,413 @@
+"""
+Streaming post-processing of rendered frames into GIF / APNG.
+
+Replaces ``old/image_to_gif.py``, which held every brightened frame in a
+list before writing.  Here frames flow through generator stages and are
+encoded one at a time, so memory stays bounded by the number of frames in
+flight, whatever the length of the animation::
+
+    python -m visualization_3d.frames renders/anim/ -o anim.gif \\
+        --brightness 1.2 --width 960 --fps 24 -j 8
+
+Per-frame work (decode, tone curve, resize, quantization to a shared
+palette, encoding) runs in a process pool; the parent only appends
+encoded frames to the output file in order.  The same stages are
+available as plain generators for in-process use::
+
+    frames = load(list_frames("renders/anim"))
+    frames = resize(tone(frames, brightness=1.2), width=960)
+    with GifWriter("anim.gif", (960, 540), palette, fps=24) as gif:
+        for im in quantize(frames, palette):
+            gif.write(im)
+
+GIF frames share one global palette fitted to a sample of the frames,
+so colours do not flicker between frames.  APNG is written in RGB unless
+a palette is given.  No ``bpy`` needed; requires Pillow.
+"""
+
+import argparse
+import glob
+import io
+import os
+import struct
+import sys
+import zlib
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from fractions import Fraction
+from typing import Optional, Sequence
+
+import numpy as np
+from PIL import Image
+from PIL.GifImagePlugin import getdata as _gif_frame_data
+
+
+def list_frames(folder, pattern="*.png"):
+    """Sorted frame paths in *folder* (listed once)."""
+    return sorted(glob.glob(os.path.join(folder, pattern)))
+
+
+# ── per-frame operations ────────────────────────────────────────────────
+
+def tone_lut(brightness=1.0, contrast=1.0, gamma=1.0):
+    """256-entry lookup table: gamma, then contrast about mid-grey, then gain."""
+    v = np.arange(256) / 255.0
+    v = v ** (1.0 / gamma)
+    v = (v - 0.5) * contrast + 0.5
+    v = v * brightness
+    return np.clip(np.round(v * 255), 0, 255).astype(np.uint8)
+
+
+def fit_size(size, width=None, height=None):
+    """Target size for *size* given a width and/or height (aspect kept)."""
+    w, h = size
+    if width and height:
+        return int(width), int(height)
+    if width:
+        return int(width), max(1, round(h * width / w))
+    if height:
+        return max(1, round(w * height / h)), int(height)
+    return w, h
+
+
+def palette_image(palette):
+    """``P``-mode carrier image for a flat RGB *palette* (≤ 768 values)."""
+    carrier = Image.new("P", (1, 1))
+    carrier.putpalette(list(palette))
+    return carrier
+
+
+@dataclass
+class FrameOps:
+    """Picklable description of the per-frame processing."""
+
+    brightness: float = 1.0
+    contrast: float = 1.0
+    gamma: float = 1.0
+    width: Optional[int] = None
+    height: Optional[int] = None
+    palette: Optional[Sequence[int]] = None   # flat RGB, shared by all frames
+    dither: bool = True
+
+    @property
+    def has_tone(self):
+        return (self.brightness, self.contrast, self.gamma) != (1.0, 1.0, 1.0)
+
+    def apply(self, im, quantize=True):
+        """Tone, resize and (optionally) quantize one image."""
+        im = im.convert("RGB")
+        if self.has_tone:
+            im = im.point(list(tone_lut(self.brightness, self.contrast,
+                                        self.gamma)) * 3)
+        size = fit_size(im.size, self.width, self.height)
+        if size != im.size:
+            im = im.resize(size, Image.Resampling.LANCZOS, reducing_gap=3.0)
+        if quantize and self.palette is not None:
+            dither = (Image.Dither.FLOYDSTEINBERG if self.dither
+                      else Image.Dither.NONE)
+            im = im.quantize(palette=palette_image(self.palette), dither=dither)
+        return im
+
+
+# ── generator stages ────────────────────────────────────────────────────
+
+def load(paths):
+    for path in paths:
+        with Image.open(path) as im:
+            im.load()
+            yield im
+
+
+def tone(frames, brightness=1.0, contrast=1.0, gamma=1.0):
+    ops = FrameOps(brightness, contrast, gamma)
+    for im in frames:
+        yield ops.apply(im)
+
+
+def resize(frames, width=None, height=None):
+    ops = FrameOps(width=width, height=height)
+    for im in frames:
+        yield ops.apply(im)
+
+
+def quantize(frames, palette, dither=True):
+    ops = FrameOps(palette=palette, dither=dither)
+    for im in frames:
+        yield ops.apply(im)
+
+
+def shared_palette(paths, ops=None, colors=256, samples=16, thumb=256):
+    """Fit one palette to *samples* evenly spaced frames.
+
+    Frames are tone-mapped like the output and shrunk to *thumb* pixels
+    wide before fitting, so the cost does not grow with resolution.
+    Returns a flat RGB list of ``3 · colors`` values.
+    """
+    ops = ops or FrameOps()
+    picks = np.unique(np.linspace(0, len(paths) - 1, min(samples, len(paths)))
+                      .round().astype(int))
+    thumbs = []
+    for i in picks:
+        with Image.open(paths[i]) as im:
+            im = FrameOps(ops.brightness, ops.contrast, ops.gamma).apply(im)
+            thumbs.append(im.resize(fit_size(im.size, width=min(thumb, im.width)),
+                                    Image.Resampling.BILINEAR))
+    sheet = Image.new("RGB", (max(t.width for t in thumbs),
+                              sum(t.height for t in thumbs)))
+    y = 0
+    for t in thumbs:
+        sheet.paste(t, (0, y))
+        y += t.height
+    fitted = sheet.quantize(colors=colors, method=Image.Quantize.MEDIANCUT)
+    palette = fitted.getpalette()[:3 * colors]
+    return palette + [0] * (3 * colors - len(palette))
+
+
+# ── parallel map with bounded look-ahead ────────────────────────────────
+
+def ordered_map(fn, items, workers=None, window=None):
+    """Yield ``fn(item)`` in order, computed in a process pool.
+
+    At most *window* (default ``2 · workers``) results are pending at any
+    time, which bounds memory for arbitrarily long inputs.  ``workers=1``
+    runs in-process.
+    """
+    workers = workers or os.cpu_count() or 1
+    if workers == 1:
+        yield from map(fn, items)
+        return
+    window = window or 2 * workers
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = deque()
+        for item in items:
+            pending.append(pool.submit(fn, item))
+            if len(pending) >= window:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+# Worker-side encoders: return bytes ready to append to the output file
+
+def _encode_gif_frame(job):
+    path, ops, duration_ms = job
+    with Image.open(path) as im:
+        frame = ops.apply(im)
+    return b"".join(_gif_frame_data(frame, duration=duration_ms))
+
+
+def _encode_png_frame(job):
+    path, ops, compress_level = job
+    with Image.open(path) as im:
+        frame = ops.apply(im)
+    buf = io.BytesIO()
+    frame.save(buf, format="PNG", compress_level=compress_level)
+    return buf.getvalue()
+
+
+# ── writers ─────────────────────────────────────────────────────────────
+
+class GifWriter:
+    """Animated GIF written frame by frame with one global palette.
+
+    :meth:`write` accepts a ``P``-mode image quantized to *palette*, or the
+    encoded bytes produced by :func:`PIL.GifImagePlugin.getdata`.
+    """
+
+    def __init__(self, path, size, palette, fps=24.0, loop=0):
+        self.path = path
+        self.size = size
+        self.duration_ms = round(1000.0 / fps)
+        self.frames = 0
+        pal = bytes(list(palette)[:768]).ljust(768, b"\0")
+        self._fp = open(path, "wb")
+        w, h = size
+        self._fp.write(b"GIF89a" + struct.pack("<HHBBB", w, h, 0xF7, 0, 0) + pal)
+        # NETSCAPE2.0 application extension: loop count
+        self._fp.write(b"!\xff\x0bNETSCAPE2.0\x03\x01"
+                       + struct.pack("<H", loop) + b"\0")
+
+    def write(self, frame):
+        if isinstance(frame, Image.Image):
+            if frame.size != tuple(self.size):
+                raise ValueError(f"frame size {frame.size} != {tuple(self.size)}")
+            frame = b"".join(_gif_frame_data(frame, duration=self.duration_ms))
+        self._fp.write(frame)
+        self.frames += 1
+
+    def close(self):
+        if not self._fp.closed:
+            self._fp.write(b";")
+            self._fp.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def _png_chunks(data):
+    """``(type, payload)`` pairs of a PNG byte string."""
+    pos = 8
+    while pos < len(data):
+        length, = struct.unpack(">I", data[pos:pos + 4])
+        kind = data[pos + 4:pos + 8]
+        yield kind, data[pos + 8:pos + 8 + length]
+        pos += 12 + length
+
+
+def _chunk(kind, payload):
+    return (struct.pack(">I", len(payload)) + kind + payload
+            + struct.pack(">I", zlib.crc32(kind + payload)))
+
+
+class ApngWriter:
+    """Animated PNG written frame by frame.
+
+    :meth:`write` accepts an image or the PNG bytes of one frame; every
+    frame must have the same size and colour type.  The frame count in
+    ``acTL`` is patched on :meth:`close`.
+    """
+
+    def __init__(self, path, fps=24.0, loop=0, compress_level=6):
+        self.path = path
+        self.fps = fps
+        self.loop = loop
+        self.compress_level = compress_level
+        # fcTL delay num/den are 16-bit: 1/fps as the nearest such fraction
+        self._delay = (1 / Fraction(fps)).limit_denominator(0xFFFF)
+        self.frames = 0
+        self._seq = 0
+        self._header = None
+        self._actl_offset = None
+        self._fp = open(path, "wb")
+
+    def _start(self, chunks):
+        self._header = chunks[b"IHDR"]
+        self._fp.write(b"\x89PNG\r\n\x1a\n" + _chunk(b"IHDR", self._header))
+        self._actl_offset = self._fp.tell()
+        self._fp.write(_chunk(b"acTL", struct.pack(">II", 0, self.loop)))
+        for kind in (b"PLTE", b"tRNS"):
+            if kind in chunks:
+                self._fp.write(_chunk(kind, chunks[kind]))
+
+    def write(self, frame):
+        if isinstance(frame, Image.Image):
+            buf = io.BytesIO()
+            frame.save(buf, format="PNG", compress_level=self.compress_level)
+            frame = buf.getvalue()
+        chunks, idat = {}, []
+        for kind, payload in _png_chunks(frame):
+            if kind == b"IDAT":
+                idat.append(payload)
+            else:
+                chunks.setdefault(kind, payload)
+        if self._header is None:
+            self._start(chunks)
+        elif chunks[b"IHDR"] != self._header:
+            raise ValueError("APNG frames must share size and colour type")
+
+        w, h = struct.unpack(">II", self._header[:8])
+        # delay = 1 / fps s; dispose NONE, blend SOURCE
+        fctl = struct.pack(">IIIIIHHBB", self._seq, w, h, 0, 0,
+                           self._delay.numerator, self._delay.denominator, 0, 0)
+        self._fp.write(_chunk(b"fcTL", fctl))
+        self._seq += 1
+        data = b"".join(idat)
+        if self.frames == 0:
+            self._fp.write(_chunk(b"IDAT", data))
+        else:
+            self._fp.write(_chunk(b"fdAT", struct.pack(">I", self._seq) + data))
+            self._seq += 1
+        self.frames += 1
+
+    def close(self):
+        if self._fp.closed:
+            return
+        self._fp.write(_chunk(b"IEND", b""))
+        if self._actl_offset is not None:
+            self._fp.seek(self._actl_offset)
+            self._fp.write(_chunk(b"acTL", struct.pack(">II", self.frames, self.loop)))
+        self._fp.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+# ── driver ──────────────────────────────────────────────────────────────
+
+def encode_animation(paths, out, ops=None, fps=24.0, loop=0, workers=None,
+                     colors=256, compress_level=6, palette_samples=16):
+    """Post-process *paths* and write *out* (``.gif``, ``.png`` / ``.apng``).
+
+    GIF output gets a shared palette of *colors* fitted by
+    :func:`shared_palette` unless ``ops.palette`` is set.  Returns the
+    number of frames written.
+    """
+    if not paths:
+        raise ValueError("no frames to encode")
+    ops = ops or FrameOps()
+    is_gif = out.lower().endswith(".gif")
+    if is_gif and ops.palette is None:
+        ops.palette = shared_palette(paths, ops, colors, palette_samples)
+
+    if is_gif:
+        with Image.open(paths[0]) as first:
+            size = fit_size(first.size, ops.width, ops.height)
+        duration = round(1000.0 / fps)
+        jobs = ((p, ops, duration) for p in paths)
+        writer = GifWriter(out, size, ops.palette, fps, loop)
+        encoded = ordered_map(_encode_gif_frame, jobs, workers)
+    else:
+        jobs = ((p, ops, compress_level) for p in paths)
+        writer = ApngWriter(out, fps, loop, compress_level)
+        encoded = ordered_map(_encode_png_frame, jobs, workers)
+    with writer:
+        for frame in encoded:
+            writer.write(frame)
+    return writer.frames
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="python -m visualization_3d.frames",
+        description="Post-process rendered frames into an animated GIF or APNG.",
+    )
+    parser.add_argument("frames", help="directory of frames (or a glob pattern)")
+    parser.add_argument("-o", "--out", default="output.gif",
+                        help="output file, .gif or .png/.apng (default: output.gif)")
+    parser.add_argument("--fps", type=float, default=24.0)
+    parser.add_argument("--loop", type=int, default=0,
+                        help="loop count, 0 = forever (default: 0)")
+    parser.add_argument("--brightness", type=float, default=1.0)
+    parser.add_argument("--contrast", type=float, default=1.0)
+    parser.add_argument("--gamma", type=float, default=1.0)
+    parser.add_argument("--width", type=int, default=None)
+    parser.add_argument("--height", type=int, default=None)
+    parser.add_argument("--colors", type=int, default=None,
+                        help="palette size (GIF default 256; APNG stays RGB "
+                             "unless given)")
+    parser.add_argument("--no-dither", action="store_true")
+    parser.add_argument("-j", "--jobs", type=int, default=None,
+                        help="worker processes (default: CPU count)")
+    args = parser.parse_args(argv)
+
+    paths = (list_frames(args.frames) if os.path.isdir(args.frames)
+             else sorted(glob.glob(args.frames)))
+    ops = FrameOps(args.brightness, args.contrast, args.gamma,
+                   args.width, args.height, dither=not args.no_dither)
+    if args.colors and not args.out.lower().endswith(".gif"):
+        ops.palette = shared_palette(paths, ops, args.colors)
+    n = encode_animation(paths, args.out, ops, fps=args.fps, loop=args.loop,
+                         workers=args.jobs, colors=args.colors or 256)
+    print(f"[frames] wrote {n} frames to {args.out}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
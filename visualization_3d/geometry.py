@@ -0,0 +1,258 @@
+"""
+Pure-NumPy mesh generators and shared constants for the 3D chip geometry.
+
+Each function returns ``(vertices, faces)``: an ``(N, 3)`` float array of
+vertex positions in local coordinates and an ``(M, 4)`` int array of quad
+faces (``(M, 3)`` triangles for :func:`arrow_mesh`).  The vertex and face layouts match the bmesh code these replaced,
+so meshes built here look identical once uploaded to Blender.
+"""
+
+import numpy as np
+
+
+# ── global scale ────────────────────────────────────────────────────────
+
+GLOBAL_SCALE = 0.01   # shrink data-unit coords → Blender units
+
+
+# ── material palette (backend-neutral) ──────────────────────────────────
+
+# Niobium (blue-silver) for data qubits, gold for couplers,
+# medium-grey silicon substrate.
+#                   color                            metal  rough  bump   noise_scale
+MATERIAL_PALETTE = {
+    "aluminum":  ((0.62, 0.66, 0.78, 1),               0.90,  0.40,  0.7,   500.0),   # Nb blue-silver
+    "aluminum2": ((0.55, 0.60, 0.74, 1),               0.90,  0.45,  0.9,   600.0),   # Nb bridge layer
+    "junction":  ((0.50, 0.53, 0.62, 1),               0.80,  0.50,  0.5,   400.0),   # Al oxide barrier
+    "substrate": ((0.35, 0.35, 0.37, 1),               0.05,  0.12,  0.15,  150.0),   # Si wafer grey
+    "coupler":   ((0.72, 0.63, 0.38, 1),               0.90,  0.35,  0.7,   500.0),   # TiN gold
+}
+
+
+# ── helpers ─────────────────────────────────────────────────────────────
+
+def _logistic(a):
+    """``1 / (1 + exp(a))`` without overflow for large ``|a|``."""
+    return 0.5 * (1.0 - np.tanh(0.5 * a))
+
+
+def _strip_faces(n):
+    """Quad faces for *n* slices of four verts each (bl, br, tl, tr).
+
+    Bottom, top and two side walls between neighbouring slices, plus the
+    two end caps.
+    """
+    i = np.arange(n - 1) * 4
+    bl0, br0, tl0, tr0 = i, i + 1, i + 2, i + 3
+    bl1, br1, tl1, tr1 = i + 4, i + 5, i + 6, i + 7
+    body = np.stack([
+        np.column_stack([bl0, br0, br1, bl1]),   # bottom (normal down)
+        np.column_stack([tl0, tl1, tr1, tr0]),   # top (normal up)
+        np.column_stack([bl0, bl1, tl1, tl0]),   # left wall (-Y)
+        np.column_stack([br0, tr0, tr1, br1]),   # right wall (+Y)
+    ], axis=1).reshape(-1, 4)
+    last = (n - 1) * 4
+    caps = np.array([
+        [0, 2, 3, 1],
+        [last, last + 1, last + 3, last + 2],
+    ])
+    return np.vstack([body, caps]).astype(np.int32)
+
+
+def _strip_mesh(xs, z_bottom, width, thickness):
+    """Closed strip of constant *width* whose bottom follows *z_bottom*."""
+    n = len(xs)
+    hy = width / 2
+    verts = np.empty((n, 4, 3))
+    verts[:, :, 0] = xs[:, None]
+    verts[:, :, 1] = (-hy, hy, -hy, hy)
+    verts[:, 0:2, 2] = z_bottom[:, None]
+    verts[:, 2:4, 2] = (z_bottom + thickness)[:, None]
+    return verts.reshape(-1, 3), _strip_faces(n)
+
+
+# ── basic shapes ────────────────────────────────────────────────────────
+
+def cube_mesh():
+    """Axis-aligned cube with vertices at ±1 (``primitive_cube_add(size=2)``)."""
+    verts = np.array([
+        (-1, -1, -1), (-1, -1, 1), (-1, 1, -1), (-1, 1, 1),
+        (1, -1, -1), (1, -1, 1), (1, 1, -1), (1, 1, 1),
+    ], dtype=float)
+    faces = np.array([
+        (0, 1, 3, 2), (2, 3, 7, 6), (6, 7, 5, 4),
+        (4, 5, 1, 0), (2, 6, 4, 0), (7, 3, 1, 5),
+    ], dtype=np.int32)
+    return verts, faces
+
+
+def plane_mesh():
+    """Unit square in the XY plane (``primitive_plane_add(size=1)``)."""
+    verts = np.array([
+        (-0.5, -0.5, 0), (0.5, -0.5, 0), (0.5, 0.5, 0), (-0.5, 0.5, 0),
+    ], dtype=float)
+    faces = np.array([(0, 1, 2, 3)], dtype=np.int32)
+    return verts, faces
+
+
+# ── extruded path (ribbon with rectangular cross-section) ───────────────
+
+def extruded_path_mesh(points_2d, width, height):
+    """Sweep a rectangular cross-section along a 2D polyline.
+
+    At every centreline vertex four corners are placed (bottom-left,
+    bottom-right, top-right, top-left) perpendicular to the path
+    direction; adjacent rings are stitched with quads and both ends are
+    capped.  The mesh is centred on ``z = 0``.
+
+    Returns ``None`` for fewer than two points.
+    """
+    pts = np.asarray(points_2d, dtype=float).reshape(-1, 2)
+    n = len(pts)
+    if n < 2:
+        return None
+
+    hw = width / 2
+    hh = height / 2
+
+    # Tangent: forward/backward difference at the ends, central inside
+    tang = np.empty_like(pts)
+    tang[0] = pts[1] - pts[0]
+    tang[-1] = pts[-1] - pts[-2]
+    tang[1:-1] = pts[2:] - pts[:-2]
+    tlen = np.hypot(tang[:, 0], tang[:, 1])
+    degenerate = tlen < 1e-9
+    tang[degenerate] = (1.0, 0.0)
+    tlen[degenerate] = 1.0
+    tang /= tlen[:, None]
+
+    # Perpendicular (rotate tangent 90° CCW)
+    normal = np.column_stack([-tang[:, 1], tang[:, 0]])
+    left = pts + normal * hw
+    right = pts - normal * hw
+
+    verts = np.empty((n, 4, 3))
+    verts[:, 0, :2], verts[:, 0, 2] = left, -hh     # bottom-left
+    verts[:, 1, :2], verts[:, 1, 2] = right, -hh    # bottom-right
+    verts[:, 2, :2], verts[:, 2, 2] = right, hh     # top-right
+    verts[:, 3, :2], verts[:, 3, 2] = left, hh      # top-left
+
+    i = np.arange(n - 1) * 4
+    bl0, br0, tr0, tl0 = i, i + 1, i + 2, i + 3
+    bl1, br1, tr1, tl1 = i + 4, i + 5, i + 6, i + 7
+    body = np.stack([
+        np.column_stack([bl0, br0, br1, bl1]),   # bottom
+        np.column_stack([tl0, tl1, tr1, tr0]),   # top
+        np.column_stack([bl0, bl1, tl1, tl0]),   # left wall
+        np.column_stack([br0, tr0, tr1, br1]),   # right wall
+    ], axis=1).reshape(-1, 4)
+    last = (n - 1) * 4
+    caps = np.array([
+        [0, 3, 2, 1],
+        [last, last + 1, last + 2, last + 3],
+    ])
+    return verts.reshape(-1, 3), np.vstack([body, caps]).astype(np.int32)
+
+
+# ── Dolan bridge (sigmoid-profile top electrode) ───────────────────────
+
+def dolan_bridge_mesh(total_length, width, h_step, thickness, overlap_len,
+                      steepness=15, res_x=120):
+    """Closed strip whose bottom follows a double-sigmoid profile.
+
+    The bottom sits at ``z = h_step`` over the two overlap regions and on
+    the substrate (``z = 0``) in the gap between them; see
+    ``primitives.create_dolan_bridge`` for the physical picture.
+    """
+    xs = np.linspace(-total_length / 2, total_length / 2, res_x)
+    left_step = -total_length / 2 + overlap_len
+    right_step = total_length / 2 - overlap_len
+    zb = h_step * (_logistic(steepness * (xs - left_step))
+                   + _logistic(-steepness * (xs - right_step)))
+    return _strip_mesh(xs, zb, width, thickness)
+
+
+def half_bridge_mesh(total_length, width, h_step, thickness, overlap_len,
+                     steepness=15, res_x=80):
+    """Closed strip with a single sigmoid climbing to *h_step* at ``+X``."""
+    xs = np.linspace(-total_length / 2, total_length / 2, res_x)
+    step_x = total_length / 2 - overlap_len
+    zb = h_step * _logistic(-steepness * (xs - step_x))
+    return _strip_mesh(xs, zb, width, thickness)
+
+
+# ── Bloch-sphere meshes ─────────────────────────────────────────────────
+
+def _ring_bands(radii, heights, segments):
+    """Quad bands between consecutive rings (open surface of revolution)."""
+    ang = np.linspace(0, 2 * np.pi, segments, endpoint=False)
+    c, s = np.cos(ang), np.sin(ang)
+    verts = np.concatenate([
+        np.stack([r * c, r * s, np.full(segments, h)], axis=1)
+        for r, h in zip(radii, heights)
+    ])
+    j = np.arange(segments)
+    rows = []
+    for ring in range(len(radii) - 1):
+        a = ring * segments + j
+        b = ring * segments + (j + 1) % segments
+        rows.append(np.stack([a, b, b + segments, a + segments], axis=1))
+    return verts, np.concatenate(rows).astype(np.int32)
+
+
+def arrow_mesh(segments=12, shaft_end=0.9, head_radius=2.0):
+    """Unit arrow along +Z: shaft of radius 1 up to *shaft_end*, cone to z=1.
+
+    A closed triangle mesh (``(M, 3)`` faces): the bands are split into
+    triangles, the cone meets a single tip vertex and the shaft base is
+    capped with a fan, so instances carry no zero-area faces.  An
+    instance scaled by ``(thickness, thickness, length)`` reproduces the
+    shaft/tip proportions of the old Bloch-sphere scripts.
+    """
+    verts, quads = _ring_bands(
+        radii=(1.0, 1.0, head_radius),
+        heights=(0.0, shaft_end, shaft_end),
+        segments=segments,
+    )
+    tip, base = len(verts), len(verts) + 1
+    j = np.arange(segments)
+    head = 2 * segments + j                       # rim of the cone
+    head_next = 2 * segments + (j + 1) % segments
+    faces = np.concatenate([
+        quads[:, [0, 1, 2]], quads[:, [0, 2, 3]],
+        np.column_stack([head, head_next, np.full(segments, tip)]),
+        np.column_stack([np.full(segments, base), (j + 1) % segments, j]),
+    ])
+    verts = np.vstack([verts, [0.0, 0.0, 1.0], [0.0, 0.0, 0.0]])
+    return verts, faces.astype(np.int32)
+
+
+def cube_sphere_mesh(n):
+    """Unit sphere of ``6·n²`` quads (equiangular cube-sphere).
+
+    Every cell spans about ``π / (2n)`` of arc, so the chord error is
+    ``1 − cos(π / 4n)`` everywhere — no pole pinching as with a UV sphere.
+    """
+    t = np.tan(np.linspace(-np.pi / 4, np.pi / 4, n + 1))
+    u, v = np.meshgrid(t, t, indexing="ij")
+    one = np.ones_like(u)
+    faces_uv = []
+    for axis in range(3):
+        for sign in (-1.0, 1.0):
+            pts = np.empty(u.shape + (3,))
+            pts[..., axis] = sign * one
+            pts[..., (axis + 1) % 3] = u
+            pts[..., (axis + 2) % 3] = v
+            # Flip the parameter order on negative faces → outward winding
+            faces_uv.append(pts if sign > 0 else pts[:, ::-1])
+    grid = np.stack(faces_uv).reshape(-1, 3)
+    grid /= np.linalg.norm(grid, axis=1, keepdims=True)
+
+    i, j = np.meshgrid(np.arange(n), np.arange(n), indexing="ij")
+    base = (i * (n + 1) + j).ravel()
+    quad = np.stack([base, base + n + 1, base + n + 2, base + 1], axis=1)
+    faces = np.concatenate([quad + f * (n + 1) ** 2 for f in range(6)])
+
+    # Merge the seam vertices shared by neighbouring cube faces
+    verts, inverse = np.unique(np.round(grid, 9), axis=0, return_inverse=True)
+    return verts, inverse.reshape(-1)[faces].astype(np.int32)
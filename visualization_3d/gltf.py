@@ -0,0 +1,233 @@
+"""
+Binary glTF (``.glb``) export of a :class:`~visualization_3d.scene.Scene`.
+
+Writes the vertex/index buffers straight from NumPy, without Blender.
+Every object that shares a (mesh, material) pair — the Xmon cuboids of
+all qubits and couplers, identical Dolan bridges, identical resonator
+meanders — collapses into a single node drawn with
+``EXT_mesh_gpu_instancing``, so a full chip exports as a handful of
+meshes plus per-instance transform arrays.
+
+Materials map the ``MATERIAL_PALETTE`` entries to glTF PBR
+metallic-roughness.  The scene is Z-up in data units; a root node
+rotates it to glTF's Y-up convention and applies *scale*.
+
+Example
+-------
+>>> from visualization_3d.chip import ChipBuilder
+>>> export_glb(ChipBuilder(lattice).build(), "chip.glb")
+"""
+
+import json
+import struct
+
+import numpy as np
+
+from .geometry import GLOBAL_SCALE, MATERIAL_PALETTE
+
+
+# glTF constants
+_ARRAY_BUFFER = 34962
+_ELEMENT_ARRAY_BUFFER = 34963
+_FLOAT = 5126
+_UNSIGNED_SHORT = 5123
+_UNSIGNED_INT = 5125
+_TRIANGLES = 4
+
+_GLB_MAGIC = 0x46546C67      # "glTF"
+_CHUNK_JSON = 0x4E4F534A     # "JSON"
+_CHUNK_BIN = 0x004E4942      # "BIN\0"
+
+_INSTANCING = "EXT_mesh_gpu_instancing"
+
+
+def _triangles(faces):
+    """Split ``(M, 4)`` quads into ``(2M, 3)`` triangles (fan from vertex 0);
+    ``(M, 3)`` triangles pass through."""
+    if faces.shape[1] == 3:
+        return faces
+    return np.concatenate([faces[:, [0, 1, 2]], faces[:, [0, 2, 3]]])
+
+
+def _z_rotation_quats(rot_z):
+    """Quaternions ``(x, y, z, w)`` for rotations *rot_z* (radians) about Z."""
+    half = np.asarray(rot_z, dtype=float) / 2
+    q = np.zeros((len(half), 4))
+    q[:, 2] = np.sin(half)
+    q[:, 3] = np.cos(half)
+    return q
+
+
+class _GlbBuffer:
+    """Accumulates binary buffer views and accessors for one GLB file."""
+
+    def __init__(self):
+        self.chunks = []
+        self.offset = 0
+        self.buffer_views = []
+        self.accessors = []
+
+    def _view(self, data, target=None):
+        raw = np.ascontiguousarray(data).tobytes()
+        view = {"buffer": 0, "byteOffset": self.offset, "byteLength": len(raw)}
+        if target is not None:
+            view["target"] = target
+        pad = (-len(raw)) % 4
+        self.chunks.append(raw + b"\0" * pad)
+        self.offset += len(raw) + pad
+        self.buffer_views.append(view)
+        return len(self.buffer_views) - 1
+
+    def accessor(self, data, kind, target=None, bounds=False):
+        """Add *data* as an accessor of glTF type *kind*; return its index."""
+        data = np.asarray(data)
+        if data.dtype.kind == "f":
+            data, ctype = data.astype(np.float32), _FLOAT
+        elif data.max(initial=0) < 0xFFFF:
+            data, ctype = data.astype(np.uint16), _UNSIGNED_SHORT
+        else:
+            data, ctype = data.astype(np.uint32), _UNSIGNED_INT
+        acc = {
+            "bufferView": self._view(data, target),
+            "componentType": ctype,
+            "count": int(len(data) if data.ndim > 1 else data.size),
+            "type": kind,
+        }
+        if bounds:
+            acc["min"] = data.min(axis=0).tolist()
+            acc["max"] = data.max(axis=0).tolist()
+        self.accessors.append(acc)
+        return len(self.accessors) - 1
+
+    def blob(self):
+        return b"".join(self.chunks)
+
+
+def export_glb(scene, path, scale=GLOBAL_SCALE, instancing=True):
+    """Write *scene* to *path* as binary glTF.
+
+    Parameters
+    ----------
+    scene : Scene
+        Scene to export; instances are expanded and regrouped by
+        (mesh, material).
+    path : str or path-like
+        Output ``.glb`` file.
+    scale : float
+        Uniform scale applied at the root node (data units → metres-ish,
+        same default as the Blender renderer).
+    instancing : bool
+        Use ``EXT_mesh_gpu_instancing`` for every (mesh, material) pair
+        used more than once.  When False each object gets its own node.
+
+    Returns
+    -------
+    nbytes : int
+        Size of the written file.
+    """
+    flat = scene.flatten() if scene.instances else scene
+    loc, rot, scl = flat.transforms()
+    mesh_ids = np.array([o.mesh for o in flat.objects], dtype=np.int64)
+    mat_ids = np.array([o.material for o in flat.objects], dtype=np.int64)
+
+    buf = _GlbBuffer()
+
+    materials = []
+    for key in scene.materials:
+        if isinstance(key, str):
+            name, (color, metal, rough) = f"Mat_{key}", MATERIAL_PALETTE[key][:3]
+        else:
+            # A Blender Material passed to a component: its viewport colour
+            name = key.name
+            color = tuple(getattr(key, "diffuse_color", (0.8, 0.8, 0.8, 1.0)))
+            metal, rough = getattr(key, "metallic", 0.0), getattr(key, "roughness", 0.5)
+        materials.append({
+            "name": name,
+            "pbrMetallicRoughness": {
+                "baseColorFactor": list(color),
+                "metallicFactor": metal,
+                "roughnessFactor": rough,
+            },
+            # The meander ribbon is wound inward; render both faces.
+            "doubleSided": True,
+        })
+
+    # Geometry buffers are shared by every primitive using the same mesh
+    positions, indices = {}, {}
+    meshes, nodes = [], []
+    pair_key = mesh_ids * max(len(scene.materials), 1) + mat_ids
+    pairs, inverse = np.unique(pair_key, return_inverse=True)
+    for pair_idx, key in enumerate(pairs):
+        m, mat = divmod(int(key), max(len(scene.materials), 1))
+        if m not in positions:
+            data = scene.meshes[m]
+            positions[m] = buf.accessor(data.vertices, "VEC3",
+                                        _ARRAY_BUFFER, bounds=True)
+            indices[m] = buf.accessor(_triangles(data.faces).ravel(),
+                                      "SCALAR", _ELEMENT_ARRAY_BUFFER)
+        meshes.append({"primitives": [{
+            "attributes": {"POSITION": positions[m]},
+            "indices": indices[m],
+            "material": mat,
+            "mode": _TRIANGLES,
+        }]})
+        mesh_index = len(meshes) - 1
+
+        members = np.flatnonzero(inverse == pair_idx)
+        if instancing and len(members) > 1:
+            quats = _z_rotation_quats(rot[members])
+            nodes.append({
+                "mesh": mesh_index,
+                "extensions": {_INSTANCING: {"attributes": {
+                    "TRANSLATION": buf.accessor(loc[members], "VEC3"),
+                    "ROTATION": buf.accessor(quats, "VEC4"),
+                    "SCALE": buf.accessor(scl[members], "VEC3"),
+                }}},
+            })
+            continue
+        quats = _z_rotation_quats(rot[members])
+        for j, i in enumerate(members):
+            nodes.append({
+                "name": flat.objects[i].name,
+                "mesh": mesh_index,
+                "translation": loc[i].tolist(),
+                "rotation": quats[j].tolist(),
+                "scale": scl[i].tolist(),
+            })
+
+    # Root: Z-up → Y-up (−90° about X) and global scale
+    s45 = float(np.sqrt(0.5))
+    root = {
+        "name": "Chip",
+        "rotation": [-s45, 0.0, 0.0, s45],
+        "scale": [scale] * 3,
+        "children": list(range(len(nodes))),
+    }
+    nodes.append(root)
+
+    blob = buf.blob()
+    gltf = {
+        "asset": {"version": "2.0", "generator": "visualization_3d.gltf"},
+        "scene": 0,
+        "scenes": [{"nodes": [len(nodes) - 1]}],
+        "nodes": nodes,
+        "meshes": meshes,
+        "materials": materials,
+        "accessors": buf.accessors,
+        "bufferViews": buf.buffer_views,
+        "buffers": [{"byteLength": len(blob)}],
+    }
+    if any("extensions" in n for n in nodes):
+        gltf["extensionsUsed"] = [_INSTANCING]
+        gltf["extensionsRequired"] = [_INSTANCING]
+
+    js = json.dumps(gltf, separators=(",", ":")).encode("utf-8")
+    js += b" " * ((-len(js)) % 4)
+    total = 12 + 8 + len(js) + 8 + len(blob)
+    with open(path, "wb") as f:
+        f.write(struct.pack("<III", _GLB_MAGIC, 2, total))
+        f.write(struct.pack("<II", len(js), _CHUNK_JSON))
+        f.write(js)
+        f.write(struct.pack("<II", len(blob), _CHUNK_BIN))
+        f.write(blob)
+    return total
@@ -0,0 +1,138 @@
+"""
+Keyframe value generation for the 3D animations.
+
+Every helper returns whole animation tracks as NumPy arrays — one row per
+frame, one column per channel — so ``animation.write_keyframes`` can
+write them into F-curves in bulk.  No ``bpy`` needed.
+
+Shapes: ``frames`` is ``(F,)``; a single object's track is ``(F, C)``;
+tracks for ``N`` objects are ``(N, F, C)``.  Quaternions are ``(w, x, y, z)``
+like Blender's ``rotation_quaternion``.
+"""
+
+import math
+
+import numpy as np
+
+
+def frame_range(start, end, step=1):
+    """Inclusive frame numbers ``start … end`` as a float array."""
+    return np.arange(start, end + 1, step, dtype=float)
+
+
+def interleave(frames, values):
+    """Return ``(C, 2F)`` float32 ``co`` buffers for ``foreach_set("co", …)``.
+
+    *values* is ``(F,)`` or ``(F, C)``; row ``c`` holds
+    ``[f0, v0, f1, v1, …]`` for channel ``c``.
+    """
+    frames = np.asarray(frames, dtype=np.float32)
+    values = np.asarray(values, dtype=np.float32)
+    if values.ndim == 1:
+        values = values[:, None]
+    if values.shape[0] != len(frames):
+        raise ValueError(f"{len(frames)} frames but {values.shape[0]} value rows")
+    co = np.empty((values.shape[1], len(frames), 2), dtype=np.float32)
+    co[:, :, 0] = frames
+    co[:, :, 1] = values.T
+    return co.reshape(values.shape[1], -1)
+
+
+# ── dephasing arrows ───────────────────────────────────────────────────
+
+def spin_euler(initial_angles, angular_speeds, frames, frames_per_unit=12.0,
+               tilt=math.pi / 2):
+    """Euler tracks ``(N, F, 3)`` of arrows precessing about Z.
+
+    Arrow *i* has ``rotation_euler = (tilt, 0, θᵢ + ωᵢ · 2π · frame /
+    frames_per_unit)`` — the per-frame formula of
+    ``old/dephasing_rotating.py`` evaluated for all arrows and frames at
+    once.
+    """
+    theta0 = np.asarray(initial_angles, dtype=float)[:, None]
+    omega = np.asarray(angular_speeds, dtype=float)[:, None]
+    t = np.asarray(frames, dtype=float)[None, :] / frames_per_unit
+    out = np.zeros(theta0.shape[:1] + t.shape[1:] + (3,))
+    out[..., 0] = tilt
+    out[..., 2] = theta0 + omega * t * 2.0 * math.pi
+    return out
+
+
+# ── cameras ────────────────────────────────────────────────────────────
+
+def _matrix_to_quaternion(m):
+    """Rotation matrices ``(K, 3, 3)`` → quaternions ``(K, 4)`` (w, x, y, z)."""
+    m00, m11, m22 = m[..., 0, 0], m[..., 1, 1], m[..., 2, 2]
+    trace = m00 + m11 + m22
+    q = np.empty((len(m), 4))
+
+    # Pick the numerically safest branch per matrix
+    branch = np.argmax(np.stack([trace, m00, m11, m22]), axis=0)
+
+    s = np.sqrt(np.maximum(1.0 + trace, 1e-12)) * 2
+    b = branch == 0
+    q[b] = np.stack([0.25 * s[b],
+                     (m[b, 2, 1] - m[b, 1, 2]) / s[b],
+                     (m[b, 0, 2] - m[b, 2, 0]) / s[b],
+                     (m[b, 1, 0] - m[b, 0, 1]) / s[b]], axis=-1)
+    for axis in range(3):
+        b = branch == axis + 1
+        if not b.any():
+            continue
+        i, j, k = axis, (axis + 1) % 3, (axis + 2) % 3
+        mb = m[b]
+        s = np.sqrt(np.maximum(1.0 + mb[:, i, i] - mb[:, j, j] - mb[:, k, k],
+                               1e-12)) * 2
+        qb = np.empty((len(mb), 4))
+        qb[:, 0] = (mb[:, k, j] - mb[:, j, k]) / s
+        qb[:, 1 + i] = 0.25 * s
+        qb[:, 1 + j] = (mb[:, j, i] + mb[:, i, j]) / s
+        qb[:, 1 + k] = (mb[:, k, i] + mb[:, i, k]) / s
+        q[b] = qb
+    return q
+
+
+def look_at_matrices(locations, target, up=(0, 0, 1)):
+    """Camera rotation matrices ``(F, 3, 3)`` aiming local −Z at *target*.
+
+    *target* is one point ``(3,)`` or one per frame ``(F, 3)``.  Local +Y
+    stays as close to *up* as possible (``to_track_quat('-Z', 'Y')``).
+    """
+    loc = np.atleast_2d(np.asarray(locations, dtype=float))
+    fwd = np.asarray(target, dtype=float) - loc
+    z = -fwd / np.linalg.norm(fwd, axis=-1, keepdims=True)
+    x = np.cross(np.broadcast_to(np.asarray(up, dtype=float), z.shape), z)
+    norm = np.linalg.norm(x, axis=-1, keepdims=True)
+    # Looking straight along *up*: fall back to world X
+    degenerate = norm[:, 0] < 1e-9
+    x[degenerate] = (1.0, 0.0, 0.0)
+    norm[degenerate] = 1.0
+    x /= norm
+    y = np.cross(z, x)
+    return np.stack([x, y, z], axis=-1)
+
+
+def look_at_quaternions(locations, target, up=(0, 0, 1)):
+    """``rotation_quaternion`` track ``(F, 4)`` for :func:`look_at_matrices`.
+
+    Signs are chosen so consecutive keys lie in the same hemisphere;
+    otherwise the interpolation would take the long way round.
+    """
+    q = _matrix_to_quaternion(look_at_matrices(locations, target, up))
+    flips = np.sign(np.einsum("ij,ij->i", q[1:], q[:-1]))
+    flips[flips == 0] = 1
+    q[1:] *= np.cumprod(flips)[:, None]
+    return q
+
+
+def look_at_euler(locations, target, up=(0, 0, 1)):
+    """XYZ ``rotation_euler`` track ``(F, 3)`` for :func:`look_at_matrices`.
+
+    Unwrapped along the frames so interpolation never spins the long way
+    round.
+    """
+    m = look_at_matrices(locations, target, up)
+    ry = np.arcsin(np.clip(-m[:, 2, 0], -1.0, 1.0))
+    rx = np.arctan2(m[:, 2, 1], m[:, 2, 2])
+    rz = np.arctan2(m[:, 1, 0], m[:, 0, 0])
+    return np.unwrap(np.stack([rx, ry, rz], axis=-1), axis=0)
@@ -0,0 +1,295 @@
+"""
+Matplotlib preview of a dephasing ensemble, without Blender.
+
+Shows the Bloch vectors of a :class:`~visualization_3d.dephasing.Ensemble`
+(equatorial projection, or a 3D view) next to the coherence trace, played
+back with ``FuncAnimation`` blitting: the static sphere outline and trace
+are drawn once, and each frame only redraws the arrows, the mean vector
+and the time cursor::
+
+    from visualization_3d.dephasing import Telegraph, simulate
+    from visualization_3d.preview import DephasingPreview
+
+    ens = simulate(Telegraph(1.0, 0.5), n=20_000, steps=600, dt=0.02,
+                   keep=200, stride=5)
+    DephasingPreview(ens).show()             # real-time playback
+    DephasingPreview(ens).save("dephasing.gif", fps=30)
+
+or from the command line::
+
+    python -m visualization_3d.preview telegraph --amplitude 1 --rate 0.5
+    python -m visualization_3d.preview ou --sigma 1 --tau 2 -o ou.gif
+
+``save`` renders off-screen with Agg (no pyplot) and streams frames to
+GIF / APNG through :mod:`visualization_3d.frames`; ``.mp4`` goes through
+matplotlib's ffmpeg writer.  Requires matplotlib; no ``bpy`` needed.
+"""
+
+import argparse
+import math
+import os
+import sys
+
+import numpy as np
+from matplotlib import animation
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.collections import LineCollection
+from matplotlib.figure import Figure
+
+SPHERE_COLOR = "#7aa6a6"
+MEAN_COLOR = "#d62728"
+ARROW_CMAP = "coolwarm"
+
+
+class DephasingPreview:
+    """Two-panel animation of *ensemble*: Bloch vectors and coherence.
+
+    Parameters
+    ----------
+    ensemble : dephasing.Ensemble
+        Simulation result; the first *max_arrows* kept trajectories are
+        drawn, the coherence covers the whole ensemble.
+    theta : float
+        Polar angle of the spins (π/2: equatorial).
+    projection : "2d" or "3d"
+        Equatorial projection, or a 3D view of the sphere.
+    """
+
+    def __init__(self, ensemble, theta=math.pi / 2, max_arrows=256,
+                 projection="2d", figsize=(9.0, 4.0)):
+        if projection not in ("2d", "3d"):
+            raise ValueError(f"projection must be '2d' or '3d', got {projection!r}")
+        self.ensemble = ensemble
+        self.theta = theta
+        self.projection = projection
+        self.figsize = figsize
+        k = min(max_arrows, len(ensemble.phases))
+        # (K, F, 3) arrow tips, computed once for all frames
+        self.tips = ensemble.direction_tracks(theta)[:k]
+        # Ensemble mean vector per frame (whole ensemble, not just the arrows)
+        steps = np.searchsorted(ensemble.times, ensemble.frame_times)
+        self.coherence = ensemble.coherence[steps]
+        self.mean_phase = ensemble.mean_phase[steps]
+        detuning = ensemble.detunings[:k, 0]
+        span = np.abs(detuning).max() or 1.0
+        self.colors = _cmap(ARROW_CMAP)(0.5 + 0.5 * detuning / span)
+
+    @property
+    def n_frames(self):
+        return self.tips.shape[1]
+
+    # ── figure ──────────────────────────────────────────────────────────
+
+    def _mean_tip(self, i):
+        r = self.coherence[i] * math.sin(self.theta)
+        return (r * math.cos(self.mean_phase[i]), r * math.sin(self.mean_phase[i]),
+                self.coherence[i] * math.cos(self.theta))
+
+    def _bloch_axes(self, fig):
+        """Sphere panel with its static decorations; returns (ax, arrows, mean)."""
+        u = np.linspace(0.0, 2 * math.pi, 181)
+        if self.projection == "2d":
+            ax = fig.add_subplot(1, 2, 1)
+            ax.plot(np.cos(u), np.sin(u), color=SPHERE_COLOR, lw=1.0)
+            ax.axhline(0, color=SPHERE_COLOR, lw=0.5)
+            ax.axvline(0, color=SPHERE_COLOR, lw=0.5)
+            ax.set_xlim(-1.15, 1.15)
+            ax.set_ylim(-1.15, 1.15)
+            ax.set_aspect("equal")
+            ax.set_axis_off()
+            arrows = LineCollection([], colors=self.colors, lw=1.0, alpha=0.8)
+            ax.add_collection(arrows)
+            mean, = ax.plot([], [], color=MEAN_COLOR, lw=2.5)
+            return ax, arrows, mean
+
+        from mpl_toolkits.mplot3d.art3d import Line3DCollection
+        ax = fig.add_subplot(1, 2, 1, projection="3d")
+        zero = np.zeros_like(u)
+        ax.plot(np.cos(u), np.sin(u), zero, color=SPHERE_COLOR, lw=0.8)
+        ax.plot(zero, np.cos(u), np.sin(u), color=SPHERE_COLOR, lw=0.8)
+        ax.plot(np.cos(u), zero, np.sin(u), color=SPHERE_COLOR, lw=0.8)
+        # add_collection3d needs segments to exist; start from frame 0
+        first = np.stack([np.zeros_like(self.tips[:, 0]), self.tips[:, 0]], axis=1)
+        arrows = Line3DCollection(first, colors=self.colors, lw=1.0, alpha=0.8)
+        ax.add_collection3d(arrows)
+        mean, = ax.plot([], [], [], color=MEAN_COLOR, lw=2.5)
+        for lim in (ax.set_xlim, ax.set_ylim, ax.set_zlim):
+            lim(-1, 1)
+        ax.set_box_aspect((1, 1, 1))
+        ax.set_axis_off()
+        return ax, arrows, mean
+
+    def build(self, fig):
+        """Draw the static parts into *fig*; return ``update(i) -> artists``."""
+        ax, arrows, mean = self._bloch_axes(fig)
+        ens = self.ensemble
+        trace = fig.add_subplot(1, 2, 2)
+        trace.plot(ens.times, ens.coherence, color="k", lw=1.2)
+        trace.set_xlim(ens.times[0], ens.times[-1])
+        trace.set_ylim(0, 1.05)
+        trace.set_xlabel("time")
+        trace.set_ylabel("coherence")
+        cursor, = trace.plot([], [], "o", color=MEAN_COLOR, ms=5)
+        vline = trace.axvline(ens.frame_times[0], color=MEAN_COLOR, lw=0.8)
+        fig.tight_layout()
+
+        origin = np.zeros((len(self.tips), 3))
+        is_3d = self.projection == "3d"
+        # Arrows, mean and cursor change every frame and are animated:
+        # excluded from the cached background, redrawn over it by blitting
+        for artist in (arrows, mean, cursor, vline):
+            artist.set_animated(True)
+
+        def update(i):
+            tips = self.tips[:, i]
+            x, y, z = self._mean_tip(i)
+            t = ens.frame_times[i]
+            if is_3d:
+                arrows.set_segments(np.stack([origin, tips], axis=1))
+                # Blitting draws the collection without Axes3D.draw, so
+                # project it here (once the axes has a view matrix)
+                if ax.M is not None:
+                    arrows.do_3d_projection()
+                mean.set_data_3d([0, x], [0, y], [0, z])
+            else:
+                arrows.set_segments(np.stack([origin[:, :2], tips[:, :2]], axis=1))
+                mean.set_data([0, x], [0, y])
+            cursor.set_data([t], [self.coherence[i]])
+            vline.set_xdata([t, t])
+            return arrows, mean, cursor, vline
+
+        update(0)
+        return update
+
+    # ── playback / export ───────────────────────────────────────────────
+
+    def animate(self, fig=None, fps=30.0, repeat=True):
+        """Blitted ``FuncAnimation`` at *fps* (a pyplot figure when *fig* is None).
+
+        Keep a reference to the result while it plays.
+        """
+        if fig is None:
+            import matplotlib.pyplot as plt
+            fig = plt.figure(figsize=self.figsize)
+        update = self.build(fig)
+        return animation.FuncAnimation(
+            fig, update, frames=self.n_frames, interval=1000.0 / fps,
+            blit=True, repeat=repeat, cache_frame_data=False)
+
+    def show(self, fps=30.0):
+        """Play the preview in a pyplot window."""
+        import matplotlib.pyplot as plt
+        anim = self.animate(fps=fps)
+        plt.show()
+        return anim
+
+    def images(self, dpi=100, frames=None):
+        """Yield frames (default: all) as RGB ``PIL.Image``, rendered off-screen."""
+        from PIL import Image
+        fig = Figure(figsize=self.figsize, dpi=dpi)
+        canvas = FigureCanvasAgg(fig)
+        update = self.build(fig)
+        canvas.draw()
+        background = canvas.copy_from_bbox(fig.bbox)
+        for i in range(self.n_frames) if frames is None else frames:
+            # Same blitting as on screen: restore the static background
+            # and draw only the animated artists
+            canvas.restore_region(background)
+            for artist in update(i):
+                artist.axes.draw_artist(artist)
+            yield Image.frombuffer("RGBA", canvas.get_width_height(),
+                                   canvas.buffer_rgba(), "raw", "RGBA", 0, 1
+                                   ).convert("RGB")
+
+    def save(self, path, fps=30.0, dpi=100, loop=0):
+        """Export to ``.gif``, ``.png`` (APNG) or ``.mp4`` (needs ffmpeg)."""
+        from PIL import Image
+        from . import frames
+        ext = os.path.splitext(path)[1].lower()
+        if ext == ".mp4":
+            if not animation.writers.is_available("ffmpeg"):
+                raise RuntimeError("MP4 export needs ffmpeg on PATH; "
+                                   "save as .gif or .png instead")
+            fig = Figure(figsize=self.figsize, dpi=dpi)
+            FigureCanvasAgg(fig)
+            update = self.build(fig)
+            anim = animation.FuncAnimation(fig, update, frames=self.n_frames,
+                                           blit=True, cache_frame_data=False)
+            anim.save(path, writer=animation.FFMpegWriter(fps=fps), dpi=dpi)
+        elif ext == ".gif":
+            # One palette for all frames, fitted to the first, middle and last
+            sample = list(self.images(dpi, (0, self.n_frames // 2,
+                                            self.n_frames - 1)))
+            sheet = np.concatenate([np.asarray(im) for im in sample])
+            palette = (Image.fromarray(sheet)
+                       .quantize(colors=256, method=Image.Quantize.MEDIANCUT)
+                       .getpalette()[:768])
+            carrier = frames.palette_image(palette)
+            with frames.GifWriter(path, sample[0].size, palette, fps=fps,
+                                  loop=loop) as gif:
+                for im in self.images(dpi):
+                    gif.write(im.quantize(palette=carrier,
+                                          dither=Image.Dither.NONE))
+        elif ext in (".png", ".apng"):
+            with frames.ApngWriter(path, fps=fps, loop=loop) as png:
+                for im in self.images(dpi):
+                    png.write(im)
+        else:
+            raise ValueError(f"unsupported format {ext!r} (use .gif, .png, .mp4)")
+        return path
+
+
+def _cmap(name):
+    import matplotlib
+    return matplotlib.colormaps[name]
+
+
+# ── CLI ─────────────────────────────────────────────────────────────────
+
+def main(argv=None):
+    from .dephasing import QuasiStatic, OrnsteinUhlenbeck, Telegraph, simulate
+
+    parser = argparse.ArgumentParser(
+        prog="python -m visualization_3d.preview",
+        description="Simulate a dephasing ensemble and preview it.",
+    )
+    parser.add_argument("model", choices=("static", "ou", "telegraph"))
+    parser.add_argument("--sigma", type=float, default=1.0,
+                        help="r.m.s. detuning (static, ou)")
+    parser.add_argument("--tau", type=float, default=2.0,
+                        help="correlation time (ou)")
+    parser.add_argument("--amplitude", type=float, default=1.0,
+                        help="detuning amplitude (telegraph)")
+    parser.add_argument("--rate", type=float, default=0.5,
+                        help="switching rate (telegraph)")
+    parser.add_argument("-n", type=int, default=20_000, help="trajectories")
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument("--frames", type=int, default=150)
+    parser.add_argument("--substeps", type=int, default=4,
+                        help="simulation steps per frame")
+    parser.add_argument("--arrows", type=int, default=200)
+    parser.add_argument("--3d", dest="three_d", action="store_true")
+    parser.add_argument("--fps", type=float, default=30.0)
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("-o", "--out", default=None,
+                        help="write .gif/.png/.mp4 instead of playing")
+    args = parser.parse_args(argv)
+
+    model = {"static": lambda: QuasiStatic(args.sigma),
+             "ou": lambda: OrnsteinUhlenbeck(args.sigma, args.tau),
+             "telegraph": lambda: Telegraph(args.amplitude, args.rate)}[args.model]()
+    steps = args.frames * args.substeps
+    ens = simulate(model, args.n, steps, args.duration / steps, keep=args.arrows,
+                   stride=args.substeps, seed=args.seed)
+    preview = DephasingPreview(ens, max_arrows=args.arrows,
+                               projection="3d" if args.three_d else "2d")
+    if args.out:
+        preview.save(args.out, fps=args.fps)
+        print(f"[preview] {preview.n_frames} frames -> {args.out}")
+    else:
+        preview.show(fps=args.fps)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -8,14 +8,15 @@ heights to create the layered thin-film structure.
 """
 
 import bpy
-import bmesh
-import math
 import numpy as np
 
-
-# ── global scale ────────────────────────────────────────────────────────
-
-GLOBAL_SCALE = 0.01   # shrink data-unit coords → Blender units
+from .geometry import (
+    GLOBAL_SCALE,
+    MATERIAL_PALETTE,
+    extruded_path_mesh,
+    dolan_bridge_mesh,
+    half_bridge_mesh,
+)
 
 
 # ── materials ───────────────────────────────────────────────────────────
@@ -132,20 +133,16 @@ def create_material(
 # Shared material palette (lazy-created on first use)
 _MAT_CACHE: dict = {}
 
-def get_material(key: str):
-    """Return a shared material from a fixed palette."""
+def get_material(key):
+    """Return a shared material from ``MATERIAL_PALETTE``.
+
+    A ``bpy`` Material (anything but a palette key string) is returned
+    as is.
+    """
+    if not isinstance(key, str):
+        return key
     if key not in _MAT_CACHE:
-        # Niobium (blue-silver) for data qubits, gold for couplers,
-        # medium-grey silicon substrate.
-        #                       color                            metal  rough  bump   noise_scale
-        palette = {
-            "aluminum":  ((0.62, 0.66, 0.78, 1),               0.90,  0.40,  0.7,   500.0),   # Nb blue-silver
-            "aluminum2": ((0.55, 0.60, 0.74, 1),               0.90,  0.45,  0.9,   600.0),   # Nb bridge layer
-            "junction":  ((0.50, 0.53, 0.62, 1),               0.80,  0.50,  0.5,   400.0),   # Al oxide barrier
-            "substrate": ((0.35, 0.35, 0.37, 1),               0.05,  0.12,  0.15,  150.0),   # Si wafer grey
-            "coupler":   ((0.72, 0.63, 0.38, 1),               0.90,  0.35,  0.7,   500.0),   # TiN gold
-        }
-        color, metal, rough, bump_s, noise_s = palette[key]
+        color, metal, rough, bump_s, noise_s = MATERIAL_PALETTE[key]
         _MAT_CACHE[key] = create_material(
             f"Mat_{key}", color, metal, rough,
             bump_strength=bump_s, noise_scale=noise_s,
@@ -155,10 +152,17 @@ def get_material(key: str):
 
 # ── scene helpers ───────────────────────────────────────────────────────
 
+# Custom property marking collections created by ``bpy_backend.upload``
+CHIP_TAG = "chip_scene"
+
+
 def clear_scene():
     """Delete every object and purge orphan data."""
     bpy.ops.object.select_all(action="SELECT")
     bpy.ops.object.delete()
+    for coll in list(bpy.data.collections):
+        if coll.get(CHIP_TAG):
+            bpy.data.collections.remove(coll)
     for block in bpy.data.meshes:
         if block.users == 0:
             bpy.data.meshes.remove(block)
@@ -168,6 +172,49 @@ def clear_scene():
     _MAT_CACHE.clear()  # avoid stale references to deleted materials
 
 
+# ── bulk mesh upload ────────────────────────────────────────────────────
+
+def new_mesh(name, vertices, faces):
+    """Create a mesh datablock from NumPy quad buffers in one bulk write.
+
+    Uses ``foreach_set`` on the vertex/loop/polygon collections instead of
+    per-element bmesh calls.  *faces* is an ``(M, 4)`` (quads) or
+    ``(M, 3)`` (triangles) int array.
+    """
+    verts = np.ascontiguousarray(vertices, dtype=np.float32).reshape(-1, 3)
+    faces = np.asarray(faces, dtype=np.int32)
+    k = faces.shape[1] if faces.ndim == 2 else 4
+    faces = np.ascontiguousarray(faces).reshape(-1, k)
+
+    mesh = bpy.data.meshes.new(name)
+    mesh.vertices.add(len(verts))
+    mesh.vertices.foreach_set("co", verts.ravel())
+    mesh.loops.add(faces.size)
+    mesh.loops.foreach_set("vertex_index", faces.ravel())
+    mesh.polygons.add(len(faces))
+    mesh.polygons.foreach_set(
+        "loop_start", np.arange(0, faces.size, k, dtype=np.int32))
+    if bpy.app.version < (4, 0, 0):
+        # loop_total is derived from loop_start from Blender 4.0 on
+        mesh.polygons.foreach_set(
+            "loop_total", np.full(len(faces), k, dtype=np.int32))
+    mesh.update()
+    return mesh
+
+
+def create_mesh_object(name, vertices, faces, location=(0, 0, 0),
+                       material=None, rotation_euler=(0, 0, 0)):
+    """Link a new object built from NumPy buffers into the active collection."""
+    mesh = new_mesh(name + "_Mesh", vertices, faces)
+    obj = bpy.data.objects.new(name, mesh)
+    bpy.context.collection.objects.link(obj)
+    obj.location = location
+    obj.rotation_euler = rotation_euler
+    if material:
+        obj.data.materials.append(material)
+    return obj
+
+
 # ── basic shapes ────────────────────────────────────────────────────────
 
 def create_cuboid(location, dimensions, name="Cuboid", material=None,
@@ -187,7 +234,7 @@ def create_cuboid(location, dimensions, name="Cuboid", material=None,
     return obj
 
 
-# ── extruded path (bmesh ribbon with rectangular cross-section) ─────────
+# ── extruded path (ribbon with rectangular cross-section) ───────────────
 
 def create_extruded_path(
     points_2d,
@@ -203,7 +250,8 @@ def create_extruded_path(
     Builds a fully closed mesh: at every centreline vertex we place four
     corners of the rectangle (oriented perpendicular to the path
     direction), then stitch adjacent quads for top, bottom, and two side
-    walls, plus end-caps.
+    walls, plus end-caps.  Geometry comes from
+    ``geometry.extruded_path_mesh``.
 
     Parameters
     ----------
@@ -217,84 +265,11 @@ def create_extruded_path(
     location : (x, y, z)
         World offset applied to the whole object.
     """
-    pts = list(points_2d)
-    n = len(pts)
-    if n < 2:
+    built = extruded_path_mesh(points_2d, width, height)
+    if built is None:
         return None
-
-    hw = width / 2
-    hh = height / 2
-
-    mesh = bpy.data.meshes.new(name + "_Mesh")
-    obj = bpy.data.objects.new(name, mesh)
-    bpy.context.collection.objects.link(obj)
-
-    bm = bmesh.new()
-
-    # For each centreline point compute a perpendicular direction in XY,
-    # then place 4 verts: bottom-left, bottom-right, top-right, top-left.
-    rings = []  # list of (v_bl, v_br, v_tr, v_tl) per point
-
-    for i in range(n):
-        px, py = pts[i]
-
-        # Tangent direction: average of segments before & after
-        if i == 0:
-            tx, ty = pts[1][0] - px, pts[1][1] - py
-        elif i == n - 1:
-            tx, ty = px - pts[i - 1][0], py - pts[i - 1][1]
-        else:
-            tx = pts[i + 1][0] - pts[i - 1][0]
-            ty = pts[i + 1][1] - pts[i - 1][1]
-
-        tlen = math.hypot(tx, ty)
-        if tlen < 1e-9:
-            tx, ty = 1.0, 0.0
-        else:
-            tx /= tlen
-            ty /= tlen
-
-        # Perpendicular (rotate tangent 90° CCW)
-        nx, ny = -ty, tx
-
-        # Four corners of the rectangle at this point
-        v_bl = bm.verts.new((px + nx * hw, py + ny * hw, -hh))
-        v_br = bm.verts.new((px - nx * hw, py - ny * hw, -hh))
-        v_tr = bm.verts.new((px - nx * hw, py - ny * hw,  hh))
-        v_tl = bm.verts.new((px + nx * hw, py + ny * hw,  hh))
-        rings.append((v_bl, v_br, v_tr, v_tl))
-
-    bm.verts.ensure_lookup_table()
-
-    # Stitch adjacent rings with quad faces
-    for i in range(n - 1):
-        bl0, br0, tr0, tl0 = rings[i]
-        bl1, br1, tr1, tl1 = rings[i + 1]
-
-        # Bottom face (Z = -hh side)
-        bm.faces.new((bl0, br0, br1, bl1))
-        # Top face (Z = +hh side)
-        bm.faces.new((tl0, tl1, tr1, tr0))
-        # Left wall
-        bm.faces.new((bl0, bl1, tl1, tl0))
-        # Right wall
-        bm.faces.new((br0, tr0, tr1, br1))
-
-    # End caps
-    bl, br, tr, tl = rings[0]
-    bm.faces.new((bl, tl, tr, br))
-    bl, br, tr, tl = rings[-1]
-    bm.faces.new((bl, br, tr, tl))
-
-    bm.to_mesh(mesh)
-    bm.free()
-
-    obj.location = location
-    obj.rotation_euler = rotation_euler
-
-    if material:
-        obj.data.materials.append(material)
-    return obj
+    return create_mesh_object(name, *built, location=location,
+                              material=material, rotation_euler=rotation_euler)
 
 
 # ── Dolan bridge (sigmoid-profile top electrode) ───────────────────────
@@ -345,70 +320,10 @@ def create_dolan_bridge(
     steepness : float
         Sigmoid sharpness.
     """
-    mesh = bpy.data.meshes.new(name + "_Mesh")
-    obj = bpy.data.objects.new(name, mesh)
-    bpy.context.collection.objects.link(obj)
-
-    bm = bmesh.new()
-
-    xs = np.linspace(-total_length / 2, total_length / 2, res_x)
-    left_step = -total_length / 2 + overlap_len
-    right_step = total_length / 2 - overlap_len
-
-    def sigmoid_z(x):
-        """Bottom-surface Z: h_step on islands, 0 in gap."""
-        s_left = 1 / (1 + math.exp(steepness * (x - left_step)))
-        s_right = 1 / (1 + math.exp(-steepness * (x - right_step)))
-        return h_step * (s_left + s_right)
-
-    # Build four rows of vertices per x-slice:
-    #   bottom-left, bottom-right, top-left, top-right
-    bot_rows = []   # (v_bl, v_br)
-    top_rows = []   # (v_tl, v_tr)
-    hy = width / 2
-    for x in xs:
-        zb = sigmoid_z(x)
-        zt = zb + thickness
-        v_bl = bm.verts.new((x, -hy, zb))
-        v_br = bm.verts.new((x,  hy, zb))
-        v_tl = bm.verts.new((x, -hy, zt))
-        v_tr = bm.verts.new((x,  hy, zt))
-        bot_rows.append((v_bl, v_br))
-        top_rows.append((v_tl, v_tr))
-
-    bm.verts.ensure_lookup_table()
-    n = len(xs)
-    for i in range(n - 1):
-        bl0, br0 = bot_rows[i]
-        bl1, br1 = bot_rows[i + 1]
-        tl0, tr0 = top_rows[i]
-        tl1, tr1 = top_rows[i + 1]
-        # bottom face (normal down)
-        bm.faces.new((bl0, br0, br1, bl1))
-        # top face (normal up)
-        bm.faces.new((tl0, tl1, tr1, tr0))
-        # left side wall (y = -hy, normal -Y)
-        bm.faces.new((bl0, bl1, tl1, tl0))
-        # right side wall (y = +hy, normal +Y)
-        bm.faces.new((br0, tr0, tr1, br1))
-
-    # end caps
-    bl0, br0 = bot_rows[0]
-    tl0, tr0 = top_rows[0]
-    bm.faces.new((bl0, tl0, tr0, br0))     # left end
-    bl_n, br_n = bot_rows[-1]
-    tl_n, tr_n = top_rows[-1]
-    bm.faces.new((bl_n, br_n, tr_n, tl_n)) # right end
-
-    bm.to_mesh(mesh)
-    bm.free()
-
-    obj.location = location
-    obj.rotation_euler = rotation_euler
-
-    if material:
-        obj.data.materials.append(material)
-    return obj
+    verts, faces = dolan_bridge_mesh(total_length, width, h_step, thickness,
+                                     overlap_len, steepness, res_x)
+    return create_mesh_object(name, verts, faces, location=location,
+                              material=material, rotation_euler=rotation_euler)
 
 
 # ── Half bridge (single sigmoid, one wing) ─────────────────────────────
@@ -439,58 +354,7 @@ def create_half_bridge(
     midpoint, and the other bar is this half-bridge (Layer 2) that
     overlaps it.
     """
-    mesh = bpy.data.meshes.new(name + "_Mesh")
-    obj = bpy.data.objects.new(name, mesh)
-    bpy.context.collection.objects.link(obj)
-
-    bm = bmesh.new()
-
-    xs = np.linspace(-total_length / 2, total_length / 2, res_x)
-    # Sigmoid transition happens near the +X end
-    step_x = total_length / 2 - overlap_len
-
-    def sigmoid_z(x):
-        s = 1 / (1 + math.exp(-steepness * (x - step_x)))
-        return h_step * s
-
-    bot_rows = []
-    top_rows = []
-    hy = width / 2
-    for x in xs:
-        zb = sigmoid_z(x)
-        zt = zb + thickness
-        v_bl = bm.verts.new((x, -hy, zb))
-        v_br = bm.verts.new((x,  hy, zb))
-        v_tl = bm.verts.new((x, -hy, zt))
-        v_tr = bm.verts.new((x,  hy, zt))
-        bot_rows.append((v_bl, v_br))
-        top_rows.append((v_tl, v_tr))
-
-    bm.verts.ensure_lookup_table()
-    n = len(xs)
-    for i in range(n - 1):
-        bl0, br0 = bot_rows[i]
-        bl1, br1 = bot_rows[i + 1]
-        tl0, tr0 = top_rows[i]
-        tl1, tr1 = top_rows[i + 1]
-        bm.faces.new((bl0, br0, br1, bl1))   # bottom
-        bm.faces.new((tl0, tl1, tr1, tr0))   # top
-        bm.faces.new((bl0, bl1, tl1, tl0))   # left wall
-        bm.faces.new((br0, tr0, tr1, br1))   # right wall
-
-    # end caps
-    bl0, br0 = bot_rows[0];   tl0, tr0 = top_rows[0]
-    bm.faces.new((bl0, tl0, tr0, br0))
-    bl_n, br_n = bot_rows[-1]; tl_n, tr_n = top_rows[-1]
-    bm.faces.new((bl_n, br_n, tr_n, tl_n))
-
-    bm.to_mesh(mesh)
-    bm.free()
-
-    obj.location = location
-    obj.rotation_euler = rotation_euler
-
-    if material:
-        obj.data.materials.append(material)
-    return obj
-
+    verts, faces = half_bridge_mesh(total_length, width, h_step, thickness,
+                                    overlap_len, steepness, res_x)
+    return create_mesh_object(name, verts, faces, location=location,
+                              material=material, rotation_euler=rotation_euler)
@@ -10,89 +10,184 @@ import bpy
 import math
 import numpy as np
 
+from visualization import instrument
 from visualization.lattice import SquareLattice
-from .components import Fluxonium3D, Coupler3D, LAYER_H
-from .primitives import clear_scene, create_cuboid, get_material, GLOBAL_SCALE
+from .bpy_backend import SceneIndex, upload, set_visible
+from .camera import keyframe_path, follow_path, camera_only
+from .chip import ChipBuilder
+from .primitives import clear_scene, CHIP_TAG, GLOBAL_SCALE
 
 
 class BlenderRenderer:
-    """Render a full chip lattice in Blender, mirroring the 2D layout."""
+    """Render a full chip lattice in Blender, mirroring the 2D layout.
+
+    Geometry is generated by :class:`~visualization_3d.chip.ChipBuilder`
+    as a pure-NumPy scene and uploaded as a hierarchy: one collection and
+    parent empty per qubit/coupler under a root empty ``"Chip"`` that
+    carries ``GLOBAL_SCALE``.  ``self.index`` maps names to the created
+    objects and collections.
+    """
+
+    ROOT_NAME = "Chip"
+
+    # Custom properties written on every component holder / top-level object
+    TAG_CONTENT = "chip_content"   # geometry hash (dims)
+    TAG_HASH = "chip_hash"         # geometry + placement hash
 
     def __init__(self, lattice: SquareLattice):
         self.lattice = lattice
-        self.fluxonium_3d = Fluxonium3D(lattice.fluxonium_dims)
-        self.coupler_3d = Coupler3D(lattice.coupler_dims)
-
-    def render(self):
-        clear_scene()
-        # Re-create components so material references are fresh
-        self.fluxonium_3d = Fluxonium3D(self.lattice.fluxonium_dims)
-        self.coupler_3d = Coupler3D(self.lattice.coupler_dims)
-        self._draw_data_qubits()
-        self._draw_couplers()
-        self._draw_substrate()
-        self._apply_global_scale()
-        self._setup_scene()
-        print("Rendering complete.")
-
-    def _draw_data_qubits(self):
-        print(f"Rendering {len(self.lattice.site_positions)} fluxoniums...")
-        for idx, ((r, c), pos) in enumerate(
-            sorted(self.lattice.site_positions.items())
-        ):
-            self.fluxonium_3d.place(
-                (pos[0], pos[1], 0),
-                angle_deg=0,
-                name_prefix=f"D{idx}",
-            )
-
-    def _draw_couplers(self):
-        print(f"Rendering {len(self.lattice.edge_positions)} couplers...")
-        for idx, (edge_key, edge_info) in enumerate(
-            sorted(self.lattice.edge_positions.items())
-        ):
-            pos = edge_info["xy"]
-            direction = edge_info["direction"]
-            angle = 0 if direction == "horizontal" else 90
-            mirror = self.lattice._mirror_for_edge(edge_key, direction)
-
-            self.coupler_3d.place(
-                (pos[0], pos[1], 0),
-                angle_deg=angle,
-                mirror=mirror,
-                name_prefix=f"C{idx}",
-            )
-
-    def _draw_substrate(self):
-        (xmin, xmax), (ymin, ymax) = self.lattice.auto_lims(margin=200)
-        cx = (xmin + xmax) / 2
-        cy = (ymin + ymax) / 2
-        w = (xmax - xmin) * 5
-        ht = (ymax - ymin) * 5
-
-        # Flat plane slightly below z=0 to avoid z-fighting with object bottoms
-        bpy.ops.mesh.primitive_plane_add(
-            size=1,
-            location=(cx, cy, -0.05),
-        )
-        sub = bpy.context.object
-        sub.name = "Substrate"
-        sub.scale = (w / 2, ht / 2, 1)
-        mat = get_material("substrate")
-        sub.data.materials.append(mat)
-
-    def _apply_global_scale(self):
-        """Scale all mesh objects by GLOBAL_SCALE to shrink to Blender-friendly size."""
-        s = GLOBAL_SCALE
-        bpy.ops.object.select_all(action="SELECT")
-        # Apply scale to every object's location + dimensions
-        for obj in bpy.context.selected_objects:
-            obj.location = (obj.location.x * s, obj.location.y * s, obj.location.z * s)
-            obj.scale = (obj.scale.x * s, obj.scale.y * s, obj.scale.z * s)
-        bpy.ops.object.select_all(action="DESELECT")
+        self.builder = ChipBuilder(lattice)
+        self.index = None
+
+    def render(self, incremental=False):
+        """Build the chip in Blender.
+
+        Parameters
+        ----------
+        incremental : bool
+            Reuse the chip already in the scene: components whose dims and
+            placement hashes match the stored tags are kept, moved ones are
+            re-positioned, and only new or changed ones are rebuilt.
+            Materials are kept across runs.  Falls back to a full rebuild
+            when no chip exists yet.
+
+        Returns
+        -------
+        stats : dict
+            Number of components ``created``, ``updated`` (moved),
+            ``deleted`` and ``kept``.
+        """
+        print(f"Building {self.lattice.num_data_qubits} fluxoniums and "
+              f"{self.lattice.num_couplers} couplers...")
+        with instrument.stage("render"):
+            scene = self.builder.build()
+            root = bpy.data.objects.get(self.ROOT_NAME) if incremental else None
+            if root is None:
+                with instrument.stage("clear_scene"):
+                    clear_scene()
+                with instrument.stage("upload"):
+                    self.index = upload(scene, root=self.ROOT_NAME,
+                                        root_scale=GLOBAL_SCALE)
+                    signatures = scene.signatures()
+                    self._tag(signatures)
+                stats = {"created": len(signatures), "updated": 0,
+                         "deleted": 0, "kept": 0}
+            else:
+                with instrument.stage("incremental"):
+                    stats = self._render_incremental(scene, root)
+            with instrument.stage("setup_scene"):
+                self._setup_scene()
+        instrument.count("blender.objects", len(self.index))
+        print("Rendering complete: " +
+              ", ".join(f"{v} {k}" for k, v in stats.items()))
+        return stats
+
+    def animate_camera(self, path, constraints=False):
+        """Move ``ChipCamera`` along *path* (``camera_paths.CameraPath``).
+
+        Written as bulk F-curves, or with *constraints* as a Follow Path /
+        Track To rig.  Persistent render data is enabled so every frame
+        only re-evaluates the camera.  Call after :meth:`render`.
+        """
+        cam = bpy.data.objects["ChipCamera"]
+        if constraints:
+            follow_path(cam, path)
+        else:
+            keyframe_path(cam, path)
+        others = camera_only(camera=cam)
+        if others:
+            print(f"Note: {len(others)} other animated objects will be "
+                  f"re-evaluated per frame")
+        return cam
+
+    def show_component(self, name, visible=True):
+        """Show or hide a whole qubit/coupler (e.g. ``"D3"``, ``"C12"``)."""
+        set_visible(self.index.collections[name], visible)
+
+    # ── incremental update ────────────────────────────────────────────
+    def _tag(self, signatures):
+        for name, (content, full) in signatures.items():
+            obj = self.index[name]
+            obj[self.TAG_CONTENT] = content
+            obj[self.TAG_HASH] = full
+
+    def _render_incremental(self, scene, root):
+        wanted = scene.signatures()
+        placement = {i.name: (i.location, i.rotation_z) for i in scene.instances}
+        placement.update({o.name: (o.location, o.rotation_z) for o in scene.objects})
+
+        index = SceneIndex()
+        index.root = root
+        index.objects[root.name] = root
+        stale = []
+        stats = {"created": 0, "updated": 0, "deleted": 0, "kept": 0}
+        for child in list(root.children):
+            sig = wanted.get(child.name)
+            if sig is None or child.get(self.TAG_CONTENT) != sig[0]:
+                stale.append(child)
+                continue
+            if child.get(self.TAG_HASH) != sig[1]:
+                location, rotation_z = placement[child.name]
+                child.location = location
+                child.rotation_euler = (0, 0, rotation_z)
+                child[self.TAG_HASH] = sig[1]
+                stats["updated"] += 1
+            else:
+                stats["kept"] += 1
+            self._index_existing(index, child)
+
+        for child in stale:
+            self._remove_component(child)
+        stats["deleted"] = len(stale)
+
+        missing = [name for name in wanted if name not in index.objects]
+        upload(scene.subset(missing), collection=root.users_collection[0],
+               index=index, parent=root)
+        self.index = index
+        self._tag({name: wanted[name] for name in missing})
+        stats["created"] = len(missing)
+        return stats
+
+    @staticmethod
+    def _index_existing(index, holder):
+        index.objects[holder.name] = holder
+        for child in holder.children:
+            index.objects[child.name] = child
+        for coll in holder.users_collection:
+            if coll.get(CHIP_TAG):
+                index.collections[holder.name] = coll
+
+    @staticmethod
+    def _remove_component(holder):
+        """Delete a component holder, its children, collection and meshes."""
+        meshes = {child.data for child in holder.children if child.data}
+        if holder.data is not None:
+            meshes.add(holder.data)
+        collections = [c for c in holder.users_collection if c.get(CHIP_TAG)]
+        for child in list(holder.children):
+            bpy.data.objects.remove(child, do_unlink=True)
+        bpy.data.objects.remove(holder, do_unlink=True)
+        for coll in collections:
+            bpy.data.collections.remove(coll)
+        for mesh in meshes:
+            if mesh.users == 0:
+                bpy.data.meshes.remove(mesh)
+
+    # ── camera / lights ───────────────────────────────────────────────
+    @staticmethod
+    def _ensure_object(name, new_data):
+        """Return object *name*, creating it with ``new_data(name)`` if missing."""
+        obj = bpy.data.objects.get(name)
+        if obj is None:
+            obj = bpy.data.objects.new(name, new_data(name))
+            bpy.context.collection.objects.link(obj)
+        return obj
 
     def _setup_scene(self):
-        """SEM-microscope-style lighting: soft, even, low contrast."""
+        """SEM-microscope-style lighting: soft, even, low contrast.
+
+        Idempotent: camera and lights are reused by name on re-render.
+        """
         s = GLOBAL_SCALE
         (xmin, xmax), (ymin, ymax) = self.lattice.auto_lims(margin=100)
         cx = (xmin + xmax) / 2 * s
@@ -111,29 +206,25 @@ class BlenderRenderer:
             bg.inputs["Strength"].default_value = 0.3
 
         # Camera
-        bpy.ops.object.camera_add(
-            location=(cx, cy - span * 0.8, span * 0.7),
-            rotation=(math.radians(50), 0, 0),
-        )
-        bpy.context.scene.camera = bpy.context.object
+        cam = self._ensure_object("ChipCamera", bpy.data.cameras.new)
+        cam.location = (cx, cy - span * 0.8, span * 0.7)
+        cam.rotation_euler = (math.radians(50), 0, 0)
+        bpy.context.scene.camera = cam
+
+        def area_light(name):
+            return bpy.data.lights.new(name, type="AREA")
 
         # Main fill light — bright, soft overhead
-        bpy.ops.object.light_add(
-            type="AREA",
-            location=(cx, cy, span * 0.5),
-        )
-        fill = bpy.context.object
+        fill = self._ensure_object("ChipFill", area_light)
+        fill.location = (cx, cy, span * 0.5)
         fill.data.energy = 200
         fill.data.size = span * 1.2
         fill.data.color = (0.95, 0.95, 1.0)
         fill.rotation_euler = (0, 0, 0)  # pointing straight down
 
         # Rim light — low angle from the side for edge contrast
-        bpy.ops.object.light_add(
-            type="AREA",
-            location=(cx + span * 0.6, cy, span * 0.15),
-        )
-        rim = bpy.context.object
+        rim = self._ensure_object("ChipRim", area_light)
+        rim.location = (cx + span * 0.6, cy, span * 0.15)
         rim.data.energy = 80
         rim.data.size = span * 0.5
         rim.data.color = (1.0, 1.0, 1.0)
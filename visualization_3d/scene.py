@@ -0,0 +1,284 @@
+"""
+Backend-neutral scene description for the 3D chip geometry.
+
+A ``Scene`` is plain NumPy data: a table of shared mesh buffers, a
+material table, per-object transforms and instancing records.  The
+components in ``visualization_3d.components`` write into a scene; a
+backend (``bpy_backend`` for Blender) consumes it.  Nothing in this
+module imports ``bpy``, so geometry generation can run, be tested and be
+profiled in plain CPython.
+
+All transforms are a translation plus a rotation about Z (every chip
+element lies flat on the substrate) and a per-axis scale.
+"""
+
+import hashlib
+import math
+from dataclasses import dataclass
+from typing import Callable, Dict, Hashable, List, Optional, Tuple
+
+import numpy as np
+
+from .geometry import (
+    cube_mesh,
+    plane_mesh,
+    dolan_bridge_mesh,
+    half_bridge_mesh,
+    extruded_path_mesh,
+)
+
+
+def digest(*parts) -> str:
+    """Stable short hash of *parts* (dataclasses, numbers, strings, tuples).
+
+    Used to tag uploaded components so a re-render can tell which ones
+    changed.
+    """
+    return hashlib.sha1(repr(parts).encode("utf-8")).hexdigest()[:16]
+
+
+# ── records ─────────────────────────────────────────────────────────────
+
+@dataclass
+class MeshData:
+    """Vertex/face buffers of one mesh in its local frame."""
+    vertices: np.ndarray   # (N, 3) float
+    faces: np.ndarray      # (M, 4) int quads or (M, 3) triangles
+
+
+@dataclass
+class SceneObject:
+    """One mesh object: which mesh, which material, and where."""
+    name: str
+    mesh: int                                  # index into Scene.meshes
+    material: int                              # index into Scene.materials
+    location: Tuple[float, float, float] = (0.0, 0.0, 0.0)
+    rotation_z: float = 0.0                    # radians
+    scale: Tuple[float, float, float] = (1.0, 1.0, 1.0)
+    group: Optional[str] = None                # owning component instance
+
+
+@dataclass
+class Instance:
+    """A placed copy of a prototype (e.g. one data qubit of the lattice)."""
+    name: str
+    prototype: str
+    location: Tuple[float, float, float] = (0.0, 0.0, 0.0)
+    rotation_z: float = 0.0                    # radians
+
+
+# ═══════════════════════════════════════════════════════════════════════
+#  SCENE
+# ═══════════════════════════════════════════════════════════════════════
+
+class Scene:
+    """
+    Pure-NumPy scene: meshes, materials, objects, prototypes, instances.
+
+    Meshes are deduplicated by a caller-supplied key, so every cuboid in
+    the chip shares one unit-cube buffer and every identical Dolan bridge
+    shares one strip.  Prototypes (see :meth:`prototype`) are child scenes
+    that share the parent's mesh and material tables; :meth:`add_instance`
+    places a copy of one.  Prototype object names are suffixes that get
+    appended to the instance name when flattened (``"D0" + "_Xmon_Center"``).
+    """
+
+    def __init__(self, _parent=None):
+        if _parent is None:
+            self.meshes: List[MeshData] = []
+            self.mesh_keys: Dict[Hashable, int] = {}
+            self.materials: List[Hashable] = []
+            self._material_ids: Dict[Hashable, int] = {}
+        else:
+            self.meshes = _parent.meshes
+            self.mesh_keys = _parent.mesh_keys
+            self.materials = _parent.materials
+            self._material_ids = _parent._material_ids
+        self.objects: List[SceneObject] = []
+        self.prototypes: Dict[str, "Scene"] = {}
+        self.instances: List[Instance] = []
+        self.signature = ""    # content hash when used as a prototype
+
+    # ── tables ─────────────────────────────────────────────────────────
+    def add_mesh(self, key: Hashable, build: Callable) -> int:
+        """Return the mesh index for *key*, calling *build()* on first use.
+
+        *build* returns ``(vertices, faces)``.
+        """
+        idx = self.mesh_keys.get(key)
+        if idx is None:
+            verts, faces = build()
+            idx = len(self.meshes)
+            self.meshes.append(MeshData(np.asarray(verts, dtype=float),
+                                        np.asarray(faces, dtype=np.int32)))
+            self.mesh_keys[key] = idx
+        return idx
+
+    def material(self, key) -> int:
+        """Return the material index for palette *key* (or a backend
+        material object, passed through to the backend)."""
+        idx = self._material_ids.get(key)
+        if idx is None:
+            idx = len(self.materials)
+            self.materials.append(key)
+            self._material_ids[key] = idx
+        return idx
+
+    # ── objects ────────────────────────────────────────────────────────
+    def add_object(self, name, mesh, material, location=(0, 0, 0),
+                   rotation_z=0.0, scale=(1, 1, 1), group=None) -> SceneObject:
+        """Append an object using mesh index *mesh* and material key *material*."""
+        obj = SceneObject(
+            name, mesh, self.material(material),
+            tuple(float(v) for v in location), float(rotation_z),
+            tuple(float(v) for v in scale), group,
+        )
+        self.objects.append(obj)
+        return obj
+
+    def add_cuboid(self, location, dimensions, name="Cuboid",
+                   material="aluminum", rotation_z=0.0):
+        """Box with half-extents *dimensions* (see ``primitives.create_cuboid``)."""
+        mesh = self.add_mesh(("cube",), cube_mesh)
+        return self.add_object(name, mesh, material, location, rotation_z,
+                               scale=dimensions)
+
+    def add_plane(self, location, dimensions, name="Plane",
+                  material="substrate", rotation_z=0.0):
+        """Flat rectangle of full size ``dimensions[:2]`` in the XY plane."""
+        mesh = self.add_mesh(("plane",), plane_mesh)
+        return self.add_object(name, mesh, material, location, rotation_z,
+                               scale=(dimensions[0], dimensions[1], 1))
+
+    def add_extruded_path(self, points_2d, width, height, location=(0, 0, 0),
+                          name="ExtrudedPath", material="aluminum",
+                          rotation_z=0.0):
+        """Rectangular cross-section swept along *points_2d* (local frame)."""
+        pts = np.ascontiguousarray(points_2d, dtype=float)
+        if len(pts) < 2:
+            return None
+        key = ("extruded_path", float(width), float(height), pts.tobytes())
+        mesh = self.add_mesh(key, lambda: extruded_path_mesh(pts, width, height))
+        return self.add_object(name, mesh, material, location, rotation_z)
+
+    def add_dolan_bridge(self, location, total_length, width, h_step,
+                         thickness, overlap_len, name="DolanBridge",
+                         material="aluminum2", steepness=15, rotation_z=0.0,
+                         res_x=120):
+        """Double-sigmoid bridge strip (see ``primitives.create_dolan_bridge``)."""
+        params = (total_length, width, h_step, thickness, overlap_len,
+                  steepness, res_x)
+        mesh = self.add_mesh(("dolan_bridge",) + params,
+                             lambda: dolan_bridge_mesh(*params))
+        return self.add_object(name, mesh, material, location, rotation_z)
+
+    def add_half_bridge(self, location, total_length, width, h_step,
+                        thickness, overlap_len, name="HalfBridge",
+                        material="aluminum2", steepness=15, rotation_z=0.0,
+                        res_x=80):
+        """Single-sigmoid bridge strip (see ``primitives.create_half_bridge``)."""
+        params = (total_length, width, h_step, thickness, overlap_len,
+                  steepness, res_x)
+        mesh = self.add_mesh(("half_bridge",) + params,
+                             lambda: half_bridge_mesh(*params))
+        return self.add_object(name, mesh, material, location, rotation_z)
+
+    # ── instancing ─────────────────────────────────────────────────────
+    def prototype(self, key: str, signature: str = "") -> "Scene":
+        """Return (creating on first use) the child scene for prototype *key*.
+
+        *signature* should hash everything the prototype geometry depends
+        on (typically its dims); it feeds :meth:`signatures`.
+        """
+        proto = self.prototypes.get(key)
+        if proto is None:
+            proto = Scene(_parent=self)
+            proto.signature = signature or digest(key)
+            self.prototypes[key] = proto
+        return proto
+
+    def add_instance(self, name, prototype, location=(0, 0, 0),
+                     rotation_z=0.0) -> Instance:
+        """Place a copy of prototype *prototype* named *name*."""
+        if prototype not in self.prototypes:
+            raise KeyError(f"unknown prototype {prototype!r}")
+        inst = Instance(name, prototype,
+                        tuple(float(v) for v in location), float(rotation_z))
+        self.instances.append(inst)
+        return inst
+
+    def flatten(self) -> "Scene":
+        """Return a scene with every instance expanded into plain objects.
+
+        The result shares this scene's mesh and material tables; expanded
+        objects carry the instance name in ``group``.
+        """
+        flat = Scene(_parent=self)
+        flat.objects = list(self.objects)
+        for inst in self.instances:
+            proto = self.prototypes[inst.prototype]
+            c, s = math.cos(inst.rotation_z), math.sin(inst.rotation_z)
+            ix, iy, iz = inst.location
+            for obj in proto.objects:
+                x, y, z = obj.location
+                flat.objects.append(SceneObject(
+                    inst.name + obj.name, obj.mesh, obj.material,
+                    (ix + x * c - y * s, iy + x * s + y * c, iz + z),
+                    obj.rotation_z + inst.rotation_z, obj.scale, inst.name,
+                ))
+        return flat
+
+    def signatures(self) -> Dict[str, Tuple[str, str]]:
+        """``{name: (content_hash, full_hash)}`` for instances and top-level objects.
+
+        *content_hash* covers the geometry only (prototype signature, or
+        mesh + material + scale for a plain object); *full_hash* also
+        covers the placement.  Equal content with a different full hash
+        means the component only moved.
+        """
+        mesh_key = {idx: key for key, idx in self.mesh_keys.items()}
+        out = {}
+        for inst in self.instances:
+            content = self.prototypes[inst.prototype].signature
+            out[inst.name] = (content, digest(content, inst.location,
+                                               inst.rotation_z))
+        for obj in self.objects:
+            content = digest(mesh_key[obj.mesh], self.materials[obj.material],
+                             obj.scale)
+            out[obj.name] = (content, digest(content, obj.location,
+                                              obj.rotation_z))
+        return out
+
+    def subset(self, names) -> "Scene":
+        """Return a scene with only the instances / top-level objects in *names*."""
+        names = set(names)
+        sub = Scene(_parent=self)
+        sub.objects = [o for o in self.objects if o.name in names]
+        sub.instances = [i for i in self.instances if i.name in names]
+        sub.prototypes = {i.prototype: self.prototypes[i.prototype]
+                          for i in sub.instances}
+        return sub
+
+    # ── bulk views ─────────────────────────────────────────────────────
+    def transforms(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Return ``(locations (K,3), rotations_z (K,), scales (K,3))`` for the objects."""
+        k = len(self.objects)
+        loc = np.array([o.location for o in self.objects], dtype=float).reshape(k, 3)
+        rot = np.array([o.rotation_z for o in self.objects], dtype=float)
+        scl = np.array([o.scale for o in self.objects], dtype=float).reshape(k, 3)
+        return loc, rot, scl
+
+    def stats(self) -> Dict[str, int]:
+        """Object / mesh / vertex / face counts after instance expansion."""
+        flat = self.flatten() if self.instances else self
+        nv = np.array([len(m.vertices) for m in self.meshes], dtype=np.int64)
+        nf = np.array([len(m.faces) for m in self.meshes], dtype=np.int64)
+        used = np.array([o.mesh for o in flat.objects], dtype=np.int64)
+        return {
+            "objects": len(flat.objects),
+            "meshes": len(self.meshes),
+            "materials": len(self.materials),
+            "instances": len(self.instances),
+            "vertices": int(nv[used].sum()) if len(used) else 0,
+            "faces": int(nf[used].sum()) if len(used) else 0,
+        }
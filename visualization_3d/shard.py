@@ -0,0 +1,284 @@
+"""
+Frame-range sharding of animation renders across headless Blender processes.
+
+``bpy.ops.render.render(animation=True)`` renders every frame serially in
+one Blender instance.  This driver splits the frame range into shards,
+renders each shard in its own ``blender -b`` process (at most ``--jobs``
+at a time) into one shared output directory, then checks every expected
+frame and re-queues the missing or truncated ones::
+
+    python -m visualization_3d.shard scene.blend -o renders/anim -f 1-600 -j 4
+    python -m visualization_3d.shard build_scene.py -o renders/anim -f 1-120
+
+The source is a ``.blend`` file or a Python script that builds the scene
+(and does not render it itself).  Frames are written as
+``<out>/frame_0001.png``; frames already present and intact are skipped,
+so an interrupted render resumes.  ``--blender`` takes a command line,
+e.g. ``--blender "python -m visualization_3d.fake_bpy"`` to exercise the
+driver with the stand-in.
+
+Like ``batch``, this module never imports ``bpy``.
+"""
+
+import argparse
+import json
+import os
+import shlex
+import subprocess
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, asdict
+from typing import List, Optional
+
+
+DEFAULT_PATTERN = "frame_####"
+
+_PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+# Last 12 bytes of every complete PNG
+_PNG_IEND = b"\x00\x00\x00\x00IEND\xaeB`\x82"
+
+
+@dataclass
+class ShardResult:
+    """Outcome of one Blender process."""
+    shard: int
+    attempt: int
+    frames: List[int]
+    returncode: Optional[int]
+    elapsed: float
+    log: str
+
+
+# ── frames ──────────────────────────────────────────────────────────────
+
+def parse_frames(text) -> List[int]:
+    """``"1-100,120,200-210"`` → sorted unique frame numbers."""
+    frames = set()
+    for part in text.split(","):
+        part = part.strip()
+        if not part:
+            continue
+        lo, sep, hi = part.partition("-")
+        frames.update(range(int(lo), int(hi) + 1) if sep else [int(lo)])
+    return sorted(frames)
+
+
+def blender_frame_list(frames) -> str:
+    """Frames in Blender's ``-f`` syntax, runs collapsed: ``"1..10,12"``."""
+    frames = sorted(frames)
+    parts, start, prev = [], frames[0], frames[0]
+    for f in frames[1:] + [None]:
+        if f is not None and f == prev + 1:
+            prev = f
+            continue
+        parts.append(str(start) if start == prev else f"{start}..{prev}")
+        if f is not None:
+            start = prev = f
+    return ",".join(parts)
+
+
+def frame_path(out_dir, pattern, frame):
+    """Path Blender writes *frame* to for ``-o <out_dir>/<pattern> -x 1``."""
+    head, sep, tail = pattern.rpartition("#")
+    if sep:
+        width = len(head) - len(head.rstrip("#")) + 1
+        name = f"{head[:len(head) - width + 1]}{frame:0{width}d}{tail}"
+    else:
+        name = f"{pattern}{frame:04d}"
+    return os.path.join(out_dir, name + ".png")
+
+
+def is_complete_png(path) -> bool:
+    """True if *path* starts with the PNG signature and ends with ``IEND``.
+
+    Catches missing, empty and truncated files (a worker killed mid-write)
+    without decoding the image.
+    """
+    try:
+        size = os.path.getsize(path)
+        if size < len(_PNG_SIGNATURE) + len(_PNG_IEND):
+            return False
+        with open(path, "rb") as f:
+            if f.read(len(_PNG_SIGNATURE)) != _PNG_SIGNATURE:
+                return False
+            f.seek(-len(_PNG_IEND), os.SEEK_END)
+            return f.read() == _PNG_IEND
+    except OSError:
+        return False
+
+
+def missing_frames(out_dir, frames, pattern=DEFAULT_PATTERN) -> List[int]:
+    """Frames of *frames* without a complete image in *out_dir*."""
+    return [f for f in frames
+            if not is_complete_png(frame_path(out_dir, pattern, f))]
+
+
+def split_shards(frames, workers, chunk=None) -> List[List[int]]:
+    """Cut *frames* into contiguous shards.
+
+    Default shard size gives each worker about two shards, so a slow
+    shard does not leave the other workers idle at the end; a smaller
+    *chunk* balances better at the price of one scene load per shard.
+    """
+    if not frames:
+        return []
+    chunk = chunk or max(1, -(-len(frames) // (2 * workers)))
+    return [frames[i:i + chunk] for i in range(0, len(frames), chunk)]
+
+
+# ── workers ─────────────────────────────────────────────────────────────
+
+def _command(blender, source, out_dir, pattern, frames):
+    cmd = shlex.split(blender) + ["-b"]
+    if source.endswith(".blend"):
+        cmd.append(source)
+    else:
+        cmd += ["--factory-startup", "--python-exit-code", "1", "--python", source]
+    cmd += ["-o", os.path.join(out_dir, pattern), "-F", "PNG", "-x", "1",
+            "-f", blender_frame_list(frames)]
+    return cmd
+
+
+def _run_shard(index, attempt, frames, blender, source, out_dir, pattern,
+               timeout):
+    log = os.path.join(out_dir, "logs", f"shard{index:03d}_try{attempt}.log")
+    cmd = _command(blender, source, out_dir, pattern, frames)
+    t0 = time.perf_counter()
+    with open(log, "w") as logf:
+        logf.write(" ".join(cmd) + "\n\n")
+        logf.flush()
+        try:
+            rc = subprocess.run(cmd, stdout=logf, stderr=subprocess.STDOUT,
+                                timeout=timeout).returncode
+        except subprocess.TimeoutExpired:
+            rc = None
+            logf.write(f"\n[shard] timed out after {timeout} s\n")
+    return ShardResult(index, attempt, list(frames), rc,
+                       time.perf_counter() - t0, log)
+
+
+def render_sharded(source, out_dir, frames, blender="blender", workers=None,
+                   chunk=None, retries=2, timeout=None, resume=True,
+                   pattern=DEFAULT_PATTERN):
+    """Render *frames* of *source* in parallel Blender processes.
+
+    Parameters
+    ----------
+    source : str
+        ``.blend`` file or scene-building Python script.
+    out_dir : str
+        Shared output directory.
+    frames : list of int
+        Frames to render.
+    blender : str
+        Blender command line (or a stand-in with the same CLI).
+    workers : int or None
+        Maximum concurrent Blender processes (default: CPU count).
+    chunk : int or None
+        Frames per shard (see :func:`split_shards`).
+    retries : int
+        Extra passes over frames that are missing or truncated after a pass.
+    resume : bool
+        Skip frames that already have a complete image.
+
+    Returns
+    -------
+    summary : dict
+        ``frames``, ``rendered``, ``missing`` (still missing after all
+        retries) and per-process ``shards``; also written to
+        ``<out_dir>/shards.json``.
+    """
+    os.makedirs(os.path.join(out_dir, "logs"), exist_ok=True)
+    workers = workers or os.cpu_count() or 1
+    frames = sorted(set(frames))
+    todo = missing_frames(out_dir, frames, pattern) if resume else frames
+
+    results = []
+    shard_index = 0
+    rendered = 0
+    for attempt in range(retries + 1):
+        if not todo:
+            break
+        # Stale partial files must not be mistaken for output
+        for f in todo:
+            path = frame_path(out_dir, pattern, f)
+            if os.path.exists(path):
+                os.remove(path)
+        shards = split_shards(todo, workers, chunk)
+        print(f"[shard] pass {attempt}: {len(todo)} frames in {len(shards)} shards")
+        # Threads only wait on child processes (see batch.run_batch)
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            futures = [pool.submit(_run_shard, shard_index + i, attempt, s,
+                                   blender, source, out_dir, pattern, timeout)
+                       for i, s in enumerate(shards)]
+            for fut in futures:
+                r = fut.result()
+                results.append(r)
+                print(f"[shard] shard {r.shard} ({blender_frame_list(r.frames)}): "
+                      f"rc={r.returncode} ({r.elapsed:.1f} s)")
+        shard_index += len(shards)
+        still = missing_frames(out_dir, todo, pattern)
+        rendered += len(todo) - len(still)
+        if still:
+            print(f"[shard] {len(still)} frames missing or truncated: "
+                  f"{blender_frame_list(still)}")
+        todo = still
+
+    summary = {
+        "source": source,
+        "frames": len(frames),
+        "rendered": rendered,
+        "missing": todo,
+        "shards": [asdict(r) for r in results],
+    }
+    with open(os.path.join(out_dir, "shards.json"), "w") as f:
+        json.dump(summary, f, indent=2)
+    return summary
+
+
+# ── CLI ─────────────────────────────────────────────────────────────────
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="python -m visualization_3d.shard",
+        description="Render an animation's frames in parallel headless "
+                    "Blender processes.",
+    )
+    parser.add_argument("source", help=".blend file or scene-building script")
+    parser.add_argument("-o", "--out", default="frames",
+                        help="output directory (default: frames)")
+    parser.add_argument("-f", "--frames", required=True,
+                        help="frames to render, e.g. 1-600 or 1-10,20")
+    parser.add_argument("-j", "--jobs", type=int, default=None,
+                        help="max concurrent Blender processes (default: CPU count)")
+    parser.add_argument("--chunk", type=int, default=None,
+                        help="frames per shard (default: ~2 shards per worker)")
+    parser.add_argument("--retries", type=int, default=2,
+                        help="re-render passes for missing frames (default: 2)")
+    parser.add_argument("--blender", default=os.environ.get("BLENDER", "blender"),
+                        help="Blender command (default: $BLENDER or 'blender')")
+    parser.add_argument("--timeout", type=float, default=None,
+                        help="per-shard timeout in seconds")
+    parser.add_argument("--pattern", default=DEFAULT_PATTERN,
+                        help="file name pattern, '#' = frame digit "
+                             "(default: %(default)s)")
+    parser.add_argument("--no-resume", action="store_true",
+                        help="re-render frames that already exist")
+    args = parser.parse_args(argv)
+
+    summary = render_sharded(
+        args.source, args.out, parse_frames(args.frames), blender=args.blender,
+        workers=args.jobs, chunk=args.chunk, retries=args.retries,
+        timeout=args.timeout, resume=not args.no_resume, pattern=args.pattern)
+    if summary["missing"]:
+        print(f"[shard] {len(summary['missing'])} frames failed: "
+              f"{blender_frame_list(summary['missing'])}")
+        return 1
+    print(f"[shard] {summary['frames']} frames complete "
+          f"({summary['rendered']} rendered)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())